@@ -1 +1,9 @@
-from .agent import root_agent as agent 
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name):
+    # The agent tree is built on first access (e.g. by the ADK loader), so importing
+    # the package for batch runs, benchmarks or health checks stays cheap
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,27 @@
 from google.adk.agents import Agent
 from .sub_agents.article_processor_agent.agent import article_processor_agent
 from .sub_agents.infographic_content_planner_agent.agent import infographic_content_planner_agent
+from .sub_agents.infographic_content_planner_agent.tools.plan_slides import build_slide_plans_async
 from .sub_agents.infographic_prompt_generator_agent.agent import infographic_prompt_generator_agent
+from .sub_agents.infographic_prompt_generator_agent.tools.generate_prompt import generate_all_slide_prompts_async
 from .sub_agents.slide_generator_agent.agent import slide_generator_agent
-from .constants import GEMINI_MODEL
+from .constants import CLIENT_WARMUP_ON_STARTUP, GEMINI_MODEL
+from .shared_lib.callbacks import AGENT_TRACING_CALLBACKS
+from .shared_lib.scheduled_model import scheduled_gemini
+from .shared_lib.clients import warmup_clients
 
 linkedin_infographic_agent_manager = Agent(
     name="linkedin_infographic_agent_manager",
     description="A manager agent that orchestrates the LinkedIn infographic carousel creation process from article input to final slides.",
+    **AGENT_TRACING_CALLBACKS,
     sub_agents=[
         article_processor_agent,
         infographic_content_planner_agent,
         infographic_prompt_generator_agent,
         slide_generator_agent,
     ],
-    model=GEMINI_MODEL,
+    tools=[build_slide_plans_async, generate_all_slide_prompts_async],
+    model=scheduled_gemini(GEMINI_MODEL),
     instruction="""
     # 🚀 LinkedIn Infographic Carousel Creator
 
@@ -24,14 +31,31 @@ linkedin_infographic_agent_manager = Agent(
 
     1. Welcome the user and request the article text or URL.
     2. Delegate to article_processor_agent to extract summary, key points, structure, and citation. Save the result to tool_context.state['processed_article'].
-    3. Delegate to infographic_content_planner_agent to plan a sequence of 3-7 slides. Save the list of slide definitions to tool_context.state['slide_plans'].
+       If the user gave a URL, pass the URL itself (not pasted page HTML); the article processor fetches and extracts it.
+    3. Call the build_slide_plans_async tool to plan the slides locally from the processed article (title slide, one slide per key point, closing citation slide).
+       Pass mode='llm' if the user asks for the LLM planner (or mode='local' to force local planning); otherwise omit mode and
+       tool_context.state['planner_mode'] decides. It saves the plans to tool_context.state['slide_plans']. If it returns status 'fallback'
+       (the LLM planner was requested, or the article structure is too thin), delegate to infographic_content_planner_agent to plan
+       a sequence of 3-7 slides instead. Save the list of slide definitions to tool_context.state['slide_plans'].
     4. For each slide in tool_context.state['slide_plans']:
         - Set tool_context.state['current_slide_plan'] to the current slide plan.
         - Set tool_context.state['current_slide_filename'] to a unique filename (e.g., slide_01.png, slide_02.png, ...).
         - Delegate to infographic_prompt_generator_agent to generate a detailed prompt for the slide. Save the prompt to tool_context.state['current_slide_generation_prompt'].
         - Delegate to slide_generator_agent to generate the slide image using the prompt and filename. Save the result to tool_context.state.
         - Collect the path and details of the generated slide.
-    5. After all slides are generated, present the list of generated slide images and their details to the user.
+       Parallel render mode: when the user wants the carousel faster, call the generate_all_slide_prompts_async tool once. It writes a shared style
+       preamble and the prompt for every slide in one call and saves them to tool_context.state['slide_generation_prompts'].
+       Then delegate to slide_generator_agent once to call render_carousel_async without prompts; it reads tool_context.state['slide_generation_prompts']
+       and renders all slides concurrently. If generate_all_slide_prompts_async fails, generate the prompt for every slide with
+       infographic_prompt_generator_agent and pass them to render_carousel_async in slide order (slide 1 is then rendered first as the style anchor).
+       The results are saved to tool_context.state['generated_slides'].
+       Draft preview: render the slides with tier='draft' first (create_slide_async or render_carousel_async). Drafts are fast, low-quality previews
+       (slide_01_draft.png, ...) tracked in tool_context.state['slide_drafts'].
+    5. After all slides are generated, present the list of generated slide images and their details to the user. Report any failed slides individually.
+       For drafts, ask the user which slides they approve. Then delegate to slide_generator_agent to call finalize_slides_async with the approved slide
+       numbers. It renders only those slides at full quality from the same prompts and assets, tracked in tool_context.state['slide_finals'].
+    6. When the user asks to change some slides, update only the affected entries of tool_context.state['slide_plans'] (keep the others unchanged)
+       and delegate to slide_generator_agent to call update_carousel_async. Only the changed slides get a new prompt and image; do not regenerate the whole carousel.
 
     ## Guidelines
     - Maintain clear, step-by-step communication with the user.
@@ -41,5 +65,8 @@ linkedin_infographic_agent_manager = Agent(
     """,
 )
 
+if CLIENT_WARMUP_ON_STARTUP:
+    print(f"[agent] Client warmup: {warmup_clients()}")
+
 # Set the root agent
 root_agent = linkedin_infographic_agent_manager 
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Headless batch mode: turn many articles into carousels without the interactive agent.
+
+Each article runs process_text -> slide planning -> prompt generation -> slide
+rendering on a bounded worker pool. Slides are written to their own namespace
+(GENERATED_SLIDES_DIR/<batch_id>/<job_id>/slide_NN.png) and every finished stage is
+checkpointed under BATCH_DIR/<batch_id>, so re-running the same command resumes a
+crashed batch without redoing finished work.
+
+Usage:
+    python -m linkedin_infographic_agent.batch articles/ --workers 4
+    python -m linkedin_infographic_agent.batch articles.jsonl --batch-id newsroom-0612
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .constants import (
+    ARTICLE_COMPRESSION_ENABLED,
+    BATCH_DIR,
+    BATCH_WORKERS,
+    DEFAULT_PLANNER_MODE,
+    PLANNER_MODES,
+    SLIDE_RENDER_CONCURRENCY,
+)
+from .shared_lib.article_utils import load_carousel_record, save_carousel_record
+from .shared_lib.clients import get_openai_client
+from .sub_agents.article_processor_agent.tools.process_text import (
+    extraction_cache_key,
+    is_placeholder_article,
+    process_text,
+)
+from .sub_agents.infographic_content_planner_agent.tools.plan_slides import (
+    build_local_slide_plans,
+    generate_slide_plans,
+)
+from .sub_agents.infographic_prompt_generator_agent.tools.generate_prompt import (
+    generate_carousel_prompts,
+    generate_slide_prompt,
+    reuse_carousel_prompts,
+)
+from .sub_agents.slide_generator_agent.tools.create_slide import load_assets
+from .sub_agents.slide_generator_agent.tools.render_carousel import render_carousel_slides
+
+
+def _safe_id(value: str) -> str:
+    return "".join(c for c in value if c.isalnum() or c in ("-", "_")) or "article"
+
+
+def load_jobs(source: str) -> List[Dict[str, str]]:
+    """
+    Read articles from a directory of .txt/.md files or from a JSONL file whose lines
+    have a "text" (or "article_text") field and an optional "id".
+    """
+    jobs = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith((".txt", ".md")):
+                with open(os.path.join(source, name), "r", encoding="utf-8") as f:
+                    jobs.append({"id": os.path.splitext(name)[0], "text": f.read()})
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                text = record.get("text") or record.get("article_text") or ""
+                jobs.append({"id": str(record.get("id") or f"article_{line_number:04d}"), "text": text})
+    seen = set()
+    for job in jobs:
+        job_id = _safe_id(job["id"])
+        candidate, suffix = job_id, 2
+        while candidate in seen:
+            candidate, suffix = f"{job_id}_{suffix}", suffix + 1
+        seen.add(candidate)
+        job["id"] = candidate
+    return jobs
+
+
+def _checkpoint_path(batch_dir: str, job_id: str) -> str:
+    return os.path.join(batch_dir, f"{job_id}.json")
+
+
+def load_checkpoint(batch_dir: str, job_id: str) -> Dict[str, Any]:
+    try:
+        with open(_checkpoint_path(batch_dir, job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"job_id": job_id, "status": "pending", "timings": {}}
+
+
+def save_checkpoint(batch_dir: str, checkpoint: Dict[str, Any]) -> None:
+    """Write a job checkpoint atomically so a crash never leaves a truncated file."""
+    os.makedirs(batch_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=batch_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, _checkpoint_path(batch_dir, checkpoint["job_id"]))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def run_job(
+    job: Dict[str, str],
+    batch_id: str,
+    batch_dir: str,
+    render_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    planner_mode: str = DEFAULT_PLANNER_MODE,
+    compress: bool = ARTICLE_COMPRESSION_ENABLED,
+) -> Dict[str, Any]:
+    """Run (or resume) one article through the pipeline, checkpointing after every stage."""
+    checkpoint = load_checkpoint(batch_dir, job["id"])
+    if checkpoint.get("status") == "success":
+        return checkpoint
+    timings = checkpoint.setdefault("timings", {})
+    stage = "process"
+    try:
+        if "processed_article" not in checkpoint:
+            start = time.perf_counter()
+            processed = process_text(job["text"], compress=compress)
+            timings["process"] = round(time.perf_counter() - start, 3)
+            if is_placeholder_article(processed):
+                raise ValueError("Article extraction failed (placeholder result)")
+            checkpoint["processed_article"] = processed
+            save_checkpoint(batch_dir, checkpoint)
+
+        # Shared by the article and its near-duplicates (see process_text), so a syndicated copy
+        # reuses the plans and prompts of the first carousel and its slides come from the render cache
+        article_key = extraction_cache_key(job["text"], compress)
+        record = load_carousel_record(article_key)
+
+        stage = "plan"
+        if "slide_plans" not in checkpoint:
+            start = time.perf_counter()
+            # A record copied from a near-duplicate with a different citation only lends its prompts
+            plans = record["slide_plans"] if record and not record.get("source_article_key") else None
+            if plans is not None:
+                checkpoint["planner"] = "reused"
+            else:
+                if planner_mode == "local":
+                    plans = build_local_slide_plans(checkpoint["processed_article"])
+                checkpoint["planner"] = "local" if plans is not None else "llm"
+            checkpoint["slide_plans"] = plans or generate_slide_plans(checkpoint["processed_article"])
+            timings["plan"] = round(time.perf_counter() - start, 3)
+            save_checkpoint(batch_dir, checkpoint)
+
+        stage = "prompt"
+        prompts = checkpoint.setdefault("prompts", [])
+        if len(prompts) < len(checkpoint["slide_plans"]):
+            start = time.perf_counter()
+            reuse_regenerated = None
+            if not prompts and record:
+                reused = reuse_carousel_prompts(record, checkpoint["slide_plans"])
+                checkpoint["style_preamble"] = reused["style_preamble"]
+                checkpoint["reused_prompts"] = reused["reused"]
+                prompts.extend(reused["prompts"])
+                reuse_regenerated = reused["regenerated"]
+                save_checkpoint(batch_dir, checkpoint)
+            if not prompts:
+                try:
+                    batched = generate_carousel_prompts(checkpoint["slide_plans"])
+                    checkpoint["style_preamble"] = batched["style_preamble"]
+                    prompts.extend(batched["prompts"])
+                    save_checkpoint(batch_dir, checkpoint)
+                except Exception as e:
+                    print(f"[batch] Batched prompts failed for {job['id']}, generating per slide. Error: {e}")
+            for slide_plan in checkpoint["slide_plans"][len(prompts):]:
+                prompts.append(generate_slide_prompt(slide_plan))
+                save_checkpoint(batch_dir, checkpoint)
+            timings["prompt"] = round(time.perf_counter() - start, 3)
+            if reuse_regenerated is None or reuse_regenerated:
+                try:
+                    save_carousel_record(
+                        article_key, checkpoint["slide_plans"], prompts, checkpoint.get("style_preamble")
+                    )
+                except OSError as e:
+                    print(f"[batch] Could not save the carousel record for {job['id']}. Error: {e}")
+
+        stage = "render"
+        rendered = set(checkpoint.get("rendered_slides", []))
+        pending = set(range(1, len(prompts) + 1)) - rendered
+        if pending:
+            start = time.perf_counter()
+            slides = render_carousel_slides(
+                get_openai_client(),
+                prompts,
+                load_assets(),
+                namespace=os.path.join(batch_id, job["id"]),
+                max_concurrency=render_concurrency,
+                only=pending,
+                use_anchor=not checkpoint.get("style_preamble"),
+            )
+            timings["render"] = round(time.perf_counter() - start, 3)
+            for slide in slides:
+                if slide["status"] == "success":
+                    rendered.add(slide["slide_number"])
+            checkpoint["rendered_slides"] = sorted(rendered)
+            checkpoint["slides"] = slides
+            failed = sorted(pending - rendered)
+            if failed:
+                raise ValueError(f"Slides failed to render: {failed}")
+        checkpoint["status"] = "success"
+        checkpoint.pop("error", None)
+        checkpoint.pop("failed_stage", None)
+    except Exception as e:
+        checkpoint["status"] = "failed"
+        checkpoint["failed_stage"] = stage
+        checkpoint["error"] = str(e)
+    save_checkpoint(batch_dir, checkpoint)
+    return checkpoint
+
+
+def run_batch(
+    source: str,
+    batch_id: Optional[str] = None,
+    workers: int = BATCH_WORKERS,
+    render_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    planner_mode: str = DEFAULT_PLANNER_MODE,
+    compress: bool = ARTICLE_COMPRESSION_ENABLED,
+) -> Dict[str, Any]:
+    """Run every article in source through the pipeline and write BATCH_DIR/<batch_id>/summary.json."""
+    batch_id = _safe_id(batch_id or os.path.splitext(os.path.basename(os.path.normpath(source)))[0])
+    batch_dir = os.path.join(BATCH_DIR, batch_id)
+    jobs = load_jobs(source)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(
+            executor.map(
+                lambda job: run_job(job, batch_id, batch_dir, render_concurrency, planner_mode, compress), jobs
+            )
+        )
+    summary = {
+        "batch_id": batch_id,
+        "source": source,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "succeeded": sum(1 for r in results if r["status"] == "success"),
+        "failed": sum(1 for r in results if r["status"] != "success"),
+        "jobs": [
+            {
+                "job_id": r["job_id"],
+                "status": r["status"],
+                "failed_stage": r.get("failed_stage"),
+                "error": r.get("error"),
+                "slides": len(r.get("rendered_slides", [])),
+                "planner": r.get("planner"),
+                "reused_prompts": len(r.get("reused_prompts", [])),
+                "timings": r.get("timings", {}),
+            }
+            for r in results
+        ],
+    }
+    os.makedirs(batch_dir, exist_ok=True)
+    with open(os.path.join(batch_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Turn a directory or JSONL file of articles into carousels.")
+    parser.add_argument("source", help="Directory of .txt/.md articles or a JSONL file")
+    parser.add_argument("--batch-id", help="Output namespace; re-use it to resume (default: source name)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Articles processed concurrently")
+    parser.add_argument(
+        "--render-concurrency", type=int, default=SLIDE_RENDER_CONCURRENCY, help="Slides rendered concurrently per article"
+    )
+    parser.add_argument(
+        "--planner",
+        choices=PLANNER_MODES,
+        default=DEFAULT_PLANNER_MODE,
+        help="Plan slides locally from the article structure (falls back to the LLM when it is too thin) or always with the LLM",
+    )
+    parser.add_argument(
+        "--compress",
+        action=argparse.BooleanOptionalAction,
+        default=ARTICLE_COMPRESSION_ENABLED,
+        help="Cut each article down locally to ARTICLE_COMPRESSION_TOKEN_BUDGET tokens before extraction",
+    )
+    args = parser.parse_args(argv)
+    summary = run_batch(
+        args.source, args.batch_id, args.workers, args.render_concurrency, args.planner, args.compress
+    )
+    for job in summary["jobs"]:
+        detail = f"{job['slides']} slides" if job["status"] == "success" else f"{job['failed_stage']}: {job['error']}"
+        print(f"{job['job_id']:<32} {job['status']:<8} {detail}  {job['timings']}")
+    print(
+        f"[batch] {summary['succeeded']} succeeded, {summary['failed']} failed in {summary['wall_seconds']}s "
+        f"(summary: {os.path.join(BATCH_DIR, summary['batch_id'], 'summary.json')})"
+    )
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
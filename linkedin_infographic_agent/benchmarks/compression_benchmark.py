@@ -0,0 +1,105 @@
+"""
+Extractive pre-compression benchmark.
+
+Builds synthetic articles of several sizes with the noise the stage is meant to remove
+(repeated pull quotes, newsletter boilerplate) and the lines it must keep (headings,
+figures, citations), then reports compress_article latency, compression ratio, tokens saved,
+whether every must-keep line survived, and the Gemini calls process_text makes on the
+full versus the compressed article (against the fake backend).
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.compression_benchmark --words 1000,10000,50000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from ..constants import ARTICLE_COMPRESSION_TOKEN_BUDGET, GEMINI_MODEL
+from ..shared_lib.article_compression import compress_article
+from ..shared_lib.clients import install_clients
+from ..sub_agents.article_processor_agent.tools.process_text import process_text
+from .fake_backends import FakeGeminiModel
+from .pipeline_benchmark import make_article, percentile
+
+BOILERPLATE = "Sign up for our newsletter to get the latest stories delivered to your inbox every morning."
+PULL_QUOTE = '"This changes how every team will plan the next quarter," one analyst said.'
+
+
+def noisy_article(words: int, seed: int) -> Dict[str, object]:
+    """A synthetic article with boilerplate and repeated quotes, plus the lines that must be kept."""
+    rng = random.Random(seed)
+    must_keep = [
+        "Source: Example Wire (https://example.com/story)",
+        "Author: A. Writer",
+    ]
+    paragraphs = []
+    for index, paragraph in enumerate(make_article(seed, words, seed).split("\n\n")):
+        paragraphs.append(paragraph)
+        if paragraph.startswith("#"):
+            must_keep.append(paragraph)
+        elif index % 5 == 0:
+            figure = f"Revenue grew {rng.randint(2, 40)}% to ${rng.randint(1, 900)}M in Q{rng.randint(1, 4)}."
+            paragraphs.append(f"{BOILERPLATE} {PULL_QUOTE} {figure}")
+            must_keep.append(figure)
+    text = "\n".join(must_keep[:2]) + "\n\n" + "\n\n".join(paragraphs)
+    return {"text": text, "must_keep": must_keep}
+
+
+def run(sizes: List[int], budget: int, runs: int, seed: int, workdir: str) -> Dict:
+    model = FakeGeminiModel(latency=0.0)
+    install_clients(gemini_models={GEMINI_MODEL: model})
+    results = []
+    for words in sizes:
+        article = noisy_article(words, seed)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            report = compress_article(article["text"], budget)
+            timings.append(time.perf_counter() - start)
+        kept = sum(1 for line in article["must_keep"] if line in report["text"])
+        calls = {}
+        for compress in (False, True):
+            # A fresh article cache per run, so neither run reuses the other's result as a near-duplicate
+            os.chdir(tempfile.mkdtemp(dir=workdir))
+            before = model.behaviour.calls
+            process_text(article["text"], compress=compress)
+            calls["compressed" if compress else "full"] = model.behaviour.calls - before
+        results.append({
+            "words": words,
+            "original_tokens": report["original_tokens"],
+            "compressed_tokens": report["compressed_tokens"],
+            "tokens_saved": report["tokens_saved"],
+            "compression_ratio": report["compression_ratio"],
+            "ms_min": round(min(timings) * 1000, 2),
+            "ms_p50": round(percentile(timings, 50) * 1000, 2),
+            "must_keep_retained": f"{kept}/{len(article['must_keep'])}",
+            "pull_quotes": report["text"].count(PULL_QUOTE),
+            "gemini_calls": calls,
+        })
+    return {"token_budget": budget, "runs": runs, "articles": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark local extractive pre-compression of articles.")
+    parser.add_argument("--words", default="1000,10000,50000", help="Comma-separated article sizes in words")
+    parser.add_argument("--budget", type=int, default=ARTICLE_COMPRESSION_TOKEN_BUDGET, help="Token budget")
+    parser.add_argument("--runs", type=int, default=5, help="Timed compressions per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Directory to run in (default: a fresh temp dir)")
+    args = parser.parse_args(argv)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="carousel-compress-"))
+    os.makedirs(workdir, exist_ok=True)
+    sizes = [int(size) for size in args.words.split(",") if size]
+    report = run(sizes, args.budget, args.runs, args.seed, workdir)
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
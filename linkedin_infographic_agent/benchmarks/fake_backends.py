@@ -0,0 +1,212 @@
+"""
+Local stand-ins for the OpenAI image API and Gemini, used by the offline benchmarks.
+Each backend sleeps for a configurable latency, fails at a configurable rate and
+returns payloads of a configurable size, so runs are repeatable without network access.
+"""
+
+import asyncio
+import base64
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+class FakeBackendError(Exception):
+    """Raised by a fake backend to simulate an API failure."""
+
+
+class FakeRateLimitError(FakeBackendError):
+    """Raised by a fake backend to simulate an HTTP 429 with a Retry-After header."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("simulated rate limit")
+        self.response = SimpleNamespace(headers={"retry-after": str(retry_after)})
+
+
+class _Behaviour:
+    def __init__(
+        self,
+        latency: float,
+        jitter: float,
+        error_rate: float,
+        seed: int,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self, scale: float = 1.0) -> tuple:
+        """(delay, throttle, fail) for the next call; scale shortens the latency of cheaper calls."""
+        with self._lock:
+            self.calls += 1
+            delay = (self.latency + self._random.uniform(0, self.jitter)) * scale
+            fail = self._random.random() < self.error_rate
+            throttle = self._random.random() < self.throttle_rate
+        return delay, throttle, fail
+
+    def _raise(self, throttle: bool, fail: bool) -> None:
+        if throttle:
+            raise FakeRateLimitError(self.retry_after)
+        if fail:
+            raise FakeBackendError("simulated backend failure")
+
+    def simulate(self, scale: float = 1.0) -> None:
+        delay, throttle, fail = self._draw(scale)
+        time.sleep(delay)
+        self._raise(throttle, fail)
+
+    async def simulate_async(self, scale: float = 1.0) -> None:
+        delay, throttle, fail = self._draw(scale)
+        await asyncio.sleep(delay)
+        self._raise(throttle, fail)
+
+
+class FakeImages:
+    """
+    Mimics client.images.generate/edit and returns base64 payloads of a fixed size.
+    quality="low" requests take draft_latency_factor of the latency and return a quarter of the payload.
+    """
+
+    def __init__(self, behaviour: _Behaviour, payload_bytes: int, draft_latency_factor: float = 0.25):
+        self._behaviour = behaviour
+        self._draft_latency_factor = draft_latency_factor
+        self._payload = base64.b64encode(
+            b"\x89PNG\r\n\x1a\n" + random.Random(0).randbytes(max(0, payload_bytes - 8))
+        ).decode("ascii")
+        # A multiple of 4 characters keeps the truncated payload valid base64
+        self._draft_payload = self._payload[: len(self._payload) // 16 * 4]
+
+    def _draft(self, kwargs: Dict) -> bool:
+        return kwargs.get("quality") == "low"
+
+    def _response(self, draft: bool) -> SimpleNamespace:
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=self._draft_payload if draft else self._payload)])
+
+    def _respond(self, kwargs: Dict) -> SimpleNamespace:
+        draft = self._draft(kwargs)
+        self._behaviour.simulate(self._draft_latency_factor if draft else 1.0)
+        return self._response(draft)
+
+    def generate(self, **kwargs: Any) -> SimpleNamespace:
+        return self._respond(kwargs)
+
+    def edit(self, **kwargs: Any) -> SimpleNamespace:
+        return self._respond(kwargs)
+
+
+class FakeAsyncImages(FakeImages):
+    """Mimics AsyncOpenAI's client.images.generate/edit."""
+
+    async def _respond_async(self, kwargs: Dict) -> SimpleNamespace:
+        draft = self._draft(kwargs)
+        await self._behaviour.simulate_async(self._draft_latency_factor if draft else 1.0)
+        return self._response(draft)
+
+    async def generate(self, **kwargs: Any) -> SimpleNamespace:
+        return await self._respond_async(kwargs)
+
+    async def edit(self, **kwargs: Any) -> SimpleNamespace:
+        return await self._respond_async(kwargs)
+
+
+class FakeOpenAI:
+    """Stand-in for the OpenAI client exposing only the image endpoints the tools use."""
+
+    images_class = FakeImages
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        payload_bytes: int = 1_500_000,
+        seed: int = 0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+        draft_latency_factor: float = 0.25,
+    ):
+        self.behaviour = _Behaviour(latency, jitter, error_rate, seed, throttle_rate, retry_after)
+        self.images = self.images_class(self.behaviour, payload_bytes, draft_latency_factor)
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    """Stand-in for the AsyncOpenAI client; shares FakeOpenAI's settings."""
+
+    images_class = FakeAsyncImages
+
+
+def _sentences(text: str, limit: int) -> List[str]:
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()][:limit]
+
+
+class FakeGeminiModel:
+    """
+    Stand-in for google.generativeai.GenerativeModel.
+    Returns well-formed JSON for the processed-article schema, derived from the prompt text,
+    slide plans for a processed article, an image prompt for one slide plan, or a style
+    preamble plus one prompt per plan when asked for carousel prompts.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+    ):
+        self.behaviour = _Behaviour(latency, jitter, error_rate, seed, throttle_rate, retry_after)
+
+    def generate_content(self, contents: List[Dict], request_options: Optional[Dict] = None, **kwargs: Any) -> SimpleNamespace:
+        self.behaviour.simulate()
+        return self._respond(contents)
+
+    async def generate_content_async(
+        self, contents: List[Dict], request_options: Optional[Dict] = None, **kwargs: Any
+    ) -> SimpleNamespace:
+        await self.behaviour.simulate_async()
+        return self._respond(contents)
+
+    def _respond(self, contents: List[Dict]) -> SimpleNamespace:
+        prompt = contents[-1]["parts"][0] if contents else ""
+        if prompt.lstrip().startswith("Slide plans:"):
+            plans = json.loads(prompt.split("Slide plans:", 1)[1].split("\n\nReturn only", 1)[0])
+            return SimpleNamespace(text=json.dumps({
+                "style_preamble": "Flat, minimal, navy and white palette, bold sans-serif headings.",
+                "prompts": [f"Slide {i}: {plan.get('purpose')}. Text: {plan.get('text')}" for i, plan in enumerate(plans, 1)],
+            }))
+        if prompt.lstrip().startswith("Processed article:"):
+            article = json.loads(prompt.split("Processed article:", 1)[1].split("\n\nReturn only", 1)[0])
+            points = list(article.get("key_points") or [])[:5]
+            plans = [{"purpose": "title", "text": article.get("summary", ""), "visual_ideas": "bold title"}]
+            plans += [{"purpose": "key point", "text": point, "visual_ideas": "icon and short copy"} for point in points]
+            plans.append({"purpose": "citation", "text": json.dumps(article.get("citation")), "visual_ideas": "footer"})
+            return SimpleNamespace(text=json.dumps(plans))
+        if prompt.lstrip().startswith("Slide plan:"):
+            plan = json.loads(prompt.split("Slide plan:", 1)[1])
+            return SimpleNamespace(text=(
+                f"1080x1080 LinkedIn infographic slide. Purpose: {plan.get('purpose')}. "
+                f"Text: {plan.get('text')}. Visuals: {plan.get('visual_ideas')}."
+            ))
+        headings = re.findall(r"^#+\s*(.+)$", prompt, flags=re.MULTILINE)[:7]
+        result = {
+            "summary": " ".join(_sentences(prompt, 2)),
+            "key_points": _sentences(prompt, 5),
+            "structure": [{"heading": heading, "content": "..."} for heading in headings],
+            "citation": {"source": "Benchmark corpus", "author": None, "date": None, "url": None},
+        }
+        return SimpleNamespace(text=json.dumps(result))
@@ -0,0 +1,166 @@
+"""
+URL ingestion benchmark against a local HTTP server.
+
+Serves a synthetic article page (navigation, scripts and footer around the article body)
+with ETag/Last-Modified validators, then runs the fetch_article tool three times: a cold
+fetch, a revalidation of the unchanged page (expected: 304, no model call) and a fetch after
+the page changed. Reports latency, bytes downloaded, extracted characters, model calls and
+the peak Python heap of the cold fetch relative to the page size.
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.fetch_benchmark --page-kb 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from ..constants import GEMINI_MODEL
+from ..shared_lib.clients import install_clients
+from ..sub_agents.article_processor_agent.tools.fetch_article import fetch_article
+from .fake_backends import FakeGeminiModel
+from .pipeline_benchmark import BenchmarkToolContext, make_article
+
+
+def build_page(article: str, boilerplate_kb: int) -> bytes:
+    """An HTML page with the article in <article> surrounded by boilerplate that must be dropped."""
+    body = []
+    for block in article.split("\n\n"):
+        if block.startswith("#"):
+            level = len(block) - len(block.lstrip("#"))
+            body.append(f"<h{level}>{block.lstrip('#').strip()}</h{level}>")
+        else:
+            body.append(f"<p>{block}</p>")
+    script = "<script>var tracking = '" + "x" * (boilerplate_kb * 1024) + "';</script>"
+    return (
+        "<!doctype html><html><head><title>Benchmark article</title>"
+        '<meta property="og:site_name" content="Local Bench"><meta name="author" content="A. Writer">'
+        f"{script}<style>p {{ color: black; }}</style></head><body>"
+        "<nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+        f"<article>{''.join(body)}</article>"
+        "<footer>Copyright. Subscribe to our newsletter.</footer></body></html>"
+    ).encode("utf-8")
+
+
+class _Page:
+    def __init__(self, content: bytes):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.set(content)
+
+    def set(self, content: bytes) -> None:
+        with self.lock:
+            self.content = content
+            self.etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+            self.last_modified = formatdate(time.time(), usegmt=True)
+
+
+def serve(page: _Page) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            with page.lock:
+                page.requests += 1
+                content, etag, last_modified = page.content, page.etag, page.last_modified
+                unchanged = self.headers.get("If-None-Match") == etag
+                if unchanged:
+                    page.not_modified += 1
+            if unchanged:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed_fetch(url: str, model: FakeGeminiModel, trace_memory: bool = False) -> Dict:
+    """Run the fetch_article tool once and report its latency, model calls and (optionally) peak heap."""
+    calls_before = model.behaviour.calls
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    tool_context = BenchmarkToolContext()
+    result = asyncio.run(fetch_article(url, tool_context=tool_context))
+    elapsed = time.perf_counter() - start
+    report = {
+        "status": result["status"],
+        "ms": round(elapsed * 1000, 1),
+        "not_modified": result.get("not_modified"),
+        "text_chars": len(tool_context.state.get("article_text", "")),
+        "llm_calls": model.behaviour.calls - calls_before,
+        "key_points": len((result.get("processed_article") or {}).get("key_points") or []),
+    }
+    if trace_memory:
+        report["peak_heap_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return report
+
+
+def run(page_kb: int, boilerplate_kb: int, llm_latency: float) -> Dict:
+    """Cold fetch, unchanged revalidation and changed refetch of one locally served page."""
+    model = FakeGeminiModel(latency=llm_latency)
+    install_clients(gemini_models={GEMINI_MODEL: model})
+    article = make_article(0, max(1, page_kb * 1024 // 7))
+    page = _Page(build_page(article, boilerplate_kb))
+    server = serve(page)
+    url = f"http://127.0.0.1:{server.server_address[1]}/article"
+    try:
+        cold = timed_fetch(url, model, trace_memory=True)
+        revalidate = timed_fetch(url, model)
+        page.set(build_page(article + "\n\n## Update\nA correction was added.", boilerplate_kb))
+        changed = timed_fetch(url, model)
+    finally:
+        server.shutdown()
+    return {
+        "page_bytes": len(page.content),
+        "cold": cold,
+        "revalidate": revalidate,
+        "changed": changed,
+        "server": {"requests": page.requests, "not_modified": page.not_modified},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch/extract/revalidate an article from a local HTTP server.")
+    parser.add_argument("--page-kb", type=int, default=50, help="Approximate article text size in KB")
+    parser.add_argument("--boilerplate-kb", type=int, default=200, help="Size of the inline script to be skipped")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake Gemini call")
+    parser.add_argument("--workdir", help="Directory to run in (default: a fresh temp dir)")
+    args = parser.parse_args(argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="carousel-fetch-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    report = run(args.page_kb, args.boilerplate_kb, args.llm_latency)
+    report["workdir"] = workdir
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
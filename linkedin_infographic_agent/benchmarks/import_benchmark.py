@@ -0,0 +1,151 @@
+"""
+Cold-start benchmark for the agent package.
+
+Each fresh interpreter imports google.adk.agents first (the framework cost every worker pays
+anyway, and by far the noisiest part), then times only the import of
+linkedin_infographic_agent.agent on top of it. The median of those times is the package's own
+overhead. Exits with status 1 when that overhead exceeds the budget, when it regressed past a
+saved baseline, or when a module that must stay lazy was loaded at startup. The framework's
+cold import is timed separately for reference and is not gated.
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.import_benchmark --runs 5
+    python -m linkedin_infographic_agent.benchmarks.import_benchmark --write-baseline import_baseline.json
+    python -m linkedin_infographic_agent.benchmarks.import_benchmark --baseline import_baseline.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+FRAMEWORK_MODULE = "google.adk.agents"
+AGENT_MODULE = "linkedin_infographic_agent.agent"
+# Loaded on first use only: SDKs of the tool backends and the legacy thumbnail agent
+LAZY_MODULES = ("openai", "google.generativeai", "numpy", "linkedin_infographic_agent.youtube_thumbnail_agent")
+
+_PROBE = """
+import json, sys, time
+{preload}
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+lazy = {lazy!r}
+loaded = [m for m in lazy if any(name == m or name.startswith(m + ".") for name in sys.modules)]
+print(json.dumps({{"seconds": seconds, "loaded": loaded}}))
+"""
+
+
+def probe(module: str, cwd: str, preload: Optional[str] = None) -> Dict:
+    """
+    Import module in a fresh interpreter, after importing preload untimed if given.
+    Returns the import time of module alone and any lazy modules loaded by the end.
+    """
+    source = _PROBE.format(module=module, preload=f"import {preload}" if preload else "", lazy=LAZY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", source],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_self_times(module: str, cwd: str) -> Dict[str, int]:
+    """Self time in microseconds of every module loaded by importing module, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[0].strip().isdigit():
+            times[parts[2].strip()] = int(parts[0])
+    return times
+
+
+def slowest_added_modules(cwd: str, top: int) -> List[Dict]:
+    """Modules the agent import loads on top of the framework, by self time."""
+    framework = import_self_times(FRAMEWORK_MODULE, cwd)
+    agent = import_self_times(AGENT_MODULE, cwd)
+    added = sorted(((us, name) for name, us in agent.items() if name not in framework), reverse=True)
+    return [{"module": name, "self_ms": round(us / 1000, 1)} for us, name in added[:top]]
+
+
+def measure(module: str, runs: int, cwd: str, preload: Optional[str] = None) -> Dict:
+    samples = [probe(module, cwd, preload) for _ in range(runs)]
+    seconds = [sample["seconds"] for sample in samples]
+    return {
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "min_ms": round(min(seconds) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+        "lazy_modules_loaded": sorted({name for sample in samples for name in sample["loaded"]}),
+    }
+
+
+def run(
+    runs: int,
+    max_overhead_ms: float,
+    baseline: Optional[Dict],
+    tolerance: float,
+    slack_ms: float,
+    top: int,
+) -> Dict:
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    framework = measure(FRAMEWORK_MODULE, runs, package_root)
+    agent = measure(AGENT_MODULE, runs, package_root, preload=FRAMEWORK_MODULE)
+    overhead_ms = agent["median_ms"]
+    failures: List[str] = []
+    if agent["lazy_modules_loaded"]:
+        failures.append(f"lazy modules loaded at startup: {agent['lazy_modules_loaded']}")
+    if overhead_ms > max_overhead_ms:
+        failures.append(f"package overhead {overhead_ms}ms exceeds the {max_overhead_ms}ms budget")
+    if baseline:
+        allowed = baseline["overhead_ms"] * (1 + tolerance) + slack_ms
+        if overhead_ms > allowed:
+            failures.append(f"package overhead {overhead_ms}ms regressed past baseline {baseline['overhead_ms']}ms")
+    return {
+        "runs": runs,
+        "framework": framework,
+        "agent": agent,
+        "overhead_ms": overhead_ms,
+        "slowest_added_modules": slowest_added_modules(package_root, top),
+        "failures": failures,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure agent import time and fail on regressions.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--max-overhead-ms", type=float, default=500.0, help="Budget for the agent import after ADK is loaded")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression over the baseline")
+    parser.add_argument("--slack-ms", type=float, default=50.0, help="Absolute noise allowance over the baseline")
+    parser.add_argument("--top", type=int, default=10, help="Slowest package-added modules to report")
+    parser.add_argument("--write-baseline", help="Write this run's report here")
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    report = run(max(1, args.runs), args.max_overhead_ms, baseline, args.tolerance, args.slack_ms, args.top)
+    text = json.dumps(report, indent=2)
+    if args.write_baseline:
+        with open(args.write_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    sys.stdout.write(text + "\n")
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Near-duplicate index benchmark.
+
+Fills a fresh index with --index-size signatures (random filler standing in for unrelated
+articles, plus --articles synthetic articles), then queries it with syndicated and lightly
+edited copies of those articles and with unrelated articles. Reports the detection rate per
+edit level, false positives, signature time per article, index load time and lookup p50/p99.
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.near_duplicate_benchmark --index-size 300000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..constants import NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_THRESHOLD
+from ..shared_lib.article_similarity import NearDuplicateIndex, minhash_signature, shingle_hashes
+from .pipeline_benchmark import make_article, percentile
+
+SYNDICATION_HEADER = "Originally published by Example Wire. Republished with permission.\n\n"
+SYNDICATION_FOOTER = "\n\nRead more stories like this one. Sign up for the newsletter."
+
+
+def edit_article(text: str, fraction: float, rng: random.Random) -> str:
+    """Replace roughly fraction of the words with other words from the article."""
+    words = text.split(" ")
+    for _ in range(int(len(words) * fraction)):
+        words[rng.randrange(len(words))] = rng.choice(words)
+    return " ".join(words)
+
+
+def jaccard(a: str, b: str) -> float:
+    sa, sb = set(shingle_hashes(a).tolist()), set(shingle_hashes(b).tolist())
+    return len(sa & sb) / max(1, len(sa | sb))
+
+
+def write_filler(path: str, count: int, seed: int) -> None:
+    """Random signatures behave like articles unrelated to every query."""
+    record = np.dtype([("key", "S64"), ("signature", "<u4", (NEAR_DUPLICATE_NUM_PERM,))])
+    rng = np.random.default_rng(seed)
+    with open(path, "wb") as f:
+        for start in range(0, count, 50_000):
+            records = np.zeros(min(50_000, count - start), dtype=record)
+            records["key"] = [f"{i:064x}".encode("ascii") for i in range(start, start + len(records))]
+            records["signature"] = rng.integers(0, 1 << 32, size=(len(records), NEAR_DUPLICATE_NUM_PERM), dtype=np.uint32)
+            f.write(records.tobytes())
+
+
+def run(index_size: int, articles: int, words: int, edit_levels: List[float], threshold: float, seed: int) -> Dict:
+    rng = random.Random(seed)
+    path = os.path.join(tempfile.mkdtemp(prefix="near-duplicates-"), "index.bin")
+    write_filler(path, max(0, index_size - articles), seed)
+
+    index = NearDuplicateIndex(path)
+    start = time.perf_counter()
+    # The first lookup loads the file and sorts the band tables
+    index.query(np.zeros(NEAR_DUPLICATE_NUM_PERM, dtype=np.uint32), threshold)
+    load_seconds = time.perf_counter() - start
+    loaded = len(index)
+
+    originals = [make_article(i, words, seed) for i in range(articles)]
+    signature_seconds = []
+    for i, text in enumerate(originals):
+        start = time.perf_counter()
+        signature = minhash_signature(text)
+        signature_seconds.append(time.perf_counter() - start)
+        index.add(f"{i:064d}", signature)
+
+    variants = {"syndicated": [SYNDICATION_HEADER + text + SYNDICATION_FOOTER for text in originals]}
+    for level in edit_levels:
+        variants[f"edited_{level:g}"] = [edit_article(text, level, rng) for text in originals]
+    variants["unrelated"] = [make_article(i, words, seed + 1) for i in range(articles)]
+
+    lookup_seconds = []
+    report = {}
+    for name, texts in variants.items():
+        found = 0
+        similarities = []
+        for i, text in enumerate(texts):
+            signature = minhash_signature(text)
+            start = time.perf_counter()
+            match = index.query(signature, threshold)
+            lookup_seconds.append(time.perf_counter() - start)
+            if match and match[0] == f"{i:064d}":
+                found += 1
+            similarities.append(jaccard(text, originals[i]))
+        report[name] = {
+            "matched": found,
+            "queries": len(texts),
+            "mean_shingle_jaccard": round(sum(similarities) / len(similarities), 3),
+        }
+    report["unrelated"]["false_positives"] = report["unrelated"].pop("matched")
+    return {
+        "index_size": len(index),
+        "threshold": threshold,
+        "load_seconds": round(load_seconds, 3),
+        "loaded_signatures": loaded,
+        "signature_ms_p50": round(percentile(signature_seconds, 50) * 1000, 3),
+        "lookup_ms_p50": round(percentile(lookup_seconds, 50) * 1000, 4),
+        "lookup_ms_p99": round(percentile(lookup_seconds, 99) * 1000, 4),
+        "variants": report,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection quality and lookup latency.")
+    parser.add_argument("--index-size", type=int, default=100_000, help="Signatures in the index")
+    parser.add_argument("--articles", type=int, default=50, help="Real articles indexed and queried")
+    parser.add_argument("--words", type=int, default=800, help="Words per synthetic article")
+    parser.add_argument("--edit-levels", default="0.02,0.05,0.1,0.2", help="Comma-separated fractions of words replaced")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    levels = [float(level) for level in args.edit_levels.split(",") if level]
+    report = run(args.index_size, args.articles, args.words, levels, args.threshold, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
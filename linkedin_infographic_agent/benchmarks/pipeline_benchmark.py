@@ -0,0 +1,362 @@
+"""
+Offline end-to-end benchmark for the carousel pipeline.
+
+Drives process_text -> slide planning -> per-slide prompt generation -> slide rendering
+over a corpus of articles with local fake backends installed in place of OpenAI and Gemini,
+then prints per-stage p50/p95 latency, throughput, peak RSS and bytes written as JSON.
+
+The planner and prompt generator stages call the headless tools (generate_slide_plans,
+generate_slide_prompt or generate_carousel_prompts), so they go through the Gemini scheduler
+like the agents' own calls: planning once per carousel, prompting once per slide or per carousel.
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.pipeline_benchmark --articles 5 --output before.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from ..constants import GEMINI_MODEL, IMAGE_ROOT_DIR, SCHEDULER_MAX_RETRIES
+from ..shared_lib.clients import client_stats, install_clients
+from ..shared_lib.render_cache import render_cache_stats
+from ..shared_lib.scheduler import configure_scheduler, scheduler_stats
+from ..shared_lib.tracing import enable_tracing, export_session_trace, get_session_trace
+from ..sub_agents.article_processor_agent.tools.process_text import process_text
+from ..sub_agents.infographic_content_planner_agent.tools.plan_slides import (
+    build_local_slide_plans,
+    generate_slide_plans,
+)
+from ..sub_agents.infographic_prompt_generator_agent.tools.generate_prompt import (
+    generate_carousel_prompts,
+    generate_slide_prompt,
+)
+from ..sub_agents.slide_generator_agent.tools.create_slide import create_slide
+from ..sub_agents.slide_generator_agent.tools.render_carousel import finalize_slides, render_carousel
+from .fake_backends import FakeBackendError, FakeGeminiModel, FakeOpenAI, FakeRateLimitError
+
+_WORDS = (
+    "growth market data teams customers platform revenue strategy product insight "
+    "adoption workflow latency pipeline quarter report analysis leaders model results"
+).split()
+
+T = TypeVar("T")
+
+
+class BenchmarkToolContext:
+    """Minimal stand-in for ToolContext: a state dict and an in-memory artifact counter."""
+
+    def __init__(self) -> None:
+        self.state: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
+
+    def save_artifact(self, filename: str, artifact: Any) -> int:
+        version = self._versions.get(filename, -1) + 1
+        self._versions[filename] = version
+        return version
+
+
+def make_article(index: int, words: int, seed: int = 0) -> str:
+    """Build a deterministic synthetic article with markdown headings and ~words words."""
+    rng = random.Random(seed * 100_003 + index)
+    sections = []
+    written = 0
+    section = 1
+    while written < words:
+        paragraphs = []
+        for _ in range(rng.randint(2, 4)):
+            sentence_count = rng.randint(3, 6)
+            sentences = []
+            for _ in range(sentence_count):
+                length = rng.randint(8, 18)
+                sentences.append(" ".join(rng.choice(_WORDS) for _ in range(length)).capitalize() + ".")
+                written += length
+            paragraphs.append(" ".join(sentences))
+        sections.append(f"## Section {section}\n\n" + "\n\n".join(paragraphs))
+        section += 1
+    return f"# Benchmark article {index}\n\n" + "\n\n".join(sections)
+
+
+def load_corpus(corpus_dir: Optional[str], articles: int, words: int, seed: int) -> List[str]:
+    """Read .txt/.md files from corpus_dir, or generate synthetic articles."""
+    if corpus_dir:
+        names = sorted(n for n in os.listdir(corpus_dir) if n.endswith((".txt", ".md")))
+        corpus = []
+        for name in names[:articles] if articles else names:
+            with open(os.path.join(corpus_dir, name), "r", encoding="utf-8") as f:
+                corpus.append(f.read())
+        return corpus
+    return [make_article(i, words, seed) for i in range(articles)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _bytes_written() -> Optional[int]:
+    """Bytes this process has written so far (Linux /proc/self/io), or None if unavailable."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+            }
+            for name, values in self.samples.items()
+        }
+
+
+def with_retries(fn: Callable[..., T], *args: Any, attempts: int = SCHEDULER_MAX_RETRIES + 1) -> T:
+    """
+    Call fn(*args), retrying generic fake-backend failures the way an agent re-runs a failed turn.
+    Throttling is retried by the scheduler itself. Raises the last error after attempts calls.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args)
+        except FakeRateLimitError:
+            raise
+        except FakeBackendError:
+            if attempt == attempts:
+                raise
+    raise ValueError("attempts must be at least 1")
+
+
+def run_carousel(
+    timer: StageTimer,
+    article: str,
+    render_mode: str,
+    planner: str = "llm",
+    prompt_mode: str = "per-slide",
+    approve_rate: Optional[float] = None,
+) -> int:
+    """
+    Run one article through the pipeline. Returns the number of failed slides.
+    With approve_rate, the carousel is drafted first (stage "preview") and only the first
+    approve_rate fraction of the slides is finalized (stage "finalize").
+    """
+    with timer.stage("process"):
+        processed = process_text(article)
+    with timer.stage("plan"):
+        plans = build_local_slide_plans(processed) if planner == "local" else None
+        plans = plans or with_retries(generate_slide_plans, processed)
+    prompts = []
+    failed = 0
+    tool_context = BenchmarkToolContext()
+    with timer.stage("prompt_total"):
+        if prompt_mode == "batched":
+            batched = with_retries(generate_carousel_prompts, plans)
+            tool_context.state["slide_style_preamble"] = batched["style_preamble"]
+            tool_context.state["slide_generation_prompts"] = prompts = batched["prompts"]
+        else:
+            for plan in plans:
+                with timer.stage("prompt"):
+                    try:
+                        prompts.append(with_retries(generate_slide_prompt, plan))
+                    except FakeBackendError:
+                        # The slide is dropped from the carousel, as when its prompt tool call fails
+                        failed += 1
+    with timer.stage("render_total"):
+        if approve_rate is not None:
+            carousel_prompts = None if prompt_mode == "batched" else prompts
+            with timer.stage("preview"):
+                drafts = render_carousel(carousel_prompts, tier="draft", tool_context=tool_context)
+            approved = [
+                slide["slide_number"]
+                for slide in drafts.get("slides", [])[: math.ceil(len(plans) * approve_rate)]
+                if slide["status"] != "error"
+            ]
+            failed = sum(1 for slide in drafts.get("slides", []) if slide["status"] == "error")
+            if approved:
+                with timer.stage("finalize"):
+                    result = finalize_slides(approved, tool_context=tool_context)
+                failed += sum(1 for slide in result.get("slides", []) if slide["status"] == "error")
+        elif render_mode == "parallel":
+            result = render_carousel(None if prompt_mode == "batched" else prompts, tool_context=tool_context)
+            failed = sum(1 for slide in result.get("slides", []) if slide["status"] == "error")
+        else:
+            for index, prompt in enumerate(prompts, start=1):
+                tool_context.state["slide_filename"] = f"slide_{index:02d}.png"
+                with timer.stage("render"):
+                    result = create_slide(prompt, tool_context=tool_context)
+                if result["status"] == "error":
+                    failed += 1
+    return failed
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict:
+    corpus = load_corpus(args.corpus, args.articles, args.words, args.seed)
+    openai_backend = FakeOpenAI(
+        latency=args.image_latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        payload_bytes=args.image_bytes,
+        seed=args.seed,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    )
+    gemini_backend = FakeGeminiModel(
+        latency=args.llm_latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    )
+    install_clients(openai_client=openai_backend, gemini_models={GEMINI_MODEL: gemini_backend})
+    configure_scheduler("openai.images", args.image_rpm, 0, args.image_concurrency, backoff_base=args.backoff_base)
+    configure_scheduler("gemini", args.llm_rpm, 0, args.llm_concurrency, backoff_base=args.backoff_base)
+    enable_tracing(args.trace)
+
+    timer = StageTimer()
+    written_before = _bytes_written()
+    failed_slides = 0
+    failed_carousels = 0
+    carousels = 0
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for article in corpus:
+            with timer.stage("carousel"):
+                try:
+                    failed_slides += run_carousel(
+                        timer,
+                        article,
+                        args.render_mode,
+                        args.planner,
+                        args.prompt_mode,
+                        args.approve_rate if args.draft_first else None,
+                    )
+                except FakeBackendError as e:
+                    print(f"[pipeline_benchmark] Carousel failed after retries. Error: {e}")
+                    failed_carousels += 1
+            carousels += 1
+    wall_seconds = time.perf_counter() - start
+    written_after = _bytes_written()
+    trace_path = export_session_trace("default") if args.trace else None
+
+    return {
+        "config": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "carousels": carousels,
+        "failed_slides": failed_slides,
+        "failed_carousels": failed_carousels,
+        "wall_seconds": round(wall_seconds, 3),
+        "carousels_per_minute": round(carousels / wall_seconds * 60, 3) if wall_seconds else None,
+        "stages": timer.summary(),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "bytes_written": (
+            written_after - written_before
+            if written_before is not None and written_after is not None
+            else _dir_size(IMAGE_ROOT_DIR)
+        ),
+        "backend_calls": {
+            "image": openai_backend.behaviour.calls,
+            "llm": gemini_backend.behaviour.calls,
+        },
+        "render_cache": render_cache_stats(),
+        "clients": client_stats(),
+        "scheduler": scheduler_stats(),
+        "trace": {"spans": len(get_session_trace("default")), "path": trace_path} if args.trace else None,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline carousel pipeline benchmark.")
+    parser.add_argument("--corpus", help="Directory of .txt/.md articles (default: synthetic corpus)")
+    parser.add_argument("--articles", type=int, default=5, help="Number of articles")
+    parser.add_argument("--words", type=int, default=1500, help="Words per synthetic article")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus (later passes hit caches)")
+    parser.add_argument("--render-mode", choices=("sequential", "parallel"), default="sequential")
+    parser.add_argument("--planner", choices=("llm", "local"), default="llm", help="Slide planner to benchmark")
+    parser.add_argument("--prompt-mode", choices=("per-slide", "batched"), default="per-slide", help="One prompt call per slide or one per carousel")
+    parser.add_argument("--draft-first", action="store_true", help="Render low-quality drafts for the whole carousel, then finalize approved slides")
+    parser.add_argument("--approve-rate", type=float, default=1.0, help="Fraction of drafted slides approved for the final render (with --draft-first)")
+    parser.add_argument("--image-latency", type=float, default=0.5, help="Seconds per fake image call")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake Gemini call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a fake call fails")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability a fake call returns HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After seconds sent with fake 429s")
+    parser.add_argument("--image-rpm", type=float, default=0, help="Image requests per minute allowed by the scheduler (0: unlimited)")
+    parser.add_argument("--llm-rpm", type=float, default=0, help="Gemini requests per minute allowed by the scheduler (0: unlimited)")
+    parser.add_argument("--image-concurrency", type=int, default=8, help="Scheduler concurrency cap for image calls")
+    parser.add_argument("--llm-concurrency", type=int, default=16, help="Scheduler concurrency cap for Gemini calls")
+    parser.add_argument("--backoff-base", type=float, default=0.05, help="Scheduler backoff base in seconds")
+    parser.add_argument("--image-bytes", type=int, default=1_500_000, help="Size of each fake PNG payload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", action="store_true", help="Record spans for tool-internal stages")
+    parser.add_argument("--workdir", help="Directory to run in (default: a fresh temp dir)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    if args.corpus:
+        args.corpus = os.path.abspath(args.corpus)
+    # IMAGE_ROOT_DIR is relative, so running in a scratch directory isolates caches and slides
+    workdir = args.workdir or tempfile.mkdtemp(prefix="carousel-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    report = run_benchmark(args)
+    report["workdir"] = workdir
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Peak Python heap per slide for the create_slide output path.
+
+Renders slides against the fake OpenAI backend under tracemalloc and compares the current
+decode/write path (base64 decoded incrementally into the slide file, artifact read back once)
+with the previous one (whole payload decoded in memory, artifact Blob and file written from it).
+The base64 response string is allocated by the fake backend before measuring, as it would be
+by the HTTP client.
+
+Usage:
+    python -m linkedin_infographic_agent.benchmarks.slide_memory_benchmark --slides 5 --image-bytes 3000000
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import google.genai.types as types
+
+from ..constants import GENERATED_SLIDES_DIR
+from ..shared_lib.clients import install_clients
+from ..sub_agents.slide_generator_agent.tools.create_slide import create_slide
+from .fake_backends import FakeOpenAI
+from .pipeline_benchmark import BenchmarkToolContext, percentile
+
+
+def _previous_path(client: FakeOpenAI, prompt: str, filename: str, tool_context: BenchmarkToolContext) -> None:
+    """The pre-change output path: decode everything, wrap it in a Blob, then write the file."""
+    response = client.images.generate(model="gpt-image-1", prompt=prompt, n=1)
+    image_bytes = base64.b64decode(response.data[0].b64_json)
+    artifact = types.Part(inline_data=types.Blob(data=image_bytes, mime_type="image/png"))
+    tool_context.save_artifact(filename=filename, artifact=artifact)
+    os.makedirs(GENERATED_SLIDES_DIR, exist_ok=True)
+    with open(os.path.join(GENERATED_SLIDES_DIR, filename), "wb") as f:
+        f.write(image_bytes)
+
+
+def _current_path(client: FakeOpenAI, prompt: str, filename: str, tool_context: BenchmarkToolContext) -> None:
+    tool_context.state["slide_filename"] = filename
+    result = create_slide(prompt, tool_context=tool_context)
+    if result["status"] != "success":
+        raise RuntimeError(result["message"])
+
+
+def measure(path: Callable, client: FakeOpenAI, slides: int, label: str) -> Dict[str, float]:
+    """Render slides one at a time and record tracemalloc's peak for each."""
+    peaks: List[int] = []
+    tool_context = BenchmarkToolContext()
+    tracemalloc.start()
+    try:
+        for index in range(1, slides + 1):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            path(client, f"{label} slide {index}", f"{label}_{index:02d}.png", tool_context)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return {
+        "slides": slides,
+        "peak_bytes_p50": percentile(peaks, 50),
+        "peak_bytes_max": max(peaks),
+    }
+
+
+def run(slides: int, image_bytes: int) -> Dict:
+    client = FakeOpenAI(latency=0.0, payload_bytes=image_bytes)
+    install_clients(openai_client=client)
+    previous = measure(_previous_path, client, slides, "previous")
+    current = measure(_current_path, client, slides, "current")
+    return {
+        "image_bytes": image_bytes,
+        "previous": previous,
+        "current": current,
+        "peak_reduction": round(1 - current["peak_bytes_max"] / previous["peak_bytes_max"], 3)
+        if previous["peak_bytes_max"]
+        else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Peak memory per slide for the slide output path.")
+    parser.add_argument("--slides", type=int, default=5, help="Slides rendered per path")
+    parser.add_argument("--image-bytes", type=int, default=3_000_000, help="Size of each fake PNG payload")
+    parser.add_argument("--workdir", help="Directory to run in (default: a fresh temp dir)")
+    args = parser.parse_args(argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="carousel-mem-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    report = run(args.slides, args.image_bytes)
+    report["workdir"] = workdir
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,53 @@ GENERATED_SLIDES_DIR = f"{IMAGE_ROOT_DIR}/generated_slides"
 INFOGRAPHIC_ASSETS_DIR = f"{IMAGE_ROOT_DIR}/assets"
 ARTICLE_CONTENT_DIR = f"{IMAGE_ROOT_DIR}/article_content"
 GEMINI_MODEL = "gemini-2.0-flash"
-OPENAI_MODEL = "gpt-4o" 
\ No newline at end of file
+OPENAI_MODEL = "gpt-4o"
+SLIDE_RENDER_CONCURRENCY = 4
+RENDER_CACHE_DIR = f"{IMAGE_ROOT_DIR}/render_cache"
+RENDER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+ARTICLE_CHUNK_TOKENS = 6000
+ARTICLE_CHUNK_CONCURRENCY = 4
+ASSET_MAX_DIMENSION = 1080
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 60.0
+OPENAI_TIMEOUT_SECONDS = 120.0
+GEMINI_TIMEOUT_SECONDS = 60.0
+CLIENT_WARMUP_ON_STARTUP = False
+CLIENT_WARMUP_CONNECT = False
+TRACING_ENABLED = False
+TRACE_DIR = f"{IMAGE_ROOT_DIR}/traces"
+TRACE_MAX_SESSIONS = 100
+METRICS_FILE = f"{IMAGE_ROOT_DIR}/metrics.prom"
+BATCH_DIR = f"{IMAGE_ROOT_DIR}/batches"
+BATCH_WORKERS = 4
+PLANNER_MODES = ("local", "llm")
+DEFAULT_PLANNER_MODE = "local"
+SLIDE_STORE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+SLIDE_STORE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+SLIDE_STORE_EVICTION_INTERVAL = 600.0
+OPENAI_IMAGE_REQUESTS_PER_MINUTE = 50
+OPENAI_IMAGE_TOKENS_PER_MINUTE = 100_000
+OPENAI_IMAGE_TOKENS_PER_REQUEST = 4160
+OPENAI_IMAGE_MAX_CONCURRENCY = 8
+GEMINI_REQUESTS_PER_MINUTE = 1000
+GEMINI_TOKENS_PER_MINUTE = 1_000_000
+GEMINI_MAX_OUTPUT_TOKENS_ESTIMATE = 2048
+GEMINI_MAX_CONCURRENCY = 16
+SCHEDULER_MAX_RETRIES = 5
+SCHEDULER_BACKOFF_BASE_SECONDS = 1.0
+SCHEDULER_BACKOFF_MAX_SECONDS = 60.0
+DRAFT_IMAGE_SIZE = "1024x1024"
+DRAFT_IMAGE_QUALITY = "low"
+DRAFT_IMAGE_TOKENS_PER_REQUEST = 272
+ARTICLE_FETCH_CACHE_DIR = f"{IMAGE_ROOT_DIR}/article_fetch"
+ARTICLE_FETCH_TIMEOUT_SECONDS = 20.0
+ARTICLE_FETCH_MAX_BYTES = 5 * 1024 * 1024
+ARTICLE_FETCH_USER_AGENT = "Mozilla/5.0 (compatible; linkedin-infographic-agent/1.0)"
+NEAR_DUPLICATE_REUSE = True
+NEAR_DUPLICATE_THRESHOLD = 0.7
+NEAR_DUPLICATE_NUM_PERM = 128
+NEAR_DUPLICATE_BANDS = 32
+NEAR_DUPLICATE_SHINGLE_WORDS = 3
+ARTICLE_COMPRESSION_ENABLED = False
+ARTICLE_COMPRESSION_TOKEN_BUDGET = 4000
@@ -0,0 +1,76 @@
+import re
+from typing import Iterator
+
+from ..constants import ARTICLE_CHUNK_TOKENS
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_HEADING = re.compile(r"^\s*(#{1,6}\s+\S|[A-Z0-9][^\n.!?]{0,80}:?\s*$)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for chunk budgeting."""
+    return (len(text) + 3) // 4
+
+
+def is_heading(line: str) -> bool:
+    """A markdown heading or a short title-like line without sentence punctuation."""
+    return bool(_HEADING.match(line))
+
+
+def _iter_paragraphs(article_text: str) -> Iterator[str]:
+    """Yield paragraphs lazily without splitting the whole article into a list."""
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(article_text):
+        paragraph = article_text[start:match.start()].strip()
+        if paragraph:
+            yield paragraph
+        start = match.end()
+    paragraph = article_text[start:].strip()
+    if paragraph:
+        yield paragraph
+
+
+def _split_oversized(paragraph: str, max_tokens: int) -> Iterator[str]:
+    """Split a paragraph larger than the budget on sentence boundaries (or hard cut as a last resort)."""
+    max_chars = max_tokens * 4
+    piece = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        while len(sentence) > max_chars:
+            if piece:
+                yield piece
+                piece = ""
+            yield sentence[:max_chars]
+            sentence = sentence[max_chars:]
+        if piece and len(piece) + len(sentence) + 1 > max_chars:
+            yield piece
+            piece = ""
+        piece = f"{piece} {sentence}" if piece else sentence
+    if piece:
+        yield piece
+
+
+def iter_article_chunks(article_text: str, max_tokens: int = ARTICLE_CHUNK_TOKENS) -> Iterator[str]:
+    """
+    Yield token-bounded chunks of an article, preferring section boundaries.
+    A new chunk starts at a heading once the current chunk is at least half full,
+    or whenever the next paragraph would exceed max_tokens.
+    """
+    parts = []
+    used = 0
+    for paragraph in _iter_paragraphs(article_text):
+        tokens = estimate_tokens(paragraph)
+        starts_section = is_heading(paragraph.split("\n", 1)[0])
+        if parts and (
+            used + tokens > max_tokens or (starts_section and used >= max_tokens // 2)
+        ):
+            yield "\n\n".join(parts)
+            parts, used = [], 0
+        if tokens > max_tokens:
+            for piece in _split_oversized(paragraph, max_tokens):
+                yield piece
+            continue
+        parts.append(paragraph)
+        used += tokens
+    if parts:
+        yield "\n\n".join(parts)
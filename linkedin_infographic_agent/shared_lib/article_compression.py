@@ -0,0 +1,176 @@
+import re
+import string
+import time
+from itertools import chain
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..constants import ARTICLE_COMPRESSION_TOKEN_BUDGET
+from .article_chunking import estimate_tokens, is_heading
+from .tracing import trace_span
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+# Byte table that lower-cases ASCII letters and turns ASCII punctuation into spaces; translating the
+# UTF-8 bytes and splitting is several times faster than a \w+ regex on the text
+_TOKEN_TABLE = bytes(32 if chr(i) in string.punctuation else i for i in range(256)).lower()
+_NUMBER = re.compile(r"\d")
+_REFERENCE = re.compile(r"\[\d+\]")
+# Lines that name a source: links, attributions, references and the article header fields.
+# Checked with substring tests on the lower-cased text, which are much cheaper than one regex.
+_CITATION_MARKERS = ("http://", "https://", "www.", "doi:", "et al", "according to")
+_CITATION_PREFIXES = ("source:", "author:", "date:", "published", "by ")
+# Header lines ("Author: A. Writer", bylines) up to this length are kept whole rather than split into sentences
+_HEADER_LINE_MAX_CHARS = 200
+# LexRank damping and stopping rule for the centrality power iteration
+CENTRALITY_DAMPING = 0.85
+CENTRALITY_MAX_ITERATIONS = 50
+CENTRALITY_TOLERANCE = 1e-6
+
+
+def _cites_source(lower: str) -> bool:
+    return (
+        lower.startswith(_CITATION_PREFIXES)
+        or any(marker in lower for marker in _CITATION_MARKERS)
+        or ("[" in lower and _REFERENCE.search(lower) is not None)
+    )
+
+
+def _split_units(article_text: str) -> List[Tuple[int, int, str, bool]]:
+    """
+    (paragraph, line, text, pinned) for every sentence in article order. Headings and short
+    source/author/date lines are pinned and kept whole, so "Author: A. Writer" is not split
+    at the initial.
+    """
+    units = []
+    for paragraph_index, paragraph in enumerate(_PARAGRAPH_BREAK.split(article_text)):
+        for line_index, line in enumerate(paragraph.strip().split("\n")):
+            line = " ".join(line.split())
+            if not line:
+                continue
+            if is_heading(line) or (
+                len(line) <= _HEADER_LINE_MAX_CHARS and line.lower().startswith(_CITATION_PREFIXES)
+            ):
+                units.append((paragraph_index, line_index, line, True))
+                continue
+            for sentence in _SENTENCE_END.split(line):
+                if sentence.strip():
+                    units.append((paragraph_index, line_index, sentence.strip(), False))
+    return units
+
+
+def sentence_centrality(tokens: List[List[bytes]]) -> np.ndarray:
+    """
+    LexRank-style centrality of each tokenized sentence over the cosine-similarity graph of
+    their TF-IDF vectors. The graph is never materialized: each power-iteration step multiplies
+    by X and X^T through bincounts over the (sentence, term) pairs, so the cost is linear in the
+    text length.
+    """
+    count = len(tokens)
+    if count == 0:
+        return np.empty(0)
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=count)
+    total = int(lengths.sum())
+    if not total:
+        return np.full(count, 1.0 / count)
+    # Term ids from string hashes; only compared within this call, so per-process hash seeds do not matter
+    word_hashes = np.fromiter(map(hash, chain.from_iterable(tokens)), dtype=np.int64, count=total)
+    _, terms = np.unique(word_hashes, return_inverse=True)
+    size = int(terms.max()) + 1
+    pairs, term_counts = np.unique(np.repeat(np.arange(count), lengths) * size + terms, return_counts=True)
+    pair_sentences, pair_terms = pairs // size, pairs % size
+
+    document_frequency = np.bincount(pair_terms, minlength=size)
+    idf = np.log((1 + count) / (1 + document_frequency)) + 1.0
+    weights = (1.0 + np.log(term_counts)) * idf[pair_terms]
+    norms = np.sqrt(np.bincount(pair_sentences, weights=weights * weights, minlength=count))
+    weights /= norms[pair_sentences]
+    has_terms = norms > 0
+
+    def similarity_product(vector: np.ndarray) -> np.ndarray:
+        # (X X^T - I) vector, i.e. cosine similarities to every other sentence
+        by_term = np.bincount(pair_terms, weights=weights * vector[pair_sentences], minlength=size)
+        product = np.bincount(pair_sentences, weights=weights * by_term[pair_terms], minlength=count)
+        return product - vector * has_terms
+
+    degree = similarity_product(np.ones(count))
+    connected = degree > 1e-12
+    inverse_degree = np.where(connected, 1.0 / np.where(connected, degree, 1.0), 0.0)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(CENTRALITY_MAX_ITERATIONS):
+        updated = (1 - CENTRALITY_DAMPING) / count + CENTRALITY_DAMPING * similarity_product(scores * inverse_degree)
+        updated /= updated.sum()
+        if np.abs(updated - scores).sum() < CENTRALITY_TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def compress_article(article_text: str, token_budget: int = ARTICLE_COMPRESSION_TOKEN_BUDGET) -> Dict[str, Any]:
+    """
+    Extractive pre-compression of an article before it is sent to the model.
+    Headings, sentences with numbers and citation-bearing lines are always kept; repeated
+    sentences are dropped; the remaining sentences are kept in order of centrality until the
+    estimated token count reaches token_budget. Kept text stays in article order.
+    Returns the text with original/compressed token estimates, tokens_saved and compression_ratio.
+    """
+    start = time.perf_counter()
+    original_tokens = estimate_tokens(article_text)
+    with trace_span("article.compress") as span:
+        units = _split_units(article_text) if original_tokens > token_budget else []
+        keep = np.zeros(len(units), dtype=bool)
+        candidates, candidate_tokens, seen = [], [], set()
+        for index, (_, _, text, pinned) in enumerate(units):
+            if pinned or _NUMBER.search(text) or _cites_source(text.lower()):
+                keep[index] = True
+                continue
+            words = text.encode("utf-8").translate(_TOKEN_TABLE).split()
+            normalized = b" ".join(words)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                candidates.append(index)
+                candidate_tokens.append(words)
+
+        if units:
+            unit_tokens = np.fromiter((estimate_tokens(text) + 1 for _, _, text, _ in units), dtype=np.int64, count=len(units))
+            remaining = token_budget - int(unit_tokens[keep].sum())
+            scores = sentence_centrality(candidate_tokens)
+            for position in np.argsort(-scores, kind="stable"):
+                index = candidates[position]
+                if unit_tokens[index] <= remaining:
+                    keep[index] = True
+                    remaining -= int(unit_tokens[index])
+                    if remaining <= 0:
+                        break
+            text = _join_units([unit for unit, kept in zip(units, keep) if kept])
+        else:
+            text = article_text
+        compressed_tokens = estimate_tokens(text)
+        report = {
+            "text": text,
+            "original_tokens": original_tokens,
+            "compressed_tokens": compressed_tokens,
+            "tokens_saved": original_tokens - compressed_tokens,
+            "compression_ratio": round(compressed_tokens / original_tokens, 3) if original_tokens else 1.0,
+            "sentences_total": len(units),
+            "sentences_kept": int(keep.sum()),
+            "milliseconds": round((time.perf_counter() - start) * 1000, 2),
+        }
+        span.update({key: value for key, value in report.items() if key != "text"})
+    return report
+
+
+def _join_units(units: List[Tuple[int, int, str, bool]]) -> str:
+    paragraphs: List[List[List[str]]] = []
+    last = None
+    for paragraph_index, line_index, text, _ in units:
+        if last is None or paragraph_index != last[0]:
+            paragraphs.append([[text]])
+        elif line_index != last[1]:
+            paragraphs[-1].append([text])
+        else:
+            paragraphs[-1][-1].append(text)
+        last = (paragraph_index, line_index)
+    return "\n\n".join("\n".join(" ".join(line) for line in paragraph) for paragraph in paragraphs)
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..constants import ARTICLE_FETCH_CACHE_DIR, ARTICLE_FETCH_MAX_BYTES
+from .clients import get_http_client
+from .image_io import atomic_output
+from .tracing import trace_span
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = ("text/plain", "text/markdown")
+# Characters decoded per streamed chunk
+FETCH_CHUNK_SIZE = 64 * 1024
+# <article>/<main> text is preferred when it holds at least this share of the page text
+MAIN_CONTENT_MIN_SHARE = 0.25
+
+_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "header", "footer", "aside", "form", "button", "select",
+})
+_BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "blockquote", "pre",
+    "table", "tr", "td", "th", "dd", "dt", "dl", "figcaption", "br", "hr",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+})
+_HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+_MAIN_TAGS = frozenset({"article", "main"})
+_META_FIELDS = {
+    "author": "author",
+    "article:author": "author",
+    "article:published_time": "date",
+    "date": "date",
+    "og:site_name": "source",
+    "og:title": "title",
+}
+
+
+class ReadableTextExtractor(HTMLParser):
+    """
+    Streaming main-text extractor. Fed HTML chunk by chunk, it keeps only the text of
+    block elements outside navigation/script/boilerplate tags, as paragraphs with
+    markdown-style headings. No element tree is built; memory grows with the text kept.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.metadata: Dict[str, str] = {}
+        self._paragraphs: List[str] = []
+        self._main_paragraphs: List[str] = []
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._heading_level = 0
+        self._in_title = False
+        self._list_item = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._main_depth += 1
+        if tag in _HEADING_TAGS:
+            self._heading_level = _HEADING_TAGS[tag]
+        elif tag == "li":
+            self._list_item = True
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag == "title":
+            self._in_title = False
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._main_depth = max(0, self._main_depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._buffer.append(data)
+
+    def _handle_meta(self, attrs: Dict[str, Optional[str]]) -> None:
+        name = (attrs.get("property") or attrs.get("name") or "").lower()
+        field = _META_FIELDS.get(name)
+        content = " ".join((attrs.get("content") or "").split())
+        if field and content and field not in self.metadata:
+            self.metadata[field] = content
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._buffer).split())
+        self._buffer = []
+        if text and not self._skip_depth:
+            if self._heading_level:
+                text = f"{'#' * self._heading_level} {text}"
+            elif self._list_item:
+                text = f"- {text}"
+            if not self._paragraphs or self._paragraphs[-1] != text:
+                self._paragraphs.append(text)
+                if self._main_depth:
+                    self._main_paragraphs.append(text)
+        self._heading_level = 0
+        self._list_item = False
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def text(self) -> str:
+        """The extracted text: the <article>/<main> content when it is substantial, else the whole page."""
+        page_chars = sum(len(p) for p in self._paragraphs)
+        main_chars = sum(len(p) for p in self._main_paragraphs)
+        paragraphs = self._paragraphs
+        if main_chars and main_chars >= page_chars * MAIN_CONTENT_MIN_SHARE:
+            paragraphs = self._main_paragraphs
+        return "\n\n".join(paragraphs)
+
+
+def _cache_path(url: str) -> str:
+    return os.path.join(ARTICLE_FETCH_CACHE_DIR, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json")
+
+
+def load_cached_fetch(url: str) -> Optional[Dict[str, Any]]:
+    """Return the last fetch of url (extracted text plus validators), or None."""
+    try:
+        with open(_cache_path(url), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and entry.get("url") == url else None
+
+
+def _store_fetch(entry: Dict[str, Any]) -> None:
+    with atomic_output(_cache_path(entry["url"])) as f:
+        f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def _article_header(url: str, title: str, metadata: Dict[str, str]) -> str:
+    """Title and citation lines put in front of the text so the extraction can cite the article."""
+    lines = [f"# {title}"] if title else []
+    lines.append(f"Source: {metadata.get('source') or urlparse(url).netloc} ({url})")
+    if metadata.get("author"):
+        lines.append(f"Author: {metadata['author']}")
+    if metadata.get("date"):
+        lines.append(f"Date: {metadata['date']}")
+    return "\n".join(lines)
+
+
+def fetch_url(url: str, max_bytes: int = ARTICLE_FETCH_MAX_BYTES) -> Dict[str, Any]:
+    """
+    Fetch an article and extract its readable text, streaming the body through the extractor.
+    A previously fetched URL is revalidated with If-None-Match / If-Modified-Since; a 304 returns
+    the cached text without downloading the page again. Bodies over max_bytes are truncated.
+    Returns url, final_url, title, text, metadata, not_modified, truncated and bytes.
+    Raises ValueError for unsupported URLs or content types and httpx errors for HTTP failures.
+    """
+    if urlparse(url).scheme not in ("http", "https") or not urlparse(url).netloc:
+        raise ValueError(f"Not an http(s) URL: {url}")
+    cached = load_cached_fetch(url)
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    with trace_span("article.fetch", kind="backend") as span:
+        with get_http_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                span["cache_hit"] = True
+                return dict(cached, not_modified=True, bytes=0)
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type not in HTML_CONTENT_TYPES + TEXT_CONTENT_TYPES:
+                raise ValueError(f"Unsupported content type '{content_type}' at {url}")
+            extractor = ReadableTextExtractor() if content_type in HTML_CONTENT_TYPES else None
+            plain_parts: List[str] = []
+            truncated = False
+            for chunk in response.iter_text(FETCH_CHUNK_SIZE):
+                if extractor is not None:
+                    extractor.feed(chunk)
+                else:
+                    plain_parts.append(chunk)
+                if response.num_bytes_downloaded > max_bytes:
+                    truncated = True
+                    break
+            span["response_bytes"] = response.num_bytes_downloaded
+            entry = {
+                "url": url,
+                "final_url": str(response.url),
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "fetched": time.time(),
+                "truncated": truncated,
+                "bytes": response.num_bytes_downloaded,
+            }
+    if extractor is not None:
+        extractor.close()
+        body = extractor.text()
+        title = " ".join((extractor.metadata.get("title") or extractor.title).split())
+        metadata = extractor.metadata
+    else:
+        body = "".join(plain_parts).strip()
+        title, metadata = "", {}
+    entry.update(
+        title=title,
+        metadata=metadata,
+        text=f"{_article_header(entry['final_url'], title, metadata)}\n\n{body}" if body else "",
+    )
+    if body and (entry["etag"] or entry["last_modified"]):
+        try:
+            _store_fetch(entry)
+        except OSError as e:
+            print(f"[article_fetch] Could not cache fetched article. Error: {e}")
+    return dict(entry, not_modified=False)
@@ -0,0 +1,230 @@
+import os
+import re
+import threading
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..constants import (
+    ARTICLE_CONTENT_DIR,
+    NEAR_DUPLICATE_BANDS,
+    NEAR_DUPLICATE_NUM_PERM,
+    NEAR_DUPLICATE_SHINGLE_WORDS,
+    NEAR_DUPLICATE_THRESHOLD,
+)
+from .article_utils import normalize_article_text
+from .tracing import trace_span
+
+# MinHash permutations h(x) = (a * x + b) mod p, truncated to 32 bits; the fixed seed keeps
+# signatures comparable across processes and with the persisted index
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_PERMUTATION_SEED = 1
+# Shingles hashed against every permutation at once; bounds the temporary matrix to ~4 MB
+_SHINGLE_BLOCK = 4096
+# Appended signatures are scanned linearly until this many are pending, then the band tables are re-sorted
+_PENDING_MERGE_SIZE = 4096
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _permutations(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(_PERMUTATION_SEED)
+    a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+    b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+    return a, b
+
+
+_PERM_A, _PERM_B = _permutations(NEAR_DUPLICATE_NUM_PERM)
+# Multipliers folding a band's rows into one 64-bit bucket key
+_BAND_MULTIPLIERS = (
+    np.random.RandomState(_PERMUTATION_SEED + 1)
+    .randint(1, 1 << 62, size=NEAR_DUPLICATE_NUM_PERM // NEAR_DUPLICATE_BANDS, dtype=np.int64)
+    .astype(np.uint64)
+    | np.uint64(1)
+)
+_BAND_NUMBER_MASK = np.uint64((1 << max(1, (NEAR_DUPLICATE_BANDS - 1).bit_length())) - 1)
+
+
+def shingle_hashes(article_text: str, shingle_words: int = NEAR_DUPLICATE_SHINGLE_WORDS) -> np.ndarray:
+    """Unique 32-bit hashes of the overlapping word n-grams of the normalized, lower-cased text."""
+    words = _WORD_PATTERN.findall(normalize_article_text(article_text).lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+    span = min(shingle_words, len(word_hashes))
+    combined = word_hashes[: len(word_hashes) - span + 1].copy()
+    with np.errstate(over="ignore"):
+        for offset in range(1, span):
+            combined = combined * np.uint64(0x100000001B3) + word_hashes[offset : len(word_hashes) - span + 1 + offset]
+    return np.unique(combined & _MAX_HASH)
+
+
+def minhash_signature(article_text: str) -> Optional[np.ndarray]:
+    """The NEAR_DUPLICATE_NUM_PERM-value MinHash signature of an article, or None for empty text."""
+    shingles = shingle_hashes(article_text)
+    if not len(shingles):
+        return None
+    signature = np.full(NEAR_DUPLICATE_NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for start in range(0, len(shingles), _SHINGLE_BLOCK):
+            block = shingles[start : start + _SHINGLE_BLOCK, None]
+            hashed = ((block * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+            np.minimum(signature, hashed.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """
+    LSH bucket keys: one uint64 per band for each signature row, shape (n, NEAR_DUPLICATE_BANDS).
+    The band number replaces the low bits of the key, so every band can share one sorted table.
+    """
+    bands = signatures.reshape(len(signatures), NEAR_DUPLICATE_BANDS, -1).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        keys = (bands * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    return (keys & ~_BAND_NUMBER_MASK) | np.arange(NEAR_DUPLICATE_BANDS, dtype=np.uint64)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of processed articles, persisted as an append-only file of
+    (article cache key, signature) records. Lookups binary-search the sorted bucket keys of
+    all bands at once and verify the candidates' signatures, so their cost stays flat as the
+    index grows.
+    Other threads and processes appending to the file are picked up on the next lookup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._record = np.dtype([("key", "S64"), ("signature", "<u4", (NEAR_DUPLICATE_NUM_PERM,))])
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._file_bytes = 0
+        self._count = 0
+        # Row buffers grow by doubling so appending a signature does not copy the whole index
+        self._keys = np.empty(0, dtype="S64")
+        self._signatures = np.empty((0, NEAR_DUPLICATE_NUM_PERM), dtype=np.uint32)
+        self._band_keys = np.empty((0, NEAR_DUPLICATE_BANDS), dtype=np.uint64)
+        # Bucket keys of every band of the first _sorted_count signatures, sorted, and the row of each
+        self._sorted_keys = np.empty(0, dtype=np.uint64)
+        self._sorted_rows = np.empty(0, dtype=np.int64)
+        self._sorted_count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _refresh(self) -> None:
+        """Load records appended to the file since the last refresh (caller holds the lock)."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size < self._file_bytes:
+            self._reset()
+        complete = size - size % self._record.itemsize
+        if complete <= self._file_bytes:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._file_bytes)
+            records = np.frombuffer(f.read(complete - self._file_bytes), dtype=self._record)
+        self._file_bytes = complete
+        self._append(records["key"], records["signature"])
+
+    def _append(self, keys: np.ndarray, signatures: np.ndarray) -> None:
+        count = self._count + len(keys)
+        if count > len(self._keys):
+            capacity = max(count, 2 * len(self._keys), 1024)
+            self._keys = np.resize(self._keys, capacity)
+            self._signatures = np.resize(self._signatures, (capacity, NEAR_DUPLICATE_NUM_PERM))
+            self._band_keys = np.resize(self._band_keys, (capacity, NEAR_DUPLICATE_BANDS))
+        self._keys[self._count : count] = keys
+        self._signatures[self._count : count] = signatures
+        self._band_keys[self._count : count] = band_keys(signatures)
+        self._count = count
+        if count - self._sorted_count > _PENDING_MERGE_SIZE:
+            flat = self._band_keys[:count].ravel()
+            order = np.argsort(flat)
+            self._sorted_keys = flat[order]
+            self._sorted_rows = order // NEAR_DUPLICATE_BANDS
+            self._sorted_count = count
+
+    def _candidates(self, query_keys: np.ndarray) -> np.ndarray:
+        rows = []
+        if self._sorted_count:
+            low = np.searchsorted(self._sorted_keys, query_keys, side="left")
+            high = np.searchsorted(self._sorted_keys, query_keys, side="right")
+            for band in np.flatnonzero(high > low):
+                rows.append(self._sorted_rows[low[band] : high[band]])
+        pending = self._band_keys[self._sorted_count : self._count]
+        if len(pending):
+            rows.append(np.flatnonzero((pending == query_keys).any(axis=1)) + self._sorted_count)
+        return np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def query(self, signature: np.ndarray, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """Return (cache key, estimated Jaccard similarity) of the most similar article at or above threshold."""
+        query_keys = band_keys(signature[None, :])[0]
+        with self._lock:
+            self._refresh()
+            candidates = self._candidates(query_keys)
+            if not len(candidates):
+                return None
+            similarities = (self._signatures[candidates] == signature).mean(axis=1)
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                return None
+            return self._keys[candidates[best]].decode("ascii"), float(similarities[best])
+
+    def add(self, cache_key: str, signature: np.ndarray) -> None:
+        """
+        Append an article's signature to the index file, then load it back with any records other
+        processes appended meanwhile, so the in-memory tables always mirror the file in order.
+        """
+        record = np.zeros(1, dtype=self._record)
+        record["key"] = cache_key.encode("ascii")
+        record["signature"] = signature
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(record.tobytes())
+            self._refresh()
+
+
+_index_lock = threading.Lock()
+_index: Optional[NearDuplicateIndex] = None
+
+
+def _index_path() -> str:
+    # Signature parameters are part of the name, so changing them starts a fresh, compatible index
+    return os.path.join(
+        ARTICLE_CONTENT_DIR, f"near_duplicates_{NEAR_DUPLICATE_NUM_PERM}p_{NEAR_DUPLICATE_SHINGLE_WORDS}w.bin"
+    )
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Return the process-wide near-duplicate index for ARTICLE_CONTENT_DIR."""
+    global _index
+    path = _index_path()
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = NearDuplicateIndex(path)
+        return _index
+
+
+def find_near_duplicate(
+    signature: Optional[np.ndarray], threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> Optional[Tuple[str, float]]:
+    """Cache key and similarity of a previously processed near-duplicate article, or None."""
+    if signature is None:
+        return None
+    with trace_span("near_duplicate.lookup", kind="cache") as span:
+        match = get_near_duplicate_index().query(signature, threshold)
+        span["cache_hit"] = match is not None
+    return match
+
+
+def index_article(cache_key: str, signature: Optional[np.ndarray]) -> None:
+    """Record a processed article so later near-duplicates of it can be found."""
+    if signature is not None:
+        get_near_duplicate_index().add(cache_key, signature)
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from ..constants import ARTICLE_CONTENT_DIR
+from .file_lock import file_lock
+
+ARTICLE_INDEX_FILENAME = "index.json"
+PROCESSED_ARTICLE_FIELDS = ("summary", "key_points", "structure", "citation")
+# Header lines ("Source: ...", "Author: ...") that state an article's citation, and how many
+# leading lines are searched for them
+HEADER_CITATION_FIELDS = {"source": "source", "author": "author", "by": "author", "date": "date", "published": "date", "url": "url"}
+HEADER_CITATION_LINES = 8
+_SOURCE_WITH_URL = re.compile(r"(.*?)\s*\((https?://[^\s)]+)\)")
+
+_index_lock = threading.Lock()
+_index_cache: Dict[str, Any] = {"version": None, "entries": {}}
+
+
+def save_processed_article(article_data: Dict[str, Any], identifier: str) -> str:
+    """
+    Save processed article data as a JSON file in ARTICLE_CONTENT_DIR.
+
+    Args:
+        article_data (dict): The processed article data to save.
+        identifier (str): A unique identifier for the article (e.g., title, hash, or timestamp).
+
+    Returns:
+        str: The path to the saved file.
+    """
+    os.makedirs(ARTICLE_CONTENT_DIR, exist_ok=True)
+    # Sanitize identifier for filename
+    safe_identifier = "".join(c for c in identifier if c.isalnum() or c in ("-", "_"))
+    filename = f"article_{safe_identifier}.json"
+    filepath = os.path.join(ARTICLE_CONTENT_DIR, filename)
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(article_data, f, ensure_ascii=False, indent=2)
+    return filepath
+
+
+def normalize_article_text(article_text: str) -> str:
+    """Normalize unicode and collapse whitespace so cosmetic differences hit the same cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", article_text).split())
+
+
+def header_citation(article_text: str) -> Dict[str, str]:
+    """
+    Citation fields stated by the article's own header lines, e.g. "Source: Example Wire (https://...)",
+    "Author: ..." and "Date: ..." as written by fetch_article. Empty when the article has no such header.
+    """
+    citation: Dict[str, str] = {}
+    lines = [line.strip() for line in article_text.lstrip()[:4000].splitlines() if line.strip()]
+    for line in lines[:HEADER_CITATION_LINES]:
+        name, separator, value = line.partition(":")
+        field = HEADER_CITATION_FIELDS.get(name.strip().lower())
+        value = value.strip()
+        if not separator or field is None or not value or field in citation:
+            continue
+        match = _SOURCE_WITH_URL.fullmatch(value) if field == "source" else None
+        if match:
+            value = match.group(1)
+            citation.setdefault("url", match.group(2))
+        citation[field] = value
+    return citation
+
+
+def article_cache_key(article_text: str, model_name: str) -> str:
+    """Hash the normalized article text together with the model that processed it."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8") + b"\0")
+    digest.update(normalize_article_text(article_text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _index_path() -> str:
+    return os.path.join(ARTICLE_CONTENT_DIR, ARTICLE_INDEX_FILENAME)
+
+
+def _index_version(path: str) -> tuple:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _load_index() -> Dict[str, str]:
+    """Return the key -> filename index, re-reading the file only when it changed on disk."""
+    path = _index_path()
+    try:
+        version = _index_version(path)
+    except OSError:
+        return {}
+    if _index_cache["version"] != version:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        _index_cache["version"] = version
+        _index_cache["entries"] = entries
+    return _index_cache["entries"]
+
+
+def _write_index(entries: Dict[str, str]) -> None:
+    os.makedirs(ARTICLE_CONTENT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=ARTICLE_CONTENT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f, separators=(",", ":"))
+        os.replace(tmp_path, _index_path())
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _index_cache["version"] = _index_version(_index_path())
+    _index_cache["entries"] = entries
+
+
+def _index_write_lock():
+    """Lock held (by threads and other processes) around every read-modify-write of the index."""
+    return file_lock(_index_path() + ".lock")
+
+
+def is_processed_article(article_data: Any) -> bool:
+    """True for a dict with every PROCESSED_ARTICLE_FIELDS field, the only shape that is cached."""
+    return isinstance(article_data, dict) and all(field in article_data for field in PROCESSED_ARTICLE_FIELDS)
+
+
+def load_cached_article(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored processed article for cache_key, or None if it is not cached."""
+    with _index_lock:
+        filename = _load_index().get(cache_key)
+    if not filename:
+        return None
+    try:
+        with open(os.path.join(ARTICLE_CONTENT_DIR, filename), "r", encoding="utf-8") as f:
+            article_data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return article_data if is_processed_article(article_data) else None
+
+
+def cache_processed_article(cache_key: str, article_data: Dict[str, Any]) -> str:
+    """
+    Persist a processed article via save_processed_article and record it in the index.
+    Raises ValueError for data that is not a complete processed article.
+    """
+    if not is_processed_article(article_data):
+        raise ValueError(f"Not a processed article (expected a dict with {', '.join(PROCESSED_ARTICLE_FIELDS)})")
+    filepath = save_processed_article(article_data, cache_key)
+    with _index_write_lock(), _index_lock:
+        entries = dict(_load_index())
+        entries[cache_key] = os.path.basename(filepath)
+        _write_index(entries)
+    return filepath
+
+
+def link_cached_article(cache_key: str, existing_key: str) -> bool:
+    """
+    Point cache_key at the processed article already stored for existing_key (a near-duplicate),
+    so both keys share one article file and its carousel record. Returns False if existing_key is gone.
+    """
+    with _index_write_lock(), _index_lock:
+        entries = dict(_load_index())
+        filename = entries.get(existing_key)
+        if not filename:
+            return False
+        entries[cache_key] = filename
+        _write_index(entries)
+    return True
+
+
+def _carousel_record_path(cache_key: str) -> Optional[str]:
+    with _index_lock:
+        filename = _load_index().get(cache_key)
+    if not filename:
+        return None
+    return os.path.join(ARTICLE_CONTENT_DIR, "carousel_" + filename[len("article_"):])
+
+
+def load_carousel_record(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return the slide plans, style preamble and prompts last generated for this article, or None."""
+    path = _carousel_record_path(cache_key)
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or not record.get("slide_plans") or not record.get("prompts"):
+        return None
+    return record
+
+
+def save_carousel_record(
+    cache_key: str,
+    slide_plans: List[Dict[str, Any]],
+    prompts: List[str],
+    style_preamble: Optional[str] = None,
+    source_article_key: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Store the carousel generated from a cached article next to it, so the article and its
+    near-duplicates can reuse the plans and prompts (and, through the render cache, the slides).
+    source_article_key marks a record copied from a near-duplicate whose processed article differs
+    (e.g. its citation): its prompts can be reused per unchanged plan, but its plans must be redone.
+    Returns the path, or None if the article is not in the cache.
+    """
+    path = _carousel_record_path(cache_key)
+    if not path:
+        return None
+    record = {"slide_plans": slide_plans, "style_preamble": style_preamble or "", "prompts": prompts}
+    if source_article_key:
+        record["source_article_key"] = source_article_key
+    fd, tmp_path = tempfile.mkstemp(dir=ARTICLE_CONTENT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
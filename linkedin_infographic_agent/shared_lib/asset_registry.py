@@ -0,0 +1,115 @@
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from ..constants import ASSET_MAX_DIMENSION, INFOGRAPHIC_ASSETS_DIR
+
+
+_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+
+
+class PreparedAsset(NamedTuple):
+    """An asset normalized once and kept in memory, ready to upload."""
+
+    name: str
+    path: str
+    content_hash: str
+    data: bytes
+    mime_type: str
+
+    def as_upload(self) -> Tuple[str, bytes, str]:
+        """File tuple accepted by the OpenAI SDK, so no file handle is opened per call."""
+        extension = _EXTENSIONS.get(self.mime_type) or mimetypes.guess_extension(self.mime_type) or ""
+        return (os.path.splitext(self.name)[0] + extension, self.data, self.mime_type)
+
+
+_lock = threading.Lock()
+_snapshot: Optional[Tuple[Tuple[str, int, int], ...]] = None
+_assets: List[PreparedAsset] = []
+_by_hash: Dict[str, PreparedAsset] = {}
+
+
+def _scan_assets_dir() -> Tuple[Tuple[str, int, int], ...]:
+    """Cheap (name, mtime, size) snapshot used to detect changes without reading files."""
+    if not os.path.isdir(INFOGRAPHIC_ASSETS_DIR):
+        return ()
+    entries = []
+    with os.scandir(INFOGRAPHIC_ASSETS_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def normalize_asset(raw: bytes, max_dimension: int = ASSET_MAX_DIMENSION) -> Tuple[bytes, str]:
+    """
+    Downscale an image so its longest side fits max_dimension and recompress it.
+    Images without transparency become JPEG, everything else PNG. The original bytes
+    are kept when the image did not need resizing and is already smaller.
+    """
+    with Image.open(io.BytesIO(raw)) as image:
+        original_format = image.format
+        image.load()
+        resized = max(image.size) > max_dimension
+        if resized:
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        buffer = io.BytesIO()
+        if has_alpha:
+            image.convert("RGBA").save(buffer, format="PNG", optimize=True)
+            mime_type = "image/png"
+        else:
+            image.convert("RGB").save(buffer, format="JPEG", quality=90, optimize=True)
+            mime_type = "image/jpeg"
+    data = buffer.getvalue()
+    if not resized and original_format in ("PNG", "JPEG", "WEBP") and len(raw) <= len(data):
+        return raw, Image.MIME[original_format]
+    return data, mime_type
+
+
+def _prepare(name: str, path: str, raw: bytes, content_hash: str) -> Optional[PreparedAsset]:
+    previous = _by_hash.get(content_hash)
+    if previous is not None:
+        return previous._replace(name=name, path=path)
+    try:
+        data, mime_type = normalize_asset(raw)
+    except Exception as e:
+        print(f"[asset_registry] Skipping '{name}', not a readable image. Error: {e}")
+        return None
+    return PreparedAsset(name, path, content_hash, data, mime_type)
+
+
+def get_prepared_assets() -> List[PreparedAsset]:
+    """
+    Return the normalized, deduplicated assets from INFOGRAPHIC_ASSETS_DIR.
+    Files are only re-read when their mtime or size changes, and only re-normalized when
+    their content hash changes. The returned buffers are shared across all callers.
+    """
+    global _snapshot, _assets, _by_hash
+    snapshot = _scan_assets_dir()
+    with _lock:
+        if snapshot == _snapshot:
+            return list(_assets)
+        assets = []
+        by_hash = {}
+        for name, _, _ in snapshot:
+            path = os.path.join(INFOGRAPHIC_ASSETS_DIR, name)
+            with open(path, "rb") as f:
+                raw = f.read()
+            # Duplicates are dropped by hash before any decode or recompression
+            content_hash = hashlib.sha256(raw).hexdigest()
+            if content_hash in by_hash:
+                continue
+            asset = _prepare(name, path, raw, content_hash)
+            if asset is None:
+                continue
+            by_hash[asset.content_hash] = asset
+            assets.append(asset)
+        _snapshot, _assets, _by_hash = snapshot, assets, by_hash
+        return list(_assets)
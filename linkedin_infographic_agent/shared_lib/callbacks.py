@@ -1,12 +1,124 @@
+import json
 import os
+from typing import Any, Dict, Optional
+
 from ..constants import INFOGRAPHIC_ASSETS_DIR
+from .tracing import (
+    end_span,
+    export_session_trace,
+    set_current_session,
+    start_span,
+    tracing_enabled,
+    write_prometheus_metrics,
+)
 
 def ensure_infographic_assets_directory_exists() -> None:
     """Ensure the infographic assets directory exists."""
     os.makedirs(INFOGRAPHIC_ASSETS_DIR, exist_ok=True)
 
-def before_model_callback(tool_context):
-    """
-    Placeholder for any pre-model-call logic. Currently does nothing, but can be extended to prepare assets, mutate state, etc.
-    """
-    return tool_context 
\ No newline at end of file
+def _session_id(context: Any) -> Optional[str]:
+    invocation_context = getattr(context, "_invocation_context", None)
+    session = getattr(invocation_context, "session", None)
+    return getattr(session, "id", None)
+
+def _json_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+def before_agent_callback(callback_context):
+    """Open a span for an agent run (including delegations to sub-agents)."""
+    if not tracing_enabled():
+        return None
+    start_span(
+        ("agent", callback_context.invocation_id, callback_context.agent_name),
+        callback_context.agent_name,
+        "agent",
+        session_id=_session_id(callback_context),
+    )
+    return None
+
+def after_agent_callback(callback_context):
+    """Close the agent span. When the root agent finishes, export the session trace and metrics."""
+    if not tracing_enabled():
+        return None
+    end_span(("agent", callback_context.invocation_id, callback_context.agent_name))
+    invocation_context = getattr(callback_context, "_invocation_context", None)
+    root_agent = getattr(getattr(invocation_context, "agent", None), "root_agent", None)
+    if root_agent is not None and root_agent.name == callback_context.agent_name:
+        session_id = _session_id(callback_context)
+        try:
+            if session_id:
+                export_session_trace(session_id)
+            write_prometheus_metrics()
+        except OSError as e:
+            print(f"[callbacks] Could not export trace. Error: {e}")
+    return None
+
+def before_model_callback(callback_context, llm_request):
+    """Open a span for an LLM call. Never short-circuits the call."""
+    if not tracing_enabled():
+        return None
+    start_span(
+        ("model", callback_context.invocation_id, callback_context.agent_name),
+        f"{callback_context.agent_name}.llm",
+        "model",
+        session_id=_session_id(callback_context),
+        request_bytes=len(llm_request.model_dump_json(exclude_none=True)),
+    )
+    return None
+
+def after_model_callback(callback_context, llm_response):
+    """Close the LLM span with response size and token counts when the model reports them."""
+    if not tracing_enabled():
+        return None
+    attrs: Dict[str, Any] = {
+        "response_bytes": len(llm_response.model_dump_json(exclude_none=True)),
+        "status": "error" if llm_response.error_code else "ok",
+    }
+    usage = getattr(llm_response, "usage_metadata", None)
+    if usage is not None:
+        attrs["input_tokens"] = getattr(usage, "prompt_token_count", None) or 0
+        attrs["output_tokens"] = getattr(usage, "candidates_token_count", None) or 0
+    end_span(("model", callback_context.invocation_id, callback_context.agent_name), **attrs)
+    return None
+
+def before_tool_callback(tool, args, tool_context):
+    """Open a span for a tool call and attribute spans recorded inside the tool to this session."""
+    if not tracing_enabled():
+        return None
+    session_id = _session_id(tool_context)
+    set_current_session(session_id)
+    start_span(
+        ("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name),
+        tool.name,
+        "tool",
+        session_id=session_id,
+        request_bytes=_json_size(args),
+    )
+    return None
+
+def after_tool_callback(tool, args, tool_context, tool_response):
+    """Close the tool span with response size, status and cache-hit flag."""
+    if not tracing_enabled():
+        return None
+    attrs: Dict[str, Any] = {"response_bytes": _json_size(tool_response)}
+    if isinstance(tool_response, dict):
+        attrs["status"] = tool_response.get("status", "ok")
+        attrs["cache_hit"] = bool(tool_response.get("from_cache"))
+    end_span(
+        ("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name),
+        **attrs,
+    )
+    return None
+
+# Keyword arguments that attach the tracing callbacks to an Agent
+AGENT_TRACING_CALLBACKS = {
+    "before_agent_callback": before_agent_callback,
+    "after_agent_callback": after_agent_callback,
+    "before_model_callback": before_model_callback,
+    "after_model_callback": after_model_callback,
+    "before_tool_callback": before_tool_callback,
+    "after_tool_callback": after_tool_callback,
+}
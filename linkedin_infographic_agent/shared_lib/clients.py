@@ -0,0 +1,250 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+from ..constants import (
+    ARTICLE_FETCH_TIMEOUT_SECONDS,
+    ARTICLE_FETCH_USER_AGENT,
+    CLIENT_WARMUP_CONNECT,
+    GEMINI_MODEL,
+    GEMINI_TIMEOUT_SECONDS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_TIMEOUT_SECONDS,
+)
+
+_lock = threading.Lock()
+_openai_client = None
+_http_client = None
+# The openai, httpx and google.generativeai SDKs are imported on first use, not at agent startup
+_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_installed_async_openai_client = None
+_gemini_configured = False
+_gemini_models: Dict[str, Any] = {}
+_stats = {
+    "openai_clients_created": 0,
+    "openai_requests": 0,
+    "openai_connections_opened": 0,
+    "gemini_configured": 0,
+    "gemini_models_created": 0,
+    "http_clients_created": 0,
+}
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+
+
+def _trace(event_name: str, info: Dict) -> None:
+    """httpcore trace hook: a TCP connect means the request could not reuse a pooled connection."""
+    if event_name == "connection.connect_tcp.complete":
+        _count("openai_connections_opened")
+
+
+async def _async_trace(event_name: str, info: Dict) -> None:
+    _trace(event_name, info)
+
+
+def _on_request(request: "httpx.Request") -> None:
+    _count("openai_requests")
+    request.extensions["trace"] = _trace
+
+
+async def _on_async_request(request: "httpx.Request") -> None:
+    _count("openai_requests")
+    request.extensions["trace"] = _async_trace
+
+
+def _http_limits() -> "httpx.Limits":
+    """
+    Pool limits for the httpx clients built here (OpenAI and article fetching). They do not
+    apply to Gemini: google.generativeai keeps its own gRPC channel, configured by the SDK.
+    """
+    import httpx
+
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _openai_api_key() -> str:
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    return api_key
+
+
+def get_openai_client() -> "OpenAI":
+    """
+    Return the process-wide OpenAI client, created on first use with a keep-alive connection pool.
+    SDK retries are off: retries and backoff are handled by shared_lib.scheduler.
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                import httpx
+                from openai import OpenAI
+
+                http_client = httpx.Client(
+                    limits=_http_limits(),
+                    timeout=OPENAI_TIMEOUT_SECONDS,
+                    event_hooks={"request": [_on_request]},
+                )
+                _openai_client = OpenAI(
+                    api_key=_openai_api_key(),
+                    timeout=OPENAI_TIMEOUT_SECONDS,
+                    max_retries=0,
+                    http_client=http_client,
+                )
+                _stats["openai_clients_created"] += 1
+    return _openai_client
+
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """
+    Return the AsyncOpenAI client for the running event loop.
+    Async connection pools are bound to the loop they were created on, so one client is kept per loop.
+    """
+    if _installed_async_openai_client is not None:
+        return _installed_async_openai_client
+    import httpx
+    from openai import AsyncOpenAI
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_openai_clients.get(loop)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=_http_limits(),
+                timeout=OPENAI_TIMEOUT_SECONDS,
+                event_hooks={"request": [_on_async_request]},
+            )
+            client = AsyncOpenAI(
+                api_key=_openai_api_key(),
+                timeout=OPENAI_TIMEOUT_SECONDS,
+                max_retries=0,
+                http_client=http_client,
+            )
+            _async_openai_clients[loop] = client
+            _stats["openai_clients_created"] += 1
+    return client
+
+
+def get_http_client() -> "httpx.Client":
+    """
+    Return the process-wide httpx client for fetching web pages (articles), created on first use
+    with the same keep-alive pool limits as the API clients. Redirects are followed.
+    """
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                import httpx
+
+                _http_client = httpx.Client(
+                    limits=_http_limits(),
+                    timeout=ARTICLE_FETCH_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                    headers={"User-Agent": ARTICLE_FETCH_USER_AGENT},
+                )
+                _stats["http_clients_created"] += 1
+    return _http_client
+
+
+def get_gemini_model(model_name: str) -> Any:
+    """
+    Return a cached GenerativeModel, configuring the Gemini SDK once per process.
+    The SDK manages its own transport, so the HTTP_* pool limits and reuse counters do not cover it.
+    """
+    global _gemini_configured
+    model = _gemini_models.get(model_name)
+    if model is not None:
+        return model
+    import google.generativeai as genai
+
+    with _lock:
+        if not _gemini_configured:
+            api_key = os.environ.get("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY not found in environment variables")
+            genai.configure(api_key=api_key)
+            _gemini_configured = True
+            _stats["gemini_configured"] += 1
+        model = _gemini_models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            _gemini_models[model_name] = model
+            _stats["gemini_models_created"] += 1
+    return model
+
+
+def gemini_request_options() -> Dict[str, float]:
+    """Per-request options passed to generate_content."""
+    return {"timeout": GEMINI_TIMEOUT_SECONDS}
+
+
+def warmup_clients(connect: bool = CLIENT_WARMUP_CONNECT) -> Dict[str, str]:
+    """
+    Create the shared clients ahead of the first tool call.
+    With connect=True, also open an OpenAI connection (a models list call) so the first
+    image request skips TLS setup. Failures are reported, never raised.
+    """
+    results = {}
+    try:
+        client = get_openai_client()
+        if connect:
+            client.models.list()
+        results["openai"] = "ready"
+    except Exception as e:
+        results["openai"] = f"error: {e}"
+    try:
+        get_gemini_model(GEMINI_MODEL)
+        results["gemini"] = "ready"
+    except Exception as e:
+        results["gemini"] = f"error: {e}"
+    return results
+
+
+def client_stats() -> Dict[str, int]:
+    """
+    Return client construction and connection-reuse counters for this process.
+    The request and connection counters cover OpenAI calls only.
+    """
+    with _lock:
+        stats = dict(_stats)
+    stats["openai_connections_reused"] = max(
+        0, stats["openai_requests"] - stats["openai_connections_opened"]
+    )
+    return stats
+
+
+def install_clients(
+    openai_client: Any = None,
+    gemini_models: Dict[str, Any] = None,
+    async_openai_client: Any = None,
+) -> None:
+    """
+    Replace the shared clients, e.g. with local stand-in backends for benchmarks.
+    An installed async_openai_client is returned on every event loop.
+    Passing nothing leaves the current clients in place.
+    """
+    global _openai_client, _installed_async_openai_client, _gemini_configured
+    with _lock:
+        if openai_client is not None:
+            _openai_client = openai_client
+        if async_openai_client is not None:
+            _installed_async_openai_client = async_openai_client
+        if gemini_models:
+            _gemini_models.update(gemini_models)
+            _gemini_configured = True
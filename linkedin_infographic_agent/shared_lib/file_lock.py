@@ -0,0 +1,48 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of this process are serialized
+    fcntl = None
+
+_fallback_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on path (created if missing) for a read-modify-write of files shared
+    by several threads or processes. The holder may delete the lock file, e.g. when it removes
+    the directory; waiters then lock the file that replaces it.
+    """
+    if fcntl is None:
+        with _fallback_lock:
+            yield
+        return
+    while True:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            # The directory was removed between makedirs and open
+            continue
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+        except BaseException:
+            os.close(fd)
+            raise
+        if current is not None and os.path.samestat(current, os.fstat(fd)):
+            break
+        os.close(fd)
+    try:
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, List
+
+from ..constants import GEMINI_MAX_OUTPUT_TOKENS_ESTIMATE
+from .article_chunking import estimate_tokens
+from .clients import gemini_request_options
+from .scheduler import get_scheduler
+from .tracing import trace_span
+
+
+def _contents(system_prompt: str, user_prompt: str) -> List[Dict]:
+    return [
+        {"role": "system", "parts": [system_prompt]},
+        {"role": "user", "parts": [user_prompt]},
+    ]
+
+
+def _token_estimate(system_prompt: str, user_prompt: str) -> int:
+    return estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + GEMINI_MAX_OUTPUT_TOKENS_ESTIMATE
+
+
+def _response_text(response: Any, span: Dict[str, Any]) -> str:
+    """Strip the response text and record its size and token usage on the span."""
+    content = response.text.strip()
+    span["response_bytes"] = len(content)
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        span["input_tokens"] = getattr(usage, "prompt_token_count", 0) or 0
+        span["output_tokens"] = getattr(usage, "candidates_token_count", 0) or 0
+    return content
+
+
+def _parse_json(content: str) -> Any:
+    """Parse a JSON response, tolerating a ```json fenced block."""
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1] if "\n" in content else ""
+        content = content.rsplit("```", 1)[0]
+    return json.loads(content)
+
+
+def generate_text(model: Any, system_prompt: str, user_prompt: str) -> str:
+    """Run one Gemini call through the Gemini scheduler and return the stripped response text."""
+    with trace_span("gemini.generate_content", kind="backend") as span:
+        span["request_bytes"] = len(system_prompt) + len(user_prompt)
+        response = get_scheduler("gemini").call(
+            lambda: model.generate_content(
+                _contents(system_prompt, user_prompt), request_options=gemini_request_options()
+            ),
+            tokens=_token_estimate(system_prompt, user_prompt),
+        )
+        return _response_text(response, span)
+
+
+async def generate_text_async(model: Any, system_prompt: str, user_prompt: str) -> str:
+    """generate_text using the SDK's async generate_content_async, without blocking the event loop."""
+    with trace_span("gemini.generate_content", kind="backend") as span:
+        span["request_bytes"] = len(system_prompt) + len(user_prompt)
+        response = await get_scheduler("gemini").call_async(
+            lambda: model.generate_content_async(
+                _contents(system_prompt, user_prompt), request_options=gemini_request_options()
+            ),
+            tokens=_token_estimate(system_prompt, user_prompt),
+        )
+        return _response_text(response, span)
+
+
+def generate_json(model: Any, system_prompt: str, user_prompt: str) -> Any:
+    """Run one Gemini call and parse the JSON response, tolerating a ```json fenced block."""
+    return _parse_json(generate_text(model, system_prompt, user_prompt))
+
+
+async def generate_json_async(model: Any, system_prompt: str, user_prompt: str) -> Any:
+    return _parse_json(await generate_text_async(model, system_prompt, user_prompt))
@@ -0,0 +1,71 @@
+import binascii
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+# Base64 characters decoded per step (a multiple of 4, so every chunk decodes on its own)
+BASE64_CHUNK_CHARS = 4 * 64 * 1024
+
+
+@contextmanager
+def atomic_output(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file next to path for binary writing and move it over path once the
+    block succeeds, so readers never see a partially written file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_base64_file(image_base64: str, path: str) -> int:
+    """
+    Decode a base64 payload chunk by chunk straight into path (atomically) without ever
+    materialising the whole decoded image in memory. Returns the number of bytes written.
+    """
+    written = 0
+    with atomic_output(path) as f:
+        for start in range(0, len(image_base64), BASE64_CHUNK_CHARS):
+            chunk = binascii.a2b_base64(image_base64[start:start + BASE64_CHUNK_CHARS])
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def link_or_copy_file(source: str, destination: str) -> None:
+    """
+    Make destination show the contents of source: a hard link when both are on the same
+    filesystem (no data is copied), otherwise a streamed copy. Either way the swap is atomic.
+    """
+    directory = os.path.dirname(destination) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(destination)}.{os.getpid()}.{threading.get_ident()}.lnk")
+    try:
+        os.link(source, tmp_path)
+        os.replace(tmp_path, destination)
+        # rename() is a no-op when both names already point at the same inode
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    with open(source, "rb") as src, atomic_output(destination) as dst:
+        shutil.copyfileobj(src, dst)
+
+
+def read_file_bytes(path: str) -> bytes:
+    """Read a whole file into a single bytes object (one allocation sized from the file)."""
+    with open(path, "rb") as f:
+        return f.read()
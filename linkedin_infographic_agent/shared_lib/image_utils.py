@@ -1,27 +1,28 @@
 import os
-from typing import List
-from ..constants import GENERATED_SLIDES_DIR, INFOGRAPHIC_ASSETS_DIR, IMAGE_ROOT_DIR
+from typing import List, Optional
+from ..constants import IMAGE_ROOT_DIR
+from .asset_registry import get_prepared_assets
+from .slide_store import DEFAULT_CAROUSEL_ID, delete_slide, list_carousel, list_carousels
 
 def ensure_image_directory_exists() -> None:
     """Ensure the root image directory exists."""
     os.makedirs(IMAGE_ROOT_DIR, exist_ok=True)
 
-def list_images() -> List[str]:
-    """List all images in the generated slides directory."""
-    if not os.path.exists(GENERATED_SLIDES_DIR):
-        return []
-    return [f for f in os.listdir(GENERATED_SLIDES_DIR) if os.path.isfile(os.path.join(GENERATED_SLIDES_DIR, f))]
+def list_images(carousel_id: Optional[str] = None) -> List[str]:
+    """
+    List generated slides from the slide store index: the filenames of one carousel in slide order,
+    or '<carousel_id>/<filename>' for every carousel when carousel_id is omitted.
+    """
+    if carousel_id is not None:
+        return [entry["filename"] for entry in list_carousel(carousel_id)]
+    return [f"{cid}/{entry['filename']}" for cid in list_carousels() for entry in list_carousel(cid)]
 
-def delete_image(filename: str) -> bool:
-    """Delete an image from the generated slides directory by filename."""
-    filepath = os.path.join(GENERATED_SLIDES_DIR, filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
-        return True
-    return False
+def delete_image(filename: str, carousel_id: Optional[str] = None) -> bool:
+    """Delete a generated slide by filename (or '<carousel_id>/<filename>') through the slide store index."""
+    if carousel_id is None:
+        carousel_id, _, filename = filename.rpartition("/")
+    return delete_slide(carousel_id or DEFAULT_CAROUSEL_ID, filename)
 
 def list_assets() -> List[str]:
-    """List all asset files in the assets directory."""
-    if not os.path.exists(INFOGRAPHIC_ASSETS_DIR):
-        return []
-    return [f for f in os.listdir(INFOGRAPHIC_ASSETS_DIR) if os.path.isfile(os.path.join(INFOGRAPHIC_ASSETS_DIR, f))] 
\ No newline at end of file
+    """List the usable (deduplicated, readable) asset files, served from the asset registry."""
+    return [asset.name for asset in get_prepared_assets()]
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional
+
+from ..constants import RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES
+from .image_io import link_or_copy_file
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def render_cache_key(
+    clean_prompt: str,
+    image_size: str,
+    asset_hashes: List[str],
+    reference_path: Optional[str] = None,
+    quality: Optional[str] = None,
+) -> str:
+    """
+    Build a content-addressed key for a slide render.
+    Assets are keyed by their content hashes (order-independent), the reference slide by its bytes.
+    quality is only part of the key when set, so renders at the model's default quality keep their keys.
+    """
+    digest = hashlib.sha256()
+    digest.update(b"prompt\0" + clean_prompt.encode("utf-8") + b"\0")
+    digest.update(b"size\0" + image_size.encode("utf-8") + b"\0")
+    if quality:
+        digest.update(b"quality\0" + quality.encode("utf-8") + b"\0")
+    for asset_hash in sorted(asset_hashes):
+        digest.update(b"asset\0" + asset_hash.encode("ascii") + b"\0")
+    if reference_path:
+        digest.update(b"reference\0" + _hash_file(reference_path).encode("ascii") + b"\0")
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(RENDER_CACHE_DIR, f"{key}.png")
+
+
+def get_cached_render_path(key: str) -> Optional[str]:
+    """Return the path of the cached PNG for key, or None. A hit refreshes the entry's LRU position."""
+    path = _cache_path(key)
+    try:
+        os.utime(path)
+    except OSError:
+        with _stats_lock:
+            _stats["misses"] += 1
+        return None
+    with _stats_lock:
+        _stats["hits"] += 1
+    return path
+
+
+def put_cached_render_file(key: str, path: str) -> None:
+    """
+    Store the PNG at path under key (hard-linked when possible, so the bytes are not duplicated),
+    then evict least recently used entries over the size bound.
+    """
+    link_or_copy_file(path, _cache_path(key))
+    evict_render_cache()
+
+
+def evict_render_cache(max_bytes: int = RENDER_CACHE_MAX_BYTES) -> int:
+    """Delete least recently used cache entries until the cache fits in max_bytes. Returns the number removed."""
+    if not os.path.isdir(RENDER_CACHE_DIR):
+        return 0
+    entries = []
+    total = 0
+    with os.scandir(RENDER_CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".png"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        with _stats_lock:
+            _stats["evictions"] += removed
+    return removed
+
+
+def render_cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
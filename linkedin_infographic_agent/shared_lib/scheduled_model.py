@@ -0,0 +1,30 @@
+from typing import AsyncGenerator
+
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from .scheduler import get_scheduler
+
+
+class ScheduledGemini(Gemini):
+    """
+    Gemini for the agents' own turns, admitted through the "gemini" scheduler. Agent turns and
+    the tools' direct Gemini calls then share one request/token budget, concurrency limit and
+    throttling backoff. (ADK 0.4 runs model callbacks synchronously, so they cannot wait for a slot.)
+    """
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        tokens = len(llm_request.model_dump_json(exclude_none=True)) // 4
+        model = super()
+        async for response in get_scheduler("gemini").stream_async(
+            lambda: model.generate_content_async(llm_request, stream), tokens=tokens
+        ):
+            yield response
+
+
+def scheduled_gemini(model_name: str) -> ScheduledGemini:
+    """The Gemini model for an Agent's model argument, with its calls routed through the scheduler."""
+    return ScheduledGemini(model=model_name)
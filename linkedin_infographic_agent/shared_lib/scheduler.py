@@ -0,0 +1,414 @@
+import asyncio
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..constants import (
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_REQUESTS_PER_MINUTE,
+    GEMINI_TOKENS_PER_MINUTE,
+    OPENAI_IMAGE_MAX_CONCURRENCY,
+    OPENAI_IMAGE_REQUESTS_PER_MINUTE,
+    OPENAI_IMAGE_TOKENS_PER_MINUTE,
+    SCHEDULER_BACKOFF_BASE_SECONDS,
+    SCHEDULER_BACKOFF_MAX_SECONDS,
+    SCHEDULER_MAX_RETRIES,
+)
+from .tracing import trace_span
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# How often a coroutine waiting for a concurrency slot checks again (it must not block the event loop)
+ASYNC_SLOT_POLL_SECONDS = 0.02
+
+# backend -> (requests per minute, tokens per minute, max concurrency)
+BACKEND_LIMITS = {
+    "openai.images": (OPENAI_IMAGE_REQUESTS_PER_MINUTE, OPENAI_IMAGE_TOKENS_PER_MINUTE, OPENAI_IMAGE_MAX_CONCURRENCY),
+    "gemini": (GEMINI_REQUESTS_PER_MINUTE, GEMINI_TOKENS_PER_MINUTE, GEMINI_MAX_CONCURRENCY),
+}
+
+_registry_lock = threading.Lock()
+_schedulers: Dict[str, "BackendScheduler"] = {}
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """HTTP status of an OpenAI (status_code) or Google API (code) error, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def _connection_error_types() -> tuple:
+    """Connection error classes of the HTTP SDKs that are already loaded (an unloaded SDK cannot raise)."""
+    types = [TimeoutError, ConnectionError]
+    openai = sys.modules.get("openai")
+    if openai is not None:
+        types.append(openai.APIConnectionError)
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        types.append(httpx.TransportError)
+    return tuple(types)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, _connection_error_types()):
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay requested by the server through Retry-After / retry-after-ms, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Continuously refilled bucket sized in units per minute (0 disables the limit).
+    Holds at most ten seconds of budget so a burst cannot spend the whole minute at once;
+    a single request larger than that is admitted once the bucket is full.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, per_minute / 6.0)
+        self.level = self.capacity
+        self._clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount if available and return 0, otherwise return the seconds to wait before retrying."""
+        if self.rate <= 0 or amount <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            needed = min(amount, self.capacity)
+            if self.level >= needed:
+                self.level -= amount
+                return 0.0
+            return (needed - self.level) / self.rate
+
+
+class BackendScheduler:
+    """
+    Admission control for one model backend: request and token buckets, a concurrency
+    limit that halves on throttling and creeps back up on success, and retries with
+    jittered exponential backoff (or the server's Retry-After) on 429/5xx.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        max_retries: int = SCHEDULER_MAX_RETRIES,
+        backoff_base: float = SCHEDULER_BACKOFF_BASE_SECONDS,
+        backoff_max: float = SCHEDULER_BACKOFF_MAX_SECONDS,
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._random = random.Random()
+        self._warned_event_loop = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "throttled": 0,
+            "failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _budget_delay(self, tokens: float, state: Dict[str, bool]) -> float:
+        """
+        Seconds to wait before the request and token buckets admit a call (0 once both are reserved).
+        state remembers the reservations already made across retries of this check.
+        """
+        if not state.get("request"):
+            with self._cond:
+                pause = self._paused_until - time.monotonic()
+            delay = max(pause, self.requests.reserve(1))
+            if delay > 0:
+                return delay
+            state["request"] = True
+        return self.tokens.reserve(tokens)
+
+    def _record_wait(self, start: float) -> float:
+        waited = time.monotonic() - start
+        with self._cond:
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        return waited
+
+    def _acquire(self, tokens: float) -> float:
+        """Block until a concurrency slot and bucket budget are available. Returns the seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._waiting -= 1
+            self._in_flight += 1
+        state: Dict[str, bool] = {}
+        while True:
+            delay = self._budget_delay(tokens, state)
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        return self._record_wait(start)
+
+    def _try_take_slot(self) -> bool:
+        with self._cond:
+            if self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    async def _acquire_async(self, tokens: float) -> float:
+        """_acquire for coroutines: waits with asyncio.sleep so other sessions keep running."""
+        start = time.monotonic()
+        if not self._try_take_slot():
+            with self._cond:
+                self._waiting += 1
+            try:
+                while not self._try_take_slot():
+                    await asyncio.sleep(ASYNC_SLOT_POLL_SECONDS)
+            finally:
+                with self._cond:
+                    self._waiting -= 1
+        try:
+            state: Dict[str, bool] = {}
+            while True:
+                delay = self._budget_delay(tokens, state)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled while waiting for budget: give the slot back
+            self._release(False)
+            raise
+        return self._record_wait(start)
+
+    def _release(self, succeeded: bool = True, throttled: bool = False, pause: float = 0.0) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self._stats["throttled"] += 1
+                self._limit = max(1.0, self._limit / 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            elif succeeded:
+                # Additive increase: roughly one extra slot per window of successful calls
+                self._limit = min(float(self.max_concurrency), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number (1-based)."""
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _retry_delay(self, error: Exception, retries: int) -> Optional[float]:
+        """
+        Release the slot of a failed attempt and return the delay before the next one,
+        or None when error is final (not retryable or out of retries).
+        """
+        throttled = status_code_of(error) == 429
+        if retries >= self.max_retries or not is_retryable(error):
+            self._release(False, throttled)
+            with self._cond:
+                self._stats["failures"] += 1
+            return None
+        retry_after = retry_after_seconds(error)
+        delay = min(self.backoff_max, retry_after) if retry_after is not None else self.backoff(retries + 1)
+        self._release(False, throttled, pause=delay)
+        with self._cond:
+            self._stats["retries"] += 1
+        print(f"[scheduler] {self.name} call failed (attempt {retries + 1}), retrying in {delay:.2f}s. Error: {error}")
+        return delay
+
+    def _check_not_on_event_loop(self) -> None:
+        """call() sleeps while it waits; warn once if that would stall a running event loop."""
+        if self._warned_event_loop:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._warned_event_loop = True
+        print(f"[scheduler] {self.name}.call() is blocking an event loop; use call_async or run the caller in a worker thread")
+
+    def call(self, fn: Callable[[], T], tokens: float = 0) -> T:
+        """
+        Run fn under this backend's limits, retrying retryable failures. Re-raises the last error.
+        Waits block the calling thread, so coroutines must use call_async (or asyncio.to_thread).
+        """
+        self._check_not_on_event_loop()
+        retries = 0
+        waited = 0.0
+        with trace_span(f"scheduler.{self.name}", kind="scheduler") as span:
+            with self._cond:
+                self._stats["calls"] += 1
+            try:
+                while True:
+                    waited += self._acquire(tokens)
+                    try:
+                        result = fn()
+                    except Exception as e:
+                        delay = self._retry_delay(e, retries)
+                        if delay is None:
+                            raise
+                        retries += 1
+                        time.sleep(delay)
+                        continue
+                    self._release()
+                    return result
+            finally:
+                span["retries"] = retries
+                span["wait_ms"] = round(waited * 1000, 3)
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]], tokens: float = 0) -> T:
+        """
+        Await fn() under the same limits, buckets and retry policy as call().
+        Sync and async callers share one budget, so mixing them cannot overrun the backend.
+        """
+        retries = 0
+        waited = 0.0
+        with trace_span(f"scheduler.{self.name}", kind="scheduler") as span:
+            with self._cond:
+                self._stats["calls"] += 1
+            try:
+                while True:
+                    waited += await self._acquire_async(tokens)
+                    try:
+                        result = await fn()
+                    except asyncio.CancelledError:
+                        self._release(False)
+                        raise
+                    except Exception as e:
+                        delay = self._retry_delay(e, retries)
+                        if delay is None:
+                            raise
+                        retries += 1
+                        await asyncio.sleep(delay)
+                        continue
+                    self._release()
+                    return result
+            finally:
+                span["retries"] = retries
+                span["wait_ms"] = round(waited * 1000, 3)
+
+    async def stream_async(self, fn: Callable[[], AsyncIterator[T]], tokens: float = 0) -> AsyncIterator[T]:
+        """
+        Iterate fn() (e.g. a model's response stream) under the same limits as call_async.
+        A failed attempt is retried only before its first item, so no item is yielded twice.
+        """
+        retries = 0
+        waited = 0.0
+        with trace_span(f"scheduler.{self.name}", kind="scheduler") as span:
+            with self._cond:
+                self._stats["calls"] += 1
+            try:
+                while True:
+                    waited += await self._acquire_async(tokens)
+                    started = False
+                    try:
+                        async for item in fn():
+                            started = True
+                            yield item
+                    except (asyncio.CancelledError, GeneratorExit):
+                        self._release(False)
+                        raise
+                    except Exception as e:
+                        # Once items were yielded the stream cannot be replayed, so the error is final
+                        delay = self._retry_delay(e, self.max_retries if started else retries)
+                        if delay is None:
+                            raise
+                        retries += 1
+                        await asyncio.sleep(delay)
+                        continue
+                    self._release()
+                    return
+            finally:
+                span["retries"] = retries
+                span["wait_ms"] = round(waited * 1000, 3)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                queue_depth=self._waiting,
+                in_flight=self._in_flight,
+                concurrency_limit=int(self._limit),
+            )
+        stats["wait_seconds_total"] = round(stats["wait_seconds_total"], 3)
+        stats["wait_seconds_max"] = round(stats["wait_seconds_max"], 3)
+        return stats
+
+
+def get_scheduler(backend: str) -> BackendScheduler:
+    """Return the process-wide scheduler for a backend named in BACKEND_LIMITS."""
+    scheduler = _schedulers.get(backend)
+    if scheduler is None:
+        with _registry_lock:
+            scheduler = _schedulers.get(backend)
+            if scheduler is None:
+                requests_per_minute, tokens_per_minute, max_concurrency = BACKEND_LIMITS[backend]
+                scheduler = BackendScheduler(backend, requests_per_minute, tokens_per_minute, max_concurrency)
+                _schedulers[backend] = scheduler
+    return scheduler
+
+
+def configure_scheduler(
+    backend: str,
+    requests_per_minute: float,
+    tokens_per_minute: float,
+    max_concurrency: int,
+    **kwargs: Any,
+) -> BackendScheduler:
+    """Replace a backend's scheduler with new limits (0 disables a bucket), e.g. for benchmarks."""
+    scheduler = BackendScheduler(backend, requests_per_minute, tokens_per_minute, max_concurrency, **kwargs)
+    with _registry_lock:
+        _schedulers[backend] = scheduler
+    return scheduler
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue depth, in-flight calls, current concurrency limit, retries and wait times per backend."""
+    with _registry_lock:
+        schedulers = dict(_schedulers)
+    return {name: scheduler.stats() for name, scheduler in schedulers.items()}
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..constants import (
+    GENERATED_SLIDES_DIR,
+    SLIDE_STORE_EVICTION_INTERVAL,
+    SLIDE_STORE_MAX_AGE_SECONDS,
+    SLIDE_STORE_MAX_BYTES,
+)
+from .file_lock import file_lock
+from .image_io import atomic_output
+
+# Each carousel directory holds its own manifest (and lock file); the top-level carousel list
+# only keeps every carousel's size and last update for eviction
+SLIDE_STORE_INDEX_FILENAME = "index.json"
+SLIDE_STORE_LOCK_FILENAME = ".index.lock"
+SLIDE_STORE_CAROUSELS_FILENAME = "carousels.json"
+DEFAULT_CAROUSEL_ID = "default"
+
+_lock = threading.Lock()
+_janitor: Dict[str, Optional[threading.Thread]] = {"thread": None}
+
+
+def _safe_segment(value: str) -> str:
+    return "".join(c for c in value if c.isalnum() or c in ("-", "_", ".")).strip(".")
+
+
+def safe_carousel_id(carousel_id: Optional[str]) -> str:
+    """Sanitize a carousel ID into a relative path below GENERATED_SLIDES_DIR ('/' nests namespaces)."""
+    segments = [_safe_segment(part) for part in str(carousel_id or "").split("/")]
+    return "/".join(part for part in segments if part) or DEFAULT_CAROUSEL_ID
+
+
+def carousel_id_for(tool_context: Any) -> str:
+    """
+    Carousel ID for a tool call: tool_context.state['carousel_id'] when set,
+    otherwise the ADK session ID, so slide_01.png never collides across sessions.
+    """
+    if tool_context is None:
+        return DEFAULT_CAROUSEL_ID
+    carousel_id = tool_context.state.get("carousel_id")
+    if not carousel_id:
+        invocation_context = getattr(tool_context, "_invocation_context", None)
+        carousel_id = getattr(getattr(invocation_context, "session", None), "id", None)
+    return safe_carousel_id(carousel_id)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.strip().encode("utf-8")).hexdigest()
+
+
+def plan_hash(slide_plan: Any) -> str:
+    """Stable hash of a slide plan (key order does not matter)."""
+    return hashlib.sha256(json.dumps(slide_plan, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _carousel_dir(carousel_id: str) -> str:
+    return os.path.join(GENERATED_SLIDES_DIR, carousel_id)
+
+
+def _manifest_path(carousel_id: str) -> str:
+    return os.path.join(_carousel_dir(carousel_id), SLIDE_STORE_INDEX_FILENAME)
+
+
+def _manifest_lock_path(carousel_id: str) -> str:
+    return os.path.join(_carousel_dir(carousel_id), SLIDE_STORE_LOCK_FILENAME)
+
+
+def _carousel_list_path() -> str:
+    return os.path.join(GENERATED_SLIDES_DIR, SLIDE_STORE_CAROUSELS_FILENAME)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with atomic_output(path) as f:
+        f.write(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+
+def _load_manifest(carousel_id: str) -> Optional[Dict[str, Any]]:
+    """A carousel's manifest. Manifests are replaced atomically, so reading needs no lock."""
+    return _read_json(_manifest_path(carousel_id))
+
+
+def _carousel_list() -> Dict[str, Dict[str, Any]]:
+    """carousel_id -> {"bytes", "updated"} for every carousel, the input to eviction."""
+    return _read_json(_carousel_list_path()) or {}
+
+
+def _update_carousel_list(carousel_id: str, manifest: Optional[Dict[str, Any]]) -> None:
+    """Set (or, for manifest None, remove) a carousel's entry in the top-level carousel list."""
+    with file_lock(_carousel_list_path() + ".lock"):
+        carousels = _carousel_list()
+        if manifest is None:
+            if carousels.pop(carousel_id, None) is None:
+                return
+        else:
+            carousels[carousel_id] = {"bytes": manifest["bytes"], "updated": manifest.get("updated", 0)}
+        _write_json(_carousel_list_path(), carousels)
+
+
+def _save_manifest(carousel_id: str, manifest: Dict[str, Any]) -> None:
+    """Persist a carousel's manifest and its list entry. Call under the carousel's file lock."""
+    manifest["bytes"] = sum(s["size"] for s in manifest["slides"].values())
+    _write_json(_manifest_path(carousel_id), manifest)
+    _update_carousel_list(carousel_id, manifest)
+
+
+def record_slide(
+    carousel_id: str,
+    filename: str,
+    filepath: str,
+    prompt: str,
+    slide_number: Optional[int] = None,
+    artifact_version: Optional[int] = None,
+    slide_plan_hash: Optional[str] = None,
+    tier: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Add or replace a slide in the carousel's manifest and return its entry.
+    slide_number defaults to the number in slide_NN.png, or the next free position.
+    tier records whether the file is a draft or a final render.
+    """
+    now = time.time()
+    with file_lock(_manifest_lock_path(carousel_id)):
+        manifest = _load_manifest(carousel_id) or {"created": now, "bytes": 0, "slides": {}}
+        slides = manifest["slides"]
+        previous = slides.get(filename)
+        if slide_number is None:
+            match = re.search(r"(\d+)", filename)
+            if previous:
+                slide_number = previous["slide_number"]
+            elif match:
+                slide_number = int(match.group(1))
+            else:
+                slide_number = max((s["slide_number"] for s in slides.values()), default=0) + 1
+        entry = {
+            "slide_number": slide_number,
+            "filepath": filepath,
+            "prompt_hash": prompt_hash(prompt),
+            "plan_hash": slide_plan_hash,
+            "size": os.path.getsize(filepath),
+            "created": now,
+            "artifact_version": artifact_version,
+            "tier": tier,
+        }
+        slides[filename] = entry
+        manifest["updated"] = now
+        _save_manifest(carousel_id, manifest)
+    _ensure_janitor()
+    return entry
+
+
+def update_slide(carousel_id: str, filename: str, **fields: Any) -> None:
+    """Set manifest fields (e.g. artifact_version, plan_hash) of an indexed slide."""
+    with file_lock(_manifest_lock_path(carousel_id)):
+        manifest = _load_manifest(carousel_id)
+        entry = manifest["slides"].get(filename) if manifest else None
+        if entry is not None and any(entry.get(key) != value for key, value in fields.items()):
+            entry.update(fields)
+            _write_json(_manifest_path(carousel_id), manifest)
+
+
+def get_slide(carousel_id: str, filename: str) -> Optional[Dict[str, Any]]:
+    """Look up one slide's manifest entry without touching the slide file."""
+    manifest = _load_manifest(carousel_id)
+    entry = manifest["slides"].get(filename) if manifest else None
+    return dict(entry, filename=filename) if entry else None
+
+
+def list_carousel(carousel_id: str) -> List[Dict[str, Any]]:
+    """Manifest entries of a carousel in slide order."""
+    slides = (_load_manifest(carousel_id) or {}).get("slides", {})
+    entries = [dict(entry, filename=name) for name, entry in slides.items()]
+    return sorted(entries, key=lambda entry: (entry["slide_number"], entry["filename"]))
+
+
+def list_carousels() -> List[str]:
+    return sorted(_carousel_list())
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_slide(carousel_id: str, filename: str) -> bool:
+    """Delete a slide file and its manifest entry. Returns False if it was not indexed."""
+    with file_lock(_manifest_lock_path(carousel_id)):
+        manifest = _load_manifest(carousel_id)
+        entry = manifest["slides"].pop(filename, None) if manifest else None
+        if entry is None:
+            return False
+        _remove_file(entry["filepath"])
+        if manifest["slides"]:
+            _save_manifest(carousel_id, manifest)
+        else:
+            _drop_carousel(carousel_id, manifest)
+    return True
+
+
+def _drop_carousel(carousel_id: str, manifest: Optional[Dict[str, Any]]) -> int:
+    """Remove a carousel's files, manifest and list entry. Call under the carousel's file lock."""
+    slides = manifest["slides"] if manifest else {}
+    for entry in slides.values():
+        _remove_file(entry["filepath"])
+    _update_carousel_list(carousel_id, None)
+    _remove_file(_manifest_path(carousel_id))
+    # Waiters on the lock file notice it was replaced and lock the new one
+    _remove_file(_manifest_lock_path(carousel_id))
+    try:
+        os.rmdir(_carousel_dir(carousel_id))
+    except OSError:
+        pass
+    return len(slides)
+
+
+def delete_carousel(carousel_id: str) -> int:
+    """Delete every slide of a carousel. Returns the number of slides removed."""
+    with file_lock(_manifest_lock_path(carousel_id)):
+        return _drop_carousel(carousel_id, _load_manifest(carousel_id))
+
+
+def evict_slide_store(
+    max_bytes: int = SLIDE_STORE_MAX_BYTES,
+    max_age_seconds: float = SLIDE_STORE_MAX_AGE_SECONDS,
+) -> int:
+    """
+    Delete whole carousels not updated within max_age_seconds, then the least recently
+    updated carousels until the store fits in max_bytes. Returns the number of carousels removed.
+    Carousels updated by another worker since the carousel list was read are kept.
+    """
+    now = time.time()
+    carousels = _carousel_list()
+    ordered = sorted(carousels, key=lambda cid: carousels[cid].get("updated", 0))
+    total = sum(carousels[cid]["bytes"] for cid in ordered)
+    removed = 0
+    for carousel_id in ordered:
+        listed = carousels[carousel_id]
+        expired = now - listed.get("updated", 0) > max_age_seconds
+        if not expired and total <= max_bytes:
+            break
+        with file_lock(_manifest_lock_path(carousel_id)):
+            manifest = _load_manifest(carousel_id)
+            if manifest is not None and manifest.get("updated", 0) != listed.get("updated", 0):
+                continue
+            _drop_carousel(carousel_id, manifest)
+        total -= listed["bytes"]
+        removed += 1
+    return removed
+
+
+def _janitor_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            removed = evict_slide_store()
+            if removed:
+                print(f"[slide_store] Evicted {removed} carousels")
+        except Exception as e:
+            print(f"[slide_store] Eviction failed. Error: {e}")
+
+
+def _ensure_janitor(interval: float = SLIDE_STORE_EVICTION_INTERVAL) -> None:
+    """Start the background eviction thread once per process (disabled when interval <= 0)."""
+    if interval <= 0 or _janitor["thread"] is not None:
+        return
+    with _lock:
+        if _janitor["thread"] is None:
+            thread = threading.Thread(target=_janitor_loop, args=(interval,), name="slide-store-janitor", daemon=True)
+            thread.start()
+            _janitor["thread"] = thread
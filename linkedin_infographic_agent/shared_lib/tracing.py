@@ -0,0 +1,209 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from ..constants import METRICS_FILE, TRACE_DIR, TRACE_MAX_SESSIONS, TRACING_ENABLED
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_SESSION = "default"
+SPAN_FIELDS = ("request_bytes", "response_bytes", "input_tokens", "output_tokens", "retries")
+
+_enabled = TRACING_ENABLED
+_current_session: ContextVar[str] = ContextVar("trace_session", default=DEFAULT_SESSION)
+_lock = threading.Lock()
+_sessions: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_open_spans: Dict[Hashable, Dict[str, Any]] = {}
+_counters: Dict[tuple, float] = {}
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def enable_tracing(enabled: bool = True) -> None:
+    """Switch span recording on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def set_current_session(session_id: Optional[str]) -> None:
+    """Attribute spans recorded in this context (e.g. inside a tool) to session_id."""
+    _current_session.set(session_id or DEFAULT_SESSION)
+
+
+def submit_in_context(executor: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    executor.submit that runs fn in a copy of the caller's context. Thread pools do not copy
+    context variables, so without this the worker's spans would be attributed to the default session.
+    """
+    return executor.submit(copy_context().run, fn, *args)
+
+
+def start_span(key: Hashable, name: str, kind: str, session_id: Optional[str] = None, **attrs: Any) -> None:
+    """Open a span identified by key; it is recorded when end_span is called with the same key."""
+    if not _enabled:
+        return
+    span = {
+        "name": name,
+        "kind": kind,
+        "session_id": session_id or _current_session.get(),
+        "start": time.time(),
+        "_start": time.perf_counter(),
+    }
+    span.update(attrs)
+    with _lock:
+        _open_spans[key] = span
+
+
+def end_span(key: Hashable, **attrs: Any) -> Optional[Dict[str, Any]]:
+    """Close the span identified by key and record it. Unknown keys are ignored."""
+    if not _enabled:
+        return None
+    with _lock:
+        span = _open_spans.pop(key, None)
+    if span is None:
+        return None
+    span["duration_ms"] = round((time.perf_counter() - span.pop("_start")) * 1000, 3)
+    span.update(attrs)
+    _record(span)
+    return span
+
+
+@contextmanager
+def trace_span(name: str, kind: str = "stage", **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Record a span around a block of code. The yielded dict can be filled with
+    request_bytes, response_bytes, input_tokens, output_tokens, retries, cache_hit or status.
+    """
+    span: Dict[str, Any] = dict(attrs)
+    if not _enabled:
+        yield span
+        return
+    start = time.perf_counter()
+    span.update(name=name, kind=kind, session_id=_current_session.get(), start=time.time())
+    try:
+        yield span
+    except Exception:
+        span.setdefault("status", "error")
+        raise
+    finally:
+        span["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _record(span)
+
+
+def _record(span: Dict[str, Any]) -> None:
+    session_id = span.get("session_id") or DEFAULT_SESSION
+    labels = (span["kind"], span["name"])
+    with _lock:
+        spans = _sessions.get(session_id)
+        if spans is None:
+            spans = _sessions[session_id] = []
+            while len(_sessions) > TRACE_MAX_SESSIONS:
+                _sessions.popitem(last=False)
+        spans.append(span)
+        _add("spans_total", labels + (str(span.get("status", "ok")),), 1)
+        _add("span_duration_seconds_sum", labels, span["duration_ms"] / 1000)
+        _add("span_duration_seconds_count", labels, 1)
+        for field in SPAN_FIELDS:
+            if span.get(field):
+                _add(f"{field}_total", labels, span[field])
+        if span.get("cache_hit"):
+            _add("cache_hits_total", labels, 1)
+
+
+def _add(metric: str, labels: tuple, value: float) -> None:
+    key = (metric,) + labels
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def get_session_trace(session_id: str) -> List[Dict[str, Any]]:
+    with _lock:
+        return list(_sessions.get(session_id, []))
+
+
+def export_session_trace(session_id: str, path: Optional[str] = None) -> str:
+    """Write the spans of one session as JSON (default: TRACE_DIR/<session_id>.json) and return the path."""
+    spans = get_session_trace(session_id)
+    path = path or os.path.join(TRACE_DIR, f"{session_id}.json")
+    _atomic_write(path, json.dumps({"session_id": session_id, "spans": spans}, indent=2, default=str))
+    return path
+
+
+def _metric_family(metric: str) -> Tuple[str, str]:
+    """(family name, Prometheus type): _sum and _count series belong to one summary family."""
+    for suffix in ("_sum", "_count"):
+        if metric.endswith(suffix):
+            return metric[: -len(suffix)], "summary"
+    return metric, "counter"
+
+
+def prometheus_metrics() -> str:
+    """
+    Aggregate counters in Prometheus text exposition format. Span durations are exposed as a
+    summary (carousel_span_duration_seconds_sum and _count under one TYPE line), the rest as counters.
+    """
+    with _lock:
+        counters = sorted(_counters.items(), key=lambda item: (_metric_family(item[0][0]), item[0]))
+    lines = []
+    seen = set()
+    for key, value in counters:
+        metric, kind, name = key[0], key[1], key[2]
+        family, metric_type = _metric_family(metric)
+        if family not in seen:
+            seen.add(family)
+            lines.append(f"# TYPE carousel_{family} {metric_type}")
+        labels = f'kind="{kind}",name="{name}"'
+        if metric == "spans_total":
+            labels += f',status="{key[3]}"'
+        lines.append(f"carousel_{metric}{{{labels}}} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_metrics(path: str = METRICS_FILE) -> str:
+    """Write prometheus_metrics() to a local file (for a node-exporter textfile collector, for example)."""
+    _atomic_write(path, prometheus_metrics())
+    return path
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Serve prometheus_metrics() over HTTP from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = prometheus_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
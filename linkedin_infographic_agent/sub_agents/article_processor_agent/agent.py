@@ -1,18 +1,26 @@
 from google.adk.agents import Agent
-from .tools.process_text import process_text
+from .tools.fetch_article import fetch_article
+from .tools.process_text import process_text_async
+from ...shared_lib.callbacks import AGENT_TRACING_CALLBACKS
 
 article_processor_agent = Agent(
     name="article_processor_agent",
-    description="An agent that extracts structured information (summary, key points, structure, citation) from article text and outputs a consistent JSON object.",
-    tools=[process_text],
+    description="An agent that extracts structured information (summary, key points, structure, citation) from article text or an article URL and outputs a consistent JSON object.",
+    **AGENT_TRACING_CALLBACKS,
+    tools=[fetch_article, process_text_async],
     instruction="""
     You are the Article Processor Agent. Your job is to:
-    1. Receive article text from the user or another agent.
-    2. Use the process_text tool to extract:
+    1. Receive article text or an article URL from the user or another agent.
+       If you receive a URL, call the fetch_article tool with it instead of asking for the text. It downloads the page,
+       extracts the readable text and returns the processed article (it also saves it to tool_context.state['processed_article']).
+       Never invent article content for a URL that could not be fetched; report the error and ask for the text instead.
+    2. For article text, use the process_text_async tool to extract:
         - A concise summary
         - Key points
         - The article's structure (sections, headings, etc.)
         - Citation (source, author, date, or URL if available)
+       Pass compress=true if the user asks for a very long article to be cut down locally before extraction (false to turn that off);
+       otherwise omit compress and the session default applies.
     3. Ensure your output is always a JSON object with these fields: summary, key_points, structure, citation.
     4. Save the result to tool_context.state['processed_article'].
     5. If any field is missing, use null or an empty value, but always include the citation field.
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Dict, Optional
+
+from google.adk.tools.tool_context import ToolContext
+
+from ....shared_lib.article_fetch import fetch_url
+from .process_text import is_placeholder_article, process_text_async
+
+
+async def fetch_article(url: str, tool_context: Optional[ToolContext] = None) -> Dict:
+    """
+    Fetch an article from a URL, extract its readable text and process it like process_text.
+    The page is streamed through an incremental text extractor over a pooled HTTP connection;
+    unchanged pages are revalidated with a conditional GET (304), and the extracted text goes
+    through the processed-article cache, so re-fetching an unchanged article costs no model call.
+    Saves article_url, article_text and processed_article to tool_context.state.
+    """
+    try:
+        fetched = await asyncio.to_thread(fetch_url, url.strip())
+    except Exception as e:
+        return {"status": "error", "message": f"Could not fetch {url}: {str(e)}"}
+    if not fetched["text"]:
+        return {"status": "error", "message": f"No readable article text found at {url}"}
+    processed = await process_text_async(fetched["text"], tool_context)
+    if tool_context:
+        tool_context.state["article_url"] = fetched["final_url"]
+        tool_context.state["article_text"] = fetched["text"]
+        tool_context.state["processed_article"] = processed
+    message = f"Fetched '{fetched['title'] or fetched['final_url']}' ({len(fetched['text'])} characters"
+    message += ", unchanged since the last fetch)" if fetched["not_modified"] else ")"
+    near_duplicate = tool_context.state.get("near_duplicate") if tool_context else None
+    if near_duplicate:
+        message += f"; reused the processed article of a near-duplicate (similarity {near_duplicate['similarity']})"
+    if fetched["truncated"]:
+        message += "; the page was larger than the download limit and was truncated"
+    return {
+        "status": "warning" if is_placeholder_article(processed) else "success",
+        "message": message
+        + ("; extraction failed, the processed article is a placeholder" if is_placeholder_article(processed) else ""),
+        "url": fetched["final_url"],
+        "title": fetched["title"],
+        "not_modified": fetched["not_modified"],
+        "truncated": fetched["truncated"],
+        "processed_article": processed,
+    }
@@ -1,48 +1,402 @@
-from typing import Dict, Optional
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
 from google.adk.tools.tool_context import ToolContext
-import os
-import google.generativeai as genai
+import json
 
-def process_text(article_text: str, tool_context: Optional[ToolContext] = None) -> Dict:
+from ....constants import (
+    ARTICLE_CHUNK_CONCURRENCY,
+    ARTICLE_CHUNK_TOKENS,
+    ARTICLE_COMPRESSION_ENABLED,
+    ARTICLE_COMPRESSION_TOKEN_BUDGET,
+    GEMINI_MODEL,
+    NEAR_DUPLICATE_REUSE,
+)
+from ....shared_lib.article_chunking import estimate_tokens, iter_article_chunks
+from ....shared_lib.clients import get_gemini_model
+from ....shared_lib.gemini_utils import generate_json, generate_json_async
+from ....shared_lib.tracing import submit_in_context, trace_span
+from ....shared_lib.article_utils import (
+    PROCESSED_ARTICLE_FIELDS,
+    article_cache_key,
+    cache_processed_article,
+    header_citation,
+    is_processed_article,
+    link_cached_article,
+    load_cached_article,
+    load_carousel_record,
+    save_carousel_record,
+)
+
+PLACEHOLDER_SUMMARY = "<summary of the article>"
+SYSTEM_PROMPT = (
+    "You are an expert assistant. Given an article, extract the following as JSON: "
+    "summary (string), key_points (list of strings), structure (list of sections with heading and content), "
+    "and citation (object with source, author, date, url). Always include all fields, use null or empty if missing."
+)
+CHUNK_SYSTEM_PROMPT = (
+    "You are an expert assistant. You are given one part of a longer article. Extract the following as JSON: "
+    "summary (string, 1-2 sentences for this part only), key_points (list of strings), "
+    "structure (list of sections in this part with heading and content), and citation "
+    "(object with source, author, date, url if this part mentions them). Use null or empty if missing."
+)
+REDUCE_SYSTEM_PROMPT = (
+    "You are an expert assistant. You are given JSON extractions from consecutive parts of one article. "
+    "Merge them into a single JSON object with: summary (string covering the whole article), "
+    "key_points (list of the most important, non-duplicated strings), structure (list of sections with heading and content, "
+    "in article order) and citation (object with source, author, date, url). Always include all fields, use null or empty if missing."
+)
+
+
+def _article_prompt(article_text: str) -> str:
+    return f"""\nArticle:\n{article_text}\n\nReturn only a JSON object with the fields: summary, key_points, structure, citation."""
+
+
+def _chunk_prompt(index: int, chunk: str) -> str:
+    return f"""\nArticle part {index}:\n{chunk}\n\nReturn only a JSON object with the fields: summary, key_points, structure, citation."""
+
+
+def _reduce_prompt(extractions: List[Dict]) -> str:
+    return f"""\nPart extractions (in article order):\n{json.dumps(extractions, ensure_ascii=False)}\n\nReturn only a JSON object with the fields: summary, key_points, structure, citation."""
+
+
+def _extract_chunk(model: Any, index: int, chunk: str) -> Dict:
+    """Map step: extract key points and structure from one chunk. Failures yield an empty extraction."""
+    try:
+        return generate_json(model, CHUNK_SYSTEM_PROMPT, _chunk_prompt(index, chunk))
+    except Exception as e:
+        print(f"[process_text] Chunk {index} extraction failed. Error: {e}")
+        return {}
+
+
+async def _extract_chunk_async(model: Any, index: int, chunk: str) -> Dict:
+    try:
+        return await generate_json_async(model, CHUNK_SYSTEM_PROMPT, _chunk_prompt(index, chunk))
+    except Exception as e:
+        print(f"[process_text] Chunk {index} extraction failed. Error: {e}")
+        return {}
+
+
+def _merge_locally(extractions: List[Dict]) -> Dict:
+    """Fallback reduce: concatenate chunk extractions without another model call."""
+    key_points = []
+    structure = []
+    summaries = []
+    citation = None
+    for extraction in extractions:
+        for point in extraction.get("key_points") or []:
+            if point not in key_points:
+                key_points.append(point)
+        structure.extend(extraction.get("structure") or [])
+        if extraction.get("summary"):
+            summaries.append(extraction["summary"])
+        if not citation and extraction.get("citation"):
+            citation = extraction["citation"]
+    return {
+        "summary": " ".join(summaries),
+        "key_points": key_points,
+        "structure": structure,
+        "citation": citation or {"source": None, "author": None, "date": None, "url": None},
+    }
+
+
+def process_text_chunked(
+    model: Any,
+    article_text: str,
+    chunk_tokens: int = ARTICLE_CHUNK_TOKENS,
+    max_concurrency: int = ARTICLE_CHUNK_CONCURRENCY,
+) -> Dict:
+    """
+    Map-reduce extraction for long articles.
+    Chunks are produced lazily along section boundaries and extracted concurrently
+    (at most max_concurrency in flight), then merged with a single reduce call.
+    """
+    limit = max(1, max_concurrency)
+    extractions: Dict[int, Dict] = {}
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        pending = {}
+        for index, chunk in enumerate(iter_article_chunks(article_text, chunk_tokens), start=1):
+            if len(pending) >= limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    extractions[pending.pop(future)] = future.result()
+            pending[submit_in_context(executor, _extract_chunk, model, index, chunk)] = index
+        for future, index in pending.items():
+            extractions[index] = future.result()
+    ordered = [extractions[index] for index in sorted(extractions) if extractions[index]]
+    if not ordered:
+        raise ValueError("All chunk extractions failed")
+    try:
+        return generate_json(model, REDUCE_SYSTEM_PROMPT, _reduce_prompt(ordered))
+    except Exception as e:
+        print(f"[process_text] Reduce step failed, merging chunk results locally. Error: {e}")
+        return _merge_locally(ordered)
+
+
+async def process_text_chunked_async(
+    model: Any,
+    article_text: str,
+    chunk_tokens: int = ARTICLE_CHUNK_TOKENS,
+    max_concurrency: int = ARTICLE_CHUNK_CONCURRENCY,
+) -> Dict:
+    """process_text_chunked on the event loop: chunk extractions are tasks bounded by a semaphore."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def extract(index: int, chunk: str) -> Dict:
+        try:
+            return await _extract_chunk_async(model, index, chunk)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    for index, chunk in enumerate(iter_article_chunks(article_text, chunk_tokens), start=1):
+        # Acquire before creating the task so chunks are only produced as slots free up
+        await semaphore.acquire()
+        tasks.append(asyncio.ensure_future(extract(index, chunk)))
+    ordered = [extraction for extraction in await asyncio.gather(*tasks) if extraction]
+    if not ordered:
+        raise ValueError("All chunk extractions failed")
+    try:
+        return await generate_json_async(model, REDUCE_SYSTEM_PROMPT, _reduce_prompt(ordered))
+    except Exception as e:
+        print(f"[process_text] Reduce step failed, merging chunk results locally. Error: {e}")
+        return _merge_locally(ordered)
+
+
+def placeholder_article() -> Dict:
+    """Placeholder returned when extraction fails. It is never cached."""
+    return {
+        "summary": PLACEHOLDER_SUMMARY,
+        "key_points": ["<key point 1>", "<key point 2>", "<key point 3>"],
+        "structure": [
+            {"heading": "Introduction", "content": "..."},
+            {"heading": "Main Section", "content": "..."},
+            {"heading": "Conclusion", "content": "..."}
+        ],
+        "citation": {
+            "source": "<source or publication>",
+            "author": "<author>",
+            "date": "<date>",
+            "url": "<url>"
+        }
+    }
+
+
+def is_placeholder_article(article_data: Dict) -> bool:
+    return isinstance(article_data, dict) and article_data.get("summary") == PLACEHOLDER_SUMMARY
+
+
+def _lookup_cached_article(cache_key: str) -> Optional[Dict]:
+    with trace_span("article_cache.lookup", kind="cache") as span:
+        cached = load_cached_article(cache_key)
+        span["cache_hit"] = cached is not None
+    return cached
+
+
+def extraction_cache_key(article_text: str, compress: bool = False) -> str:
+    """Article cache key for these extraction settings; extractions of compressed input are cached separately."""
+    model_key = f"{GEMINI_MODEL}+extractive-{ARTICLE_COMPRESSION_TOKEN_BUDGET}" if compress else GEMINI_MODEL
+    return article_cache_key(article_text, model_key)
+
+
+def _compression_enabled(tool_context: Optional[ToolContext], compress: Optional[bool] = None) -> bool:
+    if compress is not None:
+        return compress
+    if tool_context is not None:
+        return bool(tool_context.state.get("compress_article", ARTICLE_COMPRESSION_ENABLED))
+    return ARTICLE_COMPRESSION_ENABLED
+
+
+def _compress_for_extraction(article_text: str, tool_context: Optional[ToolContext]) -> str:
+    """
+    Extractive pre-compression of the model input to ARTICLE_COMPRESSION_TOKEN_BUDGET.
+    The report (token estimates, tokens_saved, compression_ratio) is saved to
+    tool_context.state['article_compression'] and to the trace. Loads numpy on first use.
+    """
+    from ....shared_lib.article_compression import compress_article
+
+    report = compress_article(article_text)
+    if tool_context is not None:
+        tool_context.state["article_compression"] = {key: value for key, value in report.items() if key != "text"}
+    return report["text"]
+
+
+def _article_signature(article_text: str) -> Any:
+    """MinHash signature for near-duplicate lookup, or None when reuse is disabled. Loads numpy on first use."""
+    if not NEAR_DUPLICATE_REUSE:
+        return None
+    from ....shared_lib.article_similarity import minhash_signature
+
+    return minhash_signature(article_text)
+
+
+def _adapt_citation(article_data: Dict, article_text: str) -> Optional[Dict]:
+    """
+    The near-duplicate's processed article with the citation fields this article states in its own
+    header (source, author, date, url), or None when there are none or they already match.
+    """
+    stated = header_citation(article_text)
+    citation = article_data.get("citation")
+    citation = dict(citation) if isinstance(citation, dict) else {}
+    if all(citation.get(field) == value for field, value in stated.items()):
+        return None
+    citation.update(stated)
+    return dict(article_data, citation=citation)
+
+
+def _reuse_near_duplicate(cache_key: str, signature: Any, article_text: str) -> Optional[Tuple[Dict, Dict]]:
+    """
+    Reuse the processed article of a previously seen near-duplicate (syndicated or lightly edited copy).
+    The new key is linked to the same article file, so its carousel record is shared too. When the
+    article's header names a different source, author, date or url, the copy gets its own citation and
+    starts from a copy of the near-duplicate's carousel record instead.
+    Returns (processed article, {"article_key", "similarity", "citation_adapted"}) or None.
+    """
+    if signature is None:
+        return None
+    from ....shared_lib.article_similarity import find_near_duplicate, index_article
+
+    try:
+        match = find_near_duplicate(signature)
+        if match is None:
+            return None
+        article_key, similarity = match
+        article_data = load_cached_article(article_key)
+        if article_data is None:
+            return None
+        adapted = _adapt_citation(article_data, article_text)
+        if adapted is None:
+            if not link_cached_article(cache_key, article_key):
+                return None
+        else:
+            article_data = adapted
+            cache_processed_article(cache_key, article_data)
+            record = load_carousel_record(article_key)
+            if record is not None:
+                # Only the slides that show the citation will then get new prompts
+                save_carousel_record(
+                    cache_key, record["slide_plans"], record["prompts"], record.get("style_preamble"), article_key
+                )
+        index_article(cache_key, signature)
+    except OSError as e:
+        print(f"[process_text] Near-duplicate lookup failed. Error: {e}")
+        return None
+    return article_data, {
+        "article_key": article_key,
+        "similarity": round(similarity, 3),
+        "citation_adapted": adapted is not None,
+    }
+
+
+def _describe(result: Any) -> str:
+    if not isinstance(result, dict):
+        return f"a {type(result).__name__}, not an object"
+    return "missing " + ", ".join(field for field in PROCESSED_ARTICLE_FIELDS if field not in result)
+
+
+def _cache_result(cache_key: str, signature: Any, result: Dict) -> None:
+    try:
+        cache_processed_article(cache_key, result)
+        if signature is not None:
+            from ....shared_lib.article_similarity import index_article
+
+            index_article(cache_key, signature)
+    except (OSError, ValueError) as e:
+        print(f"[process_text] Could not cache processed article. Error: {e}")
+
+
+def _remember_article(
+    tool_context: Optional[ToolContext], cache_key: str, near_duplicate: Optional[Dict] = None
+) -> None:
+    """Record which cached article the session is working on, for carousel reuse downstream."""
+    if tool_context is not None:
+        tool_context.state["article_cache_key"] = cache_key
+        tool_context.state["near_duplicate"] = near_duplicate
+
+
+def process_text(
+    article_text: str, tool_context: Optional[ToolContext] = None, compress: Optional[bool] = None
+) -> Dict:
     """
     Process article text to extract summary, key points, structure, and citation.
     Returns a JSON object with these fields. Falls back to a placeholder if LLM call fails.
+    Results are cached in ARTICLE_CONTENT_DIR keyed on the normalized text and model name.
+    Articles longer than ARTICLE_CHUNK_TOKENS are processed in chunks (map-reduce).
+    A near-duplicate of a previously processed article (MinHash similarity at or above
+    NEAR_DUPLICATE_THRESHOLD) reuses that article's result, with the citation from this article's own
+    header when it states one; tool_context.state['near_duplicate'] says so.
+    With compress (default: tool_context.state['compress_article'], else ARTICLE_COMPRESSION_ENABLED)
+    the article is first cut down locally to ARTICLE_COMPRESSION_TOKEN_BUDGET tokens by extractive
+    sentence ranking, keeping headings, numbers and citation lines.
     """
+    compress = _compression_enabled(tool_context, compress)
+    cache_key = extraction_cache_key(article_text, compress)
+    cached = _lookup_cached_article(cache_key)
+    if cached is not None:
+        _remember_article(tool_context, cache_key)
+        return cached
+    signature = _article_signature(article_text)
+    reused = _reuse_near_duplicate(cache_key, signature, article_text)
+    if reused is not None:
+        _remember_article(tool_context, cache_key, reused[1])
+        return reused[0]
+    model_input = _compress_for_extraction(article_text, tool_context) if compress else article_text
     # Try to use Gemini flash-2.0 for real extraction
     try:
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables")
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        system_prompt = (
-            "You are an expert assistant. Given an article, extract the following as JSON: "
-            "summary (string), key_points (list of strings), structure (list of sections with heading and content), "
-            "and citation (object with source, author, date, url). Always include all fields, use null or empty if missing."
-        )
-        user_prompt = f"""\nArticle:\n{article_text}\n\nReturn only a JSON object with the fields: summary, key_points, structure, citation."""
-        response = model.generate_content([
-            {"role": "system", "parts": [system_prompt]},
-            {"role": "user", "parts": [user_prompt]},
-        ])
-        import json
-        content = response.text.strip()
-        return json.loads(content)
+        model = get_gemini_model(GEMINI_MODEL)
+        if estimate_tokens(model_input) > ARTICLE_CHUNK_TOKENS:
+            result = process_text_chunked(model, model_input)
+        else:
+            result = generate_json(model, SYSTEM_PROMPT, _article_prompt(model_input))
     except Exception as e:
         # Fallback to placeholder if LLM call fails
         print(f"[process_text] Gemini call failed, using placeholder. Error: {e}")
-        return {
-            "summary": "<summary of the article>",
-            "key_points": ["<key point 1>", "<key point 2>", "<key point 3>"],
-            "structure": [
-                {"heading": "Introduction", "content": "..."},
-                {"heading": "Main Section", "content": "..."},
-                {"heading": "Conclusion", "content": "..."}
-            ],
-            "citation": {
-                "source": "<source or publication>",
-                "author": "<author>",
-                "date": "<date>",
-                "url": "<url>"
-            }
-        }
+        return placeholder_article()
+    if not is_processed_article(result):
+        print(f"[process_text] Gemini returned an incomplete article ({_describe(result)}), using placeholder.")
+        return placeholder_article()
+    # Only complete model output is cached; the placeholders above are never persisted
+    _cache_result(cache_key, signature, result)
+    _remember_article(tool_context, cache_key)
+    return result
+
+
+async def process_text_async(
+    article_text: str, tool_context: Optional[ToolContext] = None, compress: Optional[bool] = None
+) -> Dict:
+    """
+    Process article text to extract summary, key points, structure, and citation.
+    Same contract as process_text, but Gemini is called with the async SDK and the article
+    cache is read and written off the event loop, so other sessions keep running meanwhile.
+    With compress (default: tool_context.state['compress_article'], else ARTICLE_COMPRESSION_ENABLED)
+    the article is first cut down locally to ARTICLE_COMPRESSION_TOKEN_BUDGET tokens.
+    """
+    compress = _compression_enabled(tool_context, compress)
+    cache_key = extraction_cache_key(article_text, compress)
+    cached = await asyncio.to_thread(_lookup_cached_article, cache_key)
+    if cached is not None:
+        _remember_article(tool_context, cache_key)
+        return cached
+    signature = await asyncio.to_thread(_article_signature, article_text)
+    reused = await asyncio.to_thread(_reuse_near_duplicate, cache_key, signature, article_text)
+    if reused is not None:
+        _remember_article(tool_context, cache_key, reused[1])
+        return reused[0]
+    model_input = article_text
+    if compress:
+        model_input = await asyncio.to_thread(_compress_for_extraction, article_text, tool_context)
+    try:
+        model = get_gemini_model(GEMINI_MODEL)
+        if estimate_tokens(model_input) > ARTICLE_CHUNK_TOKENS:
+            result = await process_text_chunked_async(model, model_input)
+        else:
+            result = await generate_json_async(model, SYSTEM_PROMPT, _article_prompt(model_input))
+    except Exception as e:
+        print(f"[process_text] Gemini call failed, using placeholder. Error: {e}")
+        return placeholder_article()
+    if not is_processed_article(result):
+        print(f"[process_text] Gemini returned an incomplete article ({_describe(result)}), using placeholder.")
+        return placeholder_article()
+    await asyncio.to_thread(_cache_result, cache_key, signature, result)
+    _remember_article(tool_context, cache_key)
+    return result
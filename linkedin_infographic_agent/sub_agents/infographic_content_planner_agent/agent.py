@@ -1,8 +1,10 @@
 from google.adk.agents import Agent
+from ...shared_lib.callbacks import AGENT_TRACING_CALLBACKS
 
 infographic_content_planner_agent = Agent(
     name="infographic_content_planner_agent",
     description="An agent that plans a sequence of 3-7 LinkedIn infographic slides from processed article data, defining purpose, text, and visual ideas for each slide.",
+    **AGENT_TRACING_CALLBACKS,
     instruction="""
     You are the Infographic Content Planner Agent. Your job is to:
     1. Take the processed article data from tool_context.state['processed_article'] (which includes summary, key_points, structure, citation).
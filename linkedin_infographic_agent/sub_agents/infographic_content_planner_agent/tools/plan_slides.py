@@ -0,0 +1,139 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from google.adk.tools.tool_context import ToolContext
+
+from ....constants import DEFAULT_PLANNER_MODE, GEMINI_MODEL, PLANNER_MODES
+from ....shared_lib.clients import get_gemini_model
+from ....shared_lib.gemini_utils import generate_json
+
+PLANNER_SYSTEM_PROMPT = (
+    "You are an expert LinkedIn content strategist. Given processed article data (summary, key_points, "
+    "structure, citation), plan a sequence of 3-7 slides for a LinkedIn infographic carousel. "
+    "For each slide define purpose (the main message or goal), text (the text or bullet points to display) "
+    "and visual_ideas (layout, icons, images or color themes). The last slide should credit the citation."
+)
+SLIDE_PLAN_FIELDS = ("purpose", "text", "visual_ideas")
+
+
+def generate_slide_plans(processed_article: Dict) -> List[Dict]:
+    """
+    Plan 3-7 slides with one Gemini call, outside the agent loop (used by headless runs).
+    Raises if the model response is not a usable list of slide plans.
+    """
+    model = get_gemini_model(GEMINI_MODEL)
+    user_prompt = f"""\nProcessed article:\n{json.dumps(processed_article, ensure_ascii=False)}\n\nReturn only a JSON list of 3-7 objects with the fields: purpose, text, visual_ideas."""
+    plans = generate_json(model, PLANNER_SYSTEM_PROMPT, user_prompt)
+    if isinstance(plans, dict):
+        plans = plans.get("slide_plans") or plans.get("slides") or []
+    plans = [plan for plan in plans if isinstance(plan, dict)][:7]
+    if len(plans) < 3:
+        raise ValueError(f"Planner returned {len(plans)} usable slides, expected 3-7")
+    return [{field: plan.get(field, "") for field in SLIDE_PLAN_FIELDS} for plan in plans]
+
+
+LOCAL_VISUAL_IDEAS = (
+    "Numbered headline with a single supporting icon on the left and generous white space",
+    "Two-column layout: short statement on the left, simple illustrative icon on the right",
+    "Large key figure or phrase centered with a thin accent bar underneath",
+    "Headline on top with three compact bullet rows, each with a matching line icon",
+    "Quote-style card with bold accent color and the key phrase highlighted",
+)
+MIN_CONTENT_SLIDES = 1
+MAX_SLIDES = 7
+
+
+def _clean(value: Any) -> str:
+    """Stringify a field, dropping nulls and <placeholder> values."""
+    if value is None:
+        return ""
+    text = " ".join(str(value).split())
+    return "" if text.startswith("<") and text.endswith(">") else text
+
+
+def _citation_text(citation: Any) -> str:
+    if not isinstance(citation, dict):
+        return _clean(citation)
+    source = _clean(citation.get("source"))
+    byline = ", ".join(part for part in (_clean(citation.get("author")), _clean(citation.get("date"))) if part)
+    url = _clean(citation.get("url"))
+    lines = [" - ".join(part for part in (source, byline) if part), url]
+    return "\n".join(line for line in lines if line)
+
+
+def build_local_slide_plans(processed_article: Dict) -> Optional[List[Dict]]:
+    """
+    Build slide plans deterministically from processed_article without a model call:
+    a title slide, one slide per key point (or per section when there are no key points)
+    and a closing citation slide, 3-7 slides in total.
+    Returns None when the article is too thin to plan locally.
+    """
+    if not isinstance(processed_article, dict):
+        return None
+    summary = _clean(processed_article.get("summary"))
+    points = [_clean(point) for point in processed_article.get("key_points") or []]
+    points = [point for point in points if point]
+    if not points:
+        for section in processed_article.get("structure") or []:
+            if isinstance(section, dict):
+                heading = _clean(section.get("heading"))
+                content = _clean(section.get("content")).strip(". ")
+                if heading and content:
+                    points.append(f"{heading}: {content}")
+                elif heading:
+                    points.append(heading)
+    points = points[: MAX_SLIDES - 2]
+    if not summary or len(points) < MIN_CONTENT_SLIDES:
+        return None
+
+    plans = [{
+        "purpose": "Title slide: hook the reader with the article's main message",
+        "text": summary,
+        "visual_ideas": "Bold headline centered on a clean background with a subtle brand-color gradient and a 'swipe' cue",
+    }]
+    for index, point in enumerate(points):
+        plans.append({
+            "purpose": f"Key point {index + 1} of {len(points)}",
+            "text": point,
+            "visual_ideas": LOCAL_VISUAL_IDEAS[index % len(LOCAL_VISUAL_IDEAS)],
+        })
+    citation = _citation_text(processed_article.get("citation"))
+    plans.append({
+        "purpose": "Closing slide: credit the source and invite engagement",
+        "text": f"Source: {citation}" if citation else "Share your thoughts in the comments",
+        "visual_ideas": "Minimal closing card with the source credit at the bottom and a call to follow for more",
+    })
+    return plans
+
+
+def build_slide_plans(mode: Optional[str] = None, tool_context: Optional[ToolContext] = None) -> Dict:
+    """
+    Plan the carousel locally from tool_context.state['processed_article'] and save it to
+    tool_context.state['slide_plans']. mode ('local' or 'llm') overrides
+    tool_context.state['planner_mode'] for this call. Skipped (status 'fallback') when the mode
+    is 'llm' or the article structure is too thin; the LLM planner agent should then be used instead.
+    """
+    mode = mode or tool_context.state.get("planner_mode", DEFAULT_PLANNER_MODE)
+    if mode not in PLANNER_MODES:
+        return {"status": "error", "message": f"Unknown planner mode '{mode}', expected one of {', '.join(PLANNER_MODES)}"}
+    if mode != "local":
+        return {"status": "fallback", "message": f"planner_mode is '{mode}', use infographic_content_planner_agent"}
+    plans = build_local_slide_plans(tool_context.state.get("processed_article"))
+    if plans is None:
+        return {
+            "status": "fallback",
+            "message": "Processed article is too thin to plan locally, use infographic_content_planner_agent",
+        }
+    tool_context.state["slide_plans"] = plans
+    return {"status": "success", "planner": "local", "slide_count": len(plans), "slide_plans": plans}
+
+
+async def build_slide_plans_async(mode: Optional[str] = None, tool_context: Optional[ToolContext] = None) -> Dict:
+    """
+    Plan the carousel locally from tool_context.state['processed_article'] and save it to
+    tool_context.state['slide_plans']. mode ('local' or 'llm') overrides
+    tool_context.state['planner_mode'] for this call. Returns status 'fallback' when the LLM
+    planner agent should be used instead. Same contract as build_slide_plans, run in a worker thread.
+    """
+    return await asyncio.to_thread(build_slide_plans, mode, tool_context)
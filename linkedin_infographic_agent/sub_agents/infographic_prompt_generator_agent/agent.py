@@ -6,7 +6,7 @@ from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 
 from linkedin_infographic_agent.constants import GEMINI_MODEL
-from ...shared_lib.callbacks import before_model_callback
+from ...shared_lib.callbacks import AGENT_TRACING_CALLBACKS
 
 
 def save_prompt(prompt: str, tool_context: ToolContext) -> dict:
@@ -19,6 +19,7 @@ def save_prompt(prompt: str, tool_context: ToolContext) -> dict:
 infographic_prompt_generator_agent = Agent(
     name="infographic_prompt_generator_agent",
     description="An agent that generates a detailed, verbose prompt for a single LinkedIn infographic slide based on structured slide content.",
+    **AGENT_TRACING_CALLBACKS,
     instruction="""
     You are the Infographic Prompt Generator Agent. Your job is to:
     1. Take structured content for a single slide from tool_context.state['current_slide_plan'] (provided by the main agent from the slide_plans list).
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from google.adk.tools.tool_context import ToolContext
+
+from ....constants import GEMINI_MODEL, INFOGRAPHIC_IMAGE_SIZE
+from ....shared_lib.article_utils import load_carousel_record, save_carousel_record
+from ....shared_lib.clients import get_gemini_model
+from ....shared_lib.gemini_utils import generate_json, generate_text
+
+PROMPT_GENERATOR_SYSTEM_PROMPT = (
+    f"You write image-generation prompts for {INFOGRAPHIC_IMAGE_SIZE} LinkedIn infographic slides. "
+    "Given one slide plan (purpose, text, visual_ideas), write a detailed, verbose prompt that specifies "
+    "the layout (where text and visuals go), all text that must appear on the slide, and the colors, icons and style. "
+    "Mention that any provided logos or images should be incorporated. Do not reference YouTube or thumbnails. "
+    "Return only the prompt text."
+)
+
+
+def generate_slide_prompt(slide_plan: Dict) -> str:
+    """Write the image prompt for one slide plan with one Gemini call, outside the agent loop."""
+    model = get_gemini_model(GEMINI_MODEL)
+    user_prompt = f"""\nSlide plan:\n{json.dumps(slide_plan, ensure_ascii=False)}\n"""
+    prompt = generate_text(model, PROMPT_GENERATOR_SYSTEM_PROMPT, user_prompt)
+    if not prompt:
+        raise ValueError("Prompt generator returned an empty prompt")
+    return prompt
+
+
+CAROUSEL_PROMPTS_SYSTEM_PROMPT = (
+    f"You write image-generation prompts for a carousel of {INFOGRAPHIC_IMAGE_SIZE} LinkedIn infographic slides. "
+    "Given the list of slide plans (purpose, text, visual_ideas), first write one style_preamble that fixes the "
+    "shared visual language for every slide: color palette, typography, background, icon style, margins and "
+    "where any provided logos or images go. Then write one prompt per slide, in order, that specifies the layout "
+    "and all text that must appear on that slide without repeating the shared style. "
+    "Do not reference YouTube or thumbnails."
+)
+
+
+def generate_carousel_prompts(slide_plans: List[Dict], style_preamble: str = "") -> Dict:
+    """
+    Write the image prompts for every slide plan with one Gemini call.
+    Returns {"style_preamble": str, "prompts": [str, ...]} where each prompt already starts
+    with the shared preamble. With style_preamble (e.g. from an earlier carousel), the prompts are
+    written for that style and it is kept as the preamble. Raises if the response does not have
+    one prompt per plan.
+    """
+    model = get_gemini_model(GEMINI_MODEL)
+    user_prompt = f"""\nSlide plans:\n{json.dumps(slide_plans, ensure_ascii=False)}\n\nReturn only a JSON object with the fields: style_preamble (string) and prompts (a list of {len(slide_plans)} strings, one per slide plan, in order)."""
+    if style_preamble:
+        user_prompt += f"""\nThese slides join an existing carousel: return this style_preamble unchanged and write the prompts for it.\nstyle_preamble: {style_preamble}"""
+    result = generate_json(model, CAROUSEL_PROMPTS_SYSTEM_PROMPT, user_prompt)
+    if not isinstance(result, dict):
+        raise ValueError("Prompt generator did not return a JSON object")
+    preamble = style_preamble or str(result.get("style_preamble") or "").strip()
+    prompts = [str(prompt).strip() for prompt in result.get("prompts") or [] if str(prompt).strip()]
+    if len(prompts) != len(slide_plans):
+        raise ValueError(f"Prompt generator returned {len(prompts)} prompts for {len(slide_plans)} slides")
+    return {
+        "style_preamble": preamble,
+        "prompts": [f"{preamble}\n\n{prompt}" if preamble else prompt for prompt in prompts],
+    }
+
+
+def reuse_carousel_prompts(record: Dict[str, Any], slide_plans: List[Dict]) -> Dict:
+    """
+    Adapt the prompts of a previously generated carousel (same or near-duplicate article) to slide_plans.
+    Slides whose plan is unchanged keep their prompt; the others are written in one batched call with
+    the stored style preamble (one call per slide only if that fails). When no plan is unchanged the
+    whole carousel is generated again with a fresh preamble.
+    Returns {"style_preamble", "prompts", "reused", "regenerated"} (1-based slide numbers).
+    """
+    preamble = record.get("style_preamble") or ""
+    previous_plans = record.get("slide_plans") or []
+    previous_prompts = record.get("prompts") or []
+    prompts: List[Any] = [None] * len(slide_plans)
+    reused, regenerated = [], []
+    for index, slide_plan in enumerate(slide_plans):
+        if index < len(previous_plans) and index < len(previous_prompts) and previous_plans[index] == slide_plan:
+            prompts[index] = previous_prompts[index]
+            reused.append(index + 1)
+        else:
+            regenerated.append(index + 1)
+    if not regenerated:
+        return {"style_preamble": preamble, "prompts": prompts, "reused": reused, "regenerated": regenerated}
+    changed_plans = [slide_plans[number - 1] for number in regenerated]
+    try:
+        batched = generate_carousel_prompts(changed_plans, preamble if reused else "")
+        new_prompts = batched["prompts"]
+        if not reused:
+            preamble = batched["style_preamble"]
+    except Exception as e:
+        print(f"[generate_prompt] Batched prompts for the changed slides failed, generating per slide. Error: {e}")
+        new_prompts = []
+        for slide_plan in changed_plans:
+            prompt = generate_slide_prompt(slide_plan)
+            new_prompts.append(f"{preamble}\n\n{prompt}" if preamble else prompt)
+    for number, prompt in zip(regenerated, new_prompts):
+        prompts[number - 1] = prompt
+    return {"style_preamble": preamble, "prompts": prompts, "reused": reused, "regenerated": regenerated}
+
+
+def generate_all_slide_prompts(tool_context: ToolContext) -> Dict:
+    """
+    Generate the prompts for every slide in tool_context.state['slide_plans'] in one call.
+    Saves them, in slide order, to tool_context.state['slide_generation_prompts'] (ready for
+    render_carousel) and the shared style to tool_context.state['slide_style_preamble'].
+    If this article (or a near-duplicate of it) was turned into a carousel before, that carousel's
+    prompts are reused for every unchanged slide plan, so those slides hit the render cache.
+    """
+    slide_plans = tool_context.state.get("slide_plans")
+    if not slide_plans:
+        return {"status": "error", "message": "No slide plans found in state['slide_plans']"}
+    article_key = tool_context.state.get("article_cache_key")
+    record = load_carousel_record(article_key) if article_key else None
+    if record is not None:
+        try:
+            result = reuse_carousel_prompts(record, slide_plans)
+        except Exception as e:
+            print(f"[generate_prompt] Reusing the previous carousel's prompts failed. Error: {e}")
+            record = None
+    if record is None:
+        try:
+            result = generate_carousel_prompts(slide_plans)
+        except Exception as e:
+            print(f"[generate_prompt] Batched prompt generation failed. Error: {e}")
+            return {
+                "status": "error",
+                "message": f"Batched prompt generation failed: {str(e)}. Generate the prompts one slide at a time instead.",
+            }
+    tool_context.state["slide_style_preamble"] = result["style_preamble"]
+    tool_context.state["slide_generation_prompts"] = result["prompts"]
+    if article_key and (record is None or result["regenerated"]):
+        try:
+            save_carousel_record(article_key, slide_plans, result["prompts"], result["style_preamble"])
+        except OSError as e:
+            print(f"[generate_prompt] Could not save the carousel record. Error: {e}")
+    message = f"Generated {len(result['prompts'])} slide prompts in one call"
+    if record is not None:
+        message = (
+            f"Reused {len(result['reused'])} prompts from an earlier carousel of this (or a near-duplicate) article"
+            f" and wrote {len(result['regenerated'])}; unchanged slides will come from the render cache"
+        )
+    return {
+        "status": "success",
+        "message": message,
+        "style_preamble": result["style_preamble"],
+        "prompt_count": len(result["prompts"]),
+    }
+
+
+async def generate_all_slide_prompts_async(tool_context: ToolContext) -> Dict:
+    """
+    Generate the prompts for every slide in tool_context.state['slide_plans'] in one call and save
+    them to tool_context.state['slide_generation_prompts'] with the shared style in
+    tool_context.state['slide_style_preamble']. Same contract as generate_all_slide_prompts, but
+    the Gemini call runs in a worker thread, so the event loop keeps serving other sessions.
+    """
+    return await asyncio.to_thread(generate_all_slide_prompts, tool_context)
@@ -1,19 +1,33 @@
 from google.adk.agents import Agent
 from linkedin_infographic_agent.constants import GEMINI_MODEL
-from .tools.create_slide import create_slide
+from .tools.create_slide import create_slide_async
+from .tools.render_carousel import finalize_slides_async, render_carousel_async, update_carousel_async
+from ...shared_lib.callbacks import AGENT_TRACING_CALLBACKS
+from ...shared_lib.scheduled_model import scheduled_gemini
 
 slide_generator_agent = Agent(
     name="slide_generator_agent",
     description="An agent that generates a single 1080x1080 LinkedIn infographic slide from a detailed prompt, automatically incorporating assets.",
-    model=GEMINI_MODEL,
-    tools=[create_slide],
+    **AGENT_TRACING_CALLBACKS,
+    model=scheduled_gemini(GEMINI_MODEL),
+    tools=[create_slide_async, render_carousel_async, update_carousel_async, finalize_slides_async],
     instruction="""
     You are the LinkedIn Infographic Slide Generator. Your job is to:
     1. Receive a detailed prompt describing the content, layout, and style for a single infographic slide (1080x1080).
-    2. Generate a high-quality, visually engaging slide using the create_slide tool.
+    2. Generate a high-quality, visually engaging slide using the create_slide_async tool.
     3. Automatically incorporate any assets found in the assets directory (e.g., logos, icons) as references.
     4. Save the generated slide with the provided filename and update the state accordingly.
     5. Report the result, including the filename, location, and any assets used.
+    6. When asked to render a whole carousel at once, call the render_carousel_async tool with the list of slide prompts in order,
+       or without prompts to render tool_context.state['slide_generation_prompts'].
+       Slides are rendered in parallel (slide 1 first as the style anchor when the prompts do not share a style preamble).
+       Report every slide's status; a failed slide does not stop the others.
+    7. When the user has edited some slides of an already rendered carousel (tool_context.state['slide_plans'] updated),
+       call the update_carousel_async tool instead of re-rendering everything. It re-renders only the slides whose plan changed
+       and reuses the existing images for the rest. Report which slides were re-rendered and which were reused.
+    8. When asked for drafts or a preview, pass tier='draft' to create_slide_async or render_carousel_async. This produces fast, low-quality previews.
+       When the user approves drafts, call finalize_slides_async with the approved slide numbers to render them at full quality with the same prompts and assets.
+       Always report which tier (draft or final) each slide was rendered at.
 
     ## Guidelines
     - Do not reference YouTube or thumbnails; focus on LinkedIn carousel/infographic context.
@@ -1,194 +1,526 @@
-import base64
-import glob
+import asyncio
 import os
-from typing import Dict, Optional
+import pathlib
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import google.genai.types as types
 from google.adk.tools.tool_context import ToolContext
-from openai import OpenAI
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 from ....constants import (
+    DRAFT_IMAGE_QUALITY,
+    DRAFT_IMAGE_SIZE,
+    DRAFT_IMAGE_TOKENS_PER_REQUEST,
     GENERATED_SLIDES_DIR,
     IMAGE_ROOT_DIR,
     INFOGRAPHIC_ASSETS_DIR,
     INFOGRAPHIC_IMAGE_SIZE,
+    OPENAI_IMAGE_TOKENS_PER_REQUEST,
+)
+from ....shared_lib.asset_registry import PreparedAsset, get_prepared_assets
+from ....shared_lib.clients import get_async_openai_client, get_openai_client
+from ....shared_lib.image_io import link_or_copy_file, read_file_bytes, write_base64_file
+from ....shared_lib.scheduler import get_scheduler
+from ....shared_lib.slide_store import carousel_id_for, plan_hash, record_slide
+from ....shared_lib.tracing import trace_span
+from ....shared_lib.render_cache import (
+    get_cached_render_path,
+    put_cached_render_file,
+    render_cache_key,
 )
 
+# Render tiers: a cheap low-quality preview, and the full render for approved slides.
+# tier -> (image size, quality, token estimate); quality None keeps the model's default
+RENDER_TIERS = {
+    "draft": (DRAFT_IMAGE_SIZE, DRAFT_IMAGE_QUALITY, DRAFT_IMAGE_TOKENS_PER_REQUEST),
+    "final": (INFOGRAPHIC_IMAGE_SIZE, None, OPENAI_IMAGE_TOKENS_PER_REQUEST),
+}
+FINAL_TIER = "final"
+TIER_STATE_KEYS = {"draft": "slide_drafts", "final": "slide_finals"}
+
+
+def check_tier(tier: str) -> None:
+    if tier not in RENDER_TIERS:
+        raise ValueError(f"Unknown render tier '{tier}'; expected one of {sorted(RENDER_TIERS)}")
+
+
+def tier_filename(filename: str, tier: str) -> str:
+    """File name of a slide's render in a tier: slide_01.png for finals, slide_01_draft.png for drafts."""
+    if tier == FINAL_TIER:
+        return filename
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}_{tier}{ext or '.png'}"
+
+
+def record_tier_render(
+    tool_context: Optional[ToolContext],
+    filename: str,
+    tier: str,
+    slide_number: Optional[int],
+    filepath: str,
+    clean_prompt: str,
+    assets: List[PreparedAsset],
+    reference_path: Optional[str],
+    artifact_version: Optional[int],
+) -> None:
+    """
+    Track a render under state['slide_drafts'] or state['slide_finals'], keyed by the final
+    file name, with the exact inputs finalize_slides needs to re-render a draft at full quality.
+    """
+    if tool_context is None:
+        return
+    key = TIER_STATE_KEYS[tier]
+    renders = dict(tool_context.state.get(key) or {})
+    renders[filename] = {
+        "slide_number": slide_number,
+        "filename": tier_filename(filename, tier),
+        "filepath": filepath,
+        "prompt": clean_prompt,
+        "asset_hashes": [asset.content_hash for asset in assets],
+        "reference_path": reference_path,
+        "artifact_version": artifact_version,
+    }
+    tool_context.state[key] = renders
+
+
+def load_assets() -> List[PreparedAsset]:
+    """Return the prepared assets from the registry, creating the assets directory if needed."""
+    os.makedirs(IMAGE_ROOT_DIR, exist_ok=True)
+    os.makedirs(INFOGRAPHIC_ASSETS_DIR, exist_ok=True)
+    return get_prepared_assets()
+
+
+def _image_request(client: Any, clean_prompt: str, input_files: List[Tuple], tier: str) -> Tuple[Any, Dict]:
+    """The images endpoint to call and its arguments: images.edit with input files, else images.generate."""
+    size, quality, _ = RENDER_TIERS[tier]
+    kwargs = {"model": "gpt-image-1", "prompt": clean_prompt, "n": 1, "size": size}
+    if quality:
+        kwargs["quality"] = quality
+    if input_files:
+        kwargs["image"] = input_files if len(input_files) > 1 else input_files[0]
+        return client.images.edit, kwargs
+    return client.images.generate, kwargs
+
+
+def _image_tokens(clean_prompt: str, tier: str) -> int:
+    return len(clean_prompt) // 4 + RENDER_TIERS[tier][2]
+
+
+def _record_image_response(span: Dict, response: Any) -> None:
+    if response and response.data:
+        span["response_bytes"] = len(response.data[0].b64_json or "")
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        span["input_tokens"] = getattr(usage, "input_tokens", 0) or 0
+        span["output_tokens"] = getattr(usage, "output_tokens", 0) or 0
+
+
+def _image_base64(response: Any) -> str:
+    """The base64 PNG of an images response. Raises ValueError when the response is empty."""
+    if not (response and response.data and len(response.data) > 0):
+        raise ValueError("No data returned from the API")
+    image_base64 = response.data[0].b64_json
+    if not image_base64:
+        raise ValueError("No image data returned from the API")
+    return image_base64
+
+
+def generate_slide_image(
+    client: "OpenAI",
+    clean_prompt: str,
+    assets: List[PreparedAsset],
+    filepath: str,
+    reference_path: Optional[str] = None,
+    tier: str = FINAL_TIER,
+) -> int:
+    """
+    Call gpt-image-1 and decode the returned PNG straight into filepath (atomically).
+    Uses images.edit when a reference slide or assets are available, otherwise images.generate.
+    tier selects the size and quality (see RENDER_TIERS).
+    Returns the number of bytes written. Raises on API errors or empty responses.
+    """
+    input_files = [asset.as_upload() for asset in assets]
+    with ExitStack() as stack:
+        request_bytes = len(clean_prompt) + sum(len(data) for _, data, _ in input_files)
+        reference_file = None
+        if reference_path:
+            # Upload the previous slide from an open file instead of reading it into memory
+            reference_file = stack.enter_context(open(reference_path, "rb"))
+            input_files.insert(0, (os.path.basename(reference_path), reference_file, "image/png"))
+            request_bytes += os.fstat(reference_file.fileno()).st_size
+        endpoint, kwargs = _image_request(client, clean_prompt, input_files, tier)
+
+        def request_image():
+            if reference_file is not None:
+                # A retried upload must send the reference slide from the start again
+                reference_file.seek(0)
+            return endpoint(**kwargs)
+
+        with trace_span("openai.images", kind="backend") as span:
+            span["request_bytes"] = request_bytes
+            response = get_scheduler("openai.images").call(request_image, tokens=_image_tokens(clean_prompt, tier))
+            _record_image_response(span, response)
+    image_base64 = _image_base64(response)
+    with trace_span("slide.write", kind="disk") as span:
+        written = write_base64_file(image_base64, filepath)
+        span["request_bytes"] = written
+    return written
+
+
+async def generate_slide_image_async(
+    client: "AsyncOpenAI",
+    clean_prompt: str,
+    assets: List[PreparedAsset],
+    filepath: str,
+    reference_path: Optional[str] = None,
+    tier: str = FINAL_TIER,
+) -> int:
+    """
+    generate_slide_image with the AsyncOpenAI client. The reference slide is passed as a path,
+    which the SDK reads asynchronously on every attempt; decoding and writing run in a worker thread.
+    """
+    input_files = [asset.as_upload() for asset in assets]
+    request_bytes = len(clean_prompt) + sum(len(data) for _, data, _ in input_files)
+    if reference_path:
+        input_files.insert(0, (os.path.basename(reference_path), pathlib.Path(reference_path), "image/png"))
+        request_bytes += os.path.getsize(reference_path)
+    endpoint, kwargs = _image_request(client, clean_prompt, input_files, tier)
+    with trace_span("openai.images", kind="backend") as span:
+        span["request_bytes"] = request_bytes
+        response = await get_scheduler("openai.images").call_async(
+            lambda: endpoint(**kwargs), tokens=_image_tokens(clean_prompt, tier)
+        )
+        _record_image_response(span, response)
+    image_base64 = _image_base64(response)
+    with trace_span("slide.write", kind="disk") as span:
+        written = await asyncio.to_thread(write_base64_file, image_base64, filepath)
+        span["request_bytes"] = written
+    return written
+
+
+def _slide_cache_key(
+    clean_prompt: str, assets: List[PreparedAsset], reference_path: Optional[str], tier: str
+) -> str:
+    size, quality, _ = RENDER_TIERS[tier]
+    return render_cache_key(
+        clean_prompt,
+        size,
+        [asset.content_hash for asset in assets],
+        reference_path,
+        quality,
+    )
+
+
+def _reuse_cached_render(key: str, filepath: str) -> bool:
+    """Link a cached render into filepath. Returns False on a miss or if the entry vanished."""
+    with trace_span("render_cache.lookup", kind="cache") as span:
+        cached_path = get_cached_render_path(key)
+        span["cache_hit"] = cached_path is not None
+    if cached_path is None:
+        return False
+    try:
+        link_or_copy_file(cached_path, filepath)
+        return True
+    except OSError as e:
+        # Evicted between lookup and link; render it instead
+        print(f"[create_slide] Could not reuse cached render. Error: {e}")
+        return False
+
+
+def _store_render(key: str, filepath: str) -> None:
+    try:
+        put_cached_render_file(key, filepath)
+    except OSError as e:
+        print(f"[create_slide] Could not store render in cache. Error: {e}")
+
+
+def render_slide_file(
+    client: "OpenAI",
+    clean_prompt: str,
+    assets: List[PreparedAsset],
+    filepath: str,
+    reference_path: Optional[str] = None,
+    tier: str = FINAL_TIER,
+) -> bool:
+    """
+    Render a slide into filepath and return whether it was served from the render cache.
+    Byte-identical inputs are linked from the on-disk render cache without calling the API.
+    """
+    key = _slide_cache_key(clean_prompt, assets, reference_path, tier)
+    if _reuse_cached_render(key, filepath):
+        return True
+    generate_slide_image(client, clean_prompt, assets, filepath, reference_path, tier)
+    _store_render(key, filepath)
+    return False
+
+
+async def render_slide_file_async(
+    client: "AsyncOpenAI",
+    clean_prompt: str,
+    assets: List[PreparedAsset],
+    filepath: str,
+    reference_path: Optional[str] = None,
+    tier: str = FINAL_TIER,
+) -> bool:
+    """render_slide_file for coroutines; cache lookups and links run in a worker thread."""
+    key = _slide_cache_key(clean_prompt, assets, reference_path, tier)
+    if await asyncio.to_thread(_reuse_cached_render, key, filepath):
+        return True
+    await generate_slide_image_async(client, clean_prompt, assets, filepath, reference_path, tier)
+    await asyncio.to_thread(_store_render, key, filepath)
+    return False
+
+
+def slide_output_dir(namespace: Optional[str] = None) -> str:
+    """GENERATED_SLIDES_DIR, or a per-job subdirectory of it when namespace is given."""
+    return os.path.join(GENERATED_SLIDES_DIR, namespace) if namespace else GENERATED_SLIDES_DIR
+
+
+def slide_file_path(filename: str, namespace: Optional[str] = None) -> str:
+    """Path of a slide in GENERATED_SLIDES_DIR (or its namespace subdirectory), creating the directory."""
+    output_dir = slide_output_dir(namespace)
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, filename)
+
+
+def save_slide_artifact(
+    filepath: str, filename: str, tool_context: ToolContext
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Save the slide written at filepath as an ADK artifact, reading it into a single buffer.
+    Returns (artifact_version, None) on success or (None, warning_message) on failure.
+    """
+    try:
+        image_artifact = types.Part(
+            inline_data=types.Blob(data=read_file_bytes(filepath), mime_type="image/png")
+        )
+        return tool_context.save_artifact(filename=filename, artifact=image_artifact), None
+    except ValueError as e:
+        return None, f"Image generated but could not be saved as an artifact: {str(e)}. Is ArtifactService configured?"
+    except Exception as e:
+        return None, f"Image generated but encountered an error saving as artifact: {str(e)}"
+
+
+def _slide_target(
+    tool_context: Optional[ToolContext], tier: str
+) -> Tuple[List[PreparedAsset], List[str], Optional[str], str, str, str]:
+    """
+    Inputs of a create_slide call: (assets, asset_paths, previous_slide_path, filename, carousel_id, filepath).
+    The previous slide is used as a reference when one was generated in this session.
+    filename is the slide's final name; filepath is where this tier's render is written.
+    """
+    assets = load_assets()
+    asset_paths = [asset.path for asset in assets]
+    # Use slide-specific state keys
+    previous_slide_path = None
+    if tool_context and tool_context.state.get("slide_generated") is True:
+        candidate_path = tool_context.state.get("current_slide_path")
+        if candidate_path and os.path.exists(candidate_path):
+            previous_slide_path = candidate_path
+            if previous_slide_path not in asset_paths:
+                asset_paths.append(previous_slide_path)
+    # Dynamic filename generation
+    filename = "slide.png"
+    if tool_context and tool_context.state.get("slide_filename"):
+        filename = tool_context.state["slide_filename"]
+    carousel_id = carousel_id_for(tool_context)
+    filepath = slide_file_path(tier_filename(filename, tier), carousel_id)
+    return assets, asset_paths, previous_slide_path, filename, carousel_id, filepath
+
+
+def _render_error(e: Exception, previous_slide_path: Optional[str], assets: List[PreparedAsset]) -> Dict:
+    if previous_slide_path and assets:
+        context = " with previous slide and assets"
+    elif previous_slide_path:
+        context = " with previous slide"
+    elif assets:
+        context = " with assets"
+    else:
+        context = ""
+    return {
+        "status": "error",
+        "message": f"Error generating image{context}: {str(e)}",
+    }
+
+
+def _store_slide(
+    carousel_id: str,
+    filename: str,
+    filepath: str,
+    clean_prompt: str,
+    tool_context: Optional[ToolContext],
+    tier: str,
+    assets: List[PreparedAsset],
+    reference_path: Optional[str],
+) -> Tuple[Optional[int], Optional[str]]:
+    """Save the artifact, index the slide and track it under its tier. Returns (artifact_version, warning)."""
+    artifact_filename = tier_filename(filename, tier)
+    artifact_version, warning = None, None
+    if tool_context:
+        artifact_version, warning = save_slide_artifact(
+            filepath, artifact_filename, tool_context
+        )
+    slide_plan = tool_context.state.get("current_slide_plan") if tool_context else None
+    entry = record_slide(
+        carousel_id,
+        artifact_filename,
+        filepath,
+        clean_prompt,
+        artifact_version=artifact_version,
+        slide_plan_hash=plan_hash(slide_plan) if slide_plan else None,
+        tier=tier,
+    )
+    record_tier_render(
+        tool_context,
+        filename,
+        tier,
+        entry["slide_number"],
+        filepath,
+        clean_prompt,
+        assets,
+        reference_path,
+        artifact_version,
+    )
+    return artifact_version, warning
+
+
+def _slide_result(
+    filepath: str,
+    filename: str,
+    asset_paths: List[str],
+    artifact_version: Optional[int],
+    warning: Optional[str],
+    from_cache: bool,
+    tool_context: Optional[ToolContext],
+    tier: str,
+) -> Dict:
+    """Update the slide state keys and build create_slide's return dict."""
+    filename = tier_filename(filename, tier)
+    if tool_context:
+        if warning:
+            return {"status": "warning", "message": warning}
+        tool_context.state["slide_generated"] = True
+        tool_context.state["current_slide_filename"] = filename
+        tool_context.state["current_slide_version"] = artifact_version
+    if tool_context:
+        tool_context.state["current_slide_path"] = filepath
+        tool_context.state["slide_generated"] = True
+    if artifact_version is not None:
+        return {
+            "status": "success",
+            "message": f"Image created successfully and saved as artifact '{filename}' (version {artifact_version}) and local file '{filepath}'",
+            "filepath": filepath,
+            "artifact_filename": filename,
+            "artifact_version": artifact_version,
+            "assets_used": (
+                [os.path.basename(path) for path in asset_paths]
+                if asset_paths
+                else []
+            ),
+            "slide_generated": True,
+            "tier": tier,
+            "from_cache": from_cache,
+            "is_first_generation": not (
+                tool_context
+                and tool_context.state.get("slide_generated", False)
+            ),
+        }
+    else:
+        return {
+            "status": "success",
+            "message": f"Image created successfully and saved as local file '{filepath}'",
+            "filepath": filepath,
+            "assets_used": (
+                [os.path.basename(path) for path in asset_paths]
+                if asset_paths
+                else []
+            ),
+            "slide_generated": True,
+            "tier": tier,
+            "from_cache": from_cache,
+            "is_first_generation": not (
+                tool_context
+                and tool_context.state.get("slide_generated", False)
+            ),
+        }
+
+
 def create_slide(
     prompt: str,
+    tier: str = FINAL_TIER,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Create an image using OpenAI's image generation API with gpt-image-1 model,
+    automatically incorporating any assets from the assets directory.
+    tier="draft" renders a fast low-quality preview (slide_NN_draft.png) for review;
+    tier="final" renders the full-quality INFOGRAPHIC_IMAGE_SIZE slide.
+    """
+    try:
+        try:
+            check_tier(tier)
+            client = get_openai_client()
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        clean_prompt = prompt.strip()
+        assets, asset_paths, previous_slide_path, filename, carousel_id, filepath = _slide_target(tool_context, tier)
+        try:
+            from_cache = render_slide_file(
+                client, clean_prompt, assets, filepath, previous_slide_path, tier
+            )
+        except Exception as e:
+            return _render_error(e, previous_slide_path, assets)
+        artifact_version, warning = _store_slide(
+            carousel_id, filename, filepath, clean_prompt, tool_context, tier, assets, previous_slide_path
+        )
+        return _slide_result(filepath, filename, asset_paths, artifact_version, warning, from_cache, tool_context, tier)
+    except Exception as e:
+        return {"status": "error", "message": f"Error creating image: {str(e)}"}
+
+
+async def create_slide_async(
+    prompt: str,
+    tier: str = FINAL_TIER,
     tool_context: Optional[ToolContext] = None,
 ) -> Dict:
     """
     Create an image using OpenAI's image generation API with gpt-image-1 model,
     automatically incorporating any assets from the assets directory.
+    tier="draft" renders a fast low-quality preview (slide_NN_draft.png) for review;
+    tier="final" renders the full-quality INFOGRAPHIC_IMAGE_SIZE slide.
+    Same contract as create_slide, but the image request uses the AsyncOpenAI client and
+    file I/O runs in worker threads, so the event loop keeps serving other sessions.
     """
     try:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            return {
-                "status": "error",
-                "message": "OPENAI_API_KEY not found in environment variables",
-            }
-        client = OpenAI(api_key=api_key)
+        try:
+            check_tier(tier)
+            client = get_async_openai_client()
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
         clean_prompt = prompt.strip()
-        response = None
-        asset_paths = []
-        os.makedirs(IMAGE_ROOT_DIR, exist_ok=True)
-        assets_dir = INFOGRAPHIC_ASSETS_DIR
-        if not os.path.exists(assets_dir):
-            os.makedirs(assets_dir, exist_ok=True)
-        asset_files_paths = glob.glob(os.path.join(assets_dir, "*"))
-        for asset_path in asset_files_paths:
-            asset_paths.append(asset_path)
-        # Use slide-specific state keys
-        if tool_context and tool_context.state.get("slide_generated") is True:
-            previous_slide_path = tool_context.state.get("current_slide_path")
-            if previous_slide_path and os.path.exists(previous_slide_path):
-                if previous_slide_path not in asset_paths:
-                    asset_paths.append(previous_slide_path)
-                try:
-                    if asset_files_paths:
-                        try:
-                            asset_file_objects = [open(path, "rb") for path in asset_files_paths]
-                            all_files = [open(previous_slide_path, "rb")] + asset_file_objects
-                            try:
-                                response = client.images.edit(
-                                    model="gpt-image-1",
-                                    image=[open(previous_slide_path, "rb"), *[open(path, "rb") for path in asset_files_paths]],
-                                    prompt=clean_prompt,
-                                    n=1,
-                                    size=INFOGRAPHIC_IMAGE_SIZE,
-                                )
-                            finally:
-                                for file in all_files:
-                                    file.close()
-                        except Exception as e:
-                            return {
-                                "status": "error",
-                                "message": f"Error generating image with previous slide and assets: {str(e)}",
-                            }
-                    else:
-                        with open(previous_slide_path, "rb") as previous_slide:
-                            response = client.images.edit(
-                                model="gpt-image-1",
-                                image=previous_slide,
-                                prompt=clean_prompt,
-                                n=1,
-                                size=INFOGRAPHIC_IMAGE_SIZE,
-                            )
-                except Exception as e:
-                    return {
-                        "status": "error",
-                        "message": f"Error generating image with previous slide: {str(e)}",
-                    }
-        # If we don't have a response yet (no previous slide or error), try with assets
-        if response is None:
-            if asset_files_paths:
-                try:
-                    asset_file_objects = [open(path, "rb") for path in asset_files_paths]
-                    try:
-                        response = client.images.edit(
-                            model="gpt-image-1",
-                            image=[open(path, "rb") for path in asset_files_paths],
-                            prompt=clean_prompt,
-                            n=1,
-                            size=INFOGRAPHIC_IMAGE_SIZE,
-                        )
-                    finally:
-                        for file in asset_file_objects:
-                            file.close()
-                except Exception as e:
-                    return {
-                        "status": "error",
-                        "message": f"Error generating image with assets: {str(e)}",
-                    }
-            else:
-                response = client.images.generate(
-                    model="gpt-image-1",
-                    prompt=clean_prompt,
-                    n=1,
-                    size=INFOGRAPHIC_IMAGE_SIZE,
-                )
-        if response and response.data and len(response.data) > 0:
-            image_base64 = response.data[0].b64_json
-            if image_base64:
-                image_bytes = base64.b64decode(image_base64)
-            else:
-                return {
-                    "status": "error",
-                    "message": "No image data returned from the API",
-                }
-        else:
-            return {
-                "status": "error",
-                "message": "No data returned from the API",
-            }
-        # Dynamic filename generation
-        filename = "slide.png"
-        if tool_context and tool_context.state.get("slide_filename"):
-            filename = tool_context.state["slide_filename"]
-        artifact_version = None
-        if tool_context:
-            image_artifact = types.Part(
-                inline_data=types.Blob(data=image_bytes, mime_type="image/png")
+        assets, asset_paths, previous_slide_path, filename, carousel_id, filepath = await asyncio.to_thread(
+            _slide_target, tool_context, tier
+        )
+        try:
+            from_cache = await render_slide_file_async(
+                client, clean_prompt, assets, filepath, previous_slide_path, tier
             )
-            try:
-                artifact_version = tool_context.save_artifact(
-                    filename=filename, artifact=image_artifact
-                )
-                tool_context.state["slide_generated"] = True
-                tool_context.state["current_slide_filename"] = filename
-                tool_context.state["current_slide_version"] = artifact_version
-            except ValueError as e:
-                return {
-                    "status": "warning",
-                    "message": f"Image generated but could not be saved as an artifact: {str(e)}. Is ArtifactService configured?",
-                }
-            except Exception as e:
-                return {
-                    "status": "warning",
-                    "message": f"Image generated but encountered an error saving as artifact: {str(e)}",
-                }
-        os.makedirs(GENERATED_SLIDES_DIR, exist_ok=True)
-        filepath = os.path.join(GENERATED_SLIDES_DIR, filename)
-        with open(filepath, "wb") as f:
-            f.write(image_bytes)
-        if tool_context:
-            tool_context.state["current_slide_path"] = filepath
-            tool_context.state["slide_generated"] = True
-        if artifact_version is not None:
-            return {
-                "status": "success",
-                "message": f"Image created successfully and saved as artifact '{filename}' (version {artifact_version}) and local file '{filepath}'",
-                "filepath": filepath,
-                "artifact_filename": filename,
-                "artifact_version": artifact_version,
-                "assets_used": (
-                    [os.path.basename(path) for path in asset_paths]
-                    if asset_paths
-                    else []
-                ),
-                "slide_generated": True,
-                "is_first_generation": not (
-                    tool_context
-                    and tool_context.state.get("slide_generated", False)
-                ),
-            }
-        else:
-            return {
-                "status": "success",
-                "message": f"Image created successfully and saved as local file '{filepath}'",
-                "filepath": filepath,
-                "assets_used": (
-                    [os.path.basename(path) for path in asset_paths]
-                    if asset_paths
-                    else []
-                ),
-                "slide_generated": True,
-                "is_first_generation": not (
-                    tool_context
-                    and tool_context.state.get("slide_generated", False)
-                ),
-            }
+        except Exception as e:
+            return _render_error(e, previous_slide_path, assets)
+        artifact_version, warning = await asyncio.to_thread(
+            _store_slide,
+            carousel_id,
+            filename,
+            filepath,
+            clean_prompt,
+            tool_context,
+            tier,
+            assets,
+            previous_slide_path,
+        )
+        return _slide_result(filepath, filename, asset_paths, artifact_version, warning, from_cache, tool_context, tier)
     except Exception as e:
-        return {"status": "error", "message": f"Error creating image: {str(e)}"} 
\ No newline at end of file
+        return {"status": "error", "message": f"Error creating image: {str(e)}"}
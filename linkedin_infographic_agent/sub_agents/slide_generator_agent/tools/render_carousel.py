@@ -0,0 +1,472 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from google.adk.tools.tool_context import ToolContext
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+from ....constants import SLIDE_RENDER_CONCURRENCY
+from ....shared_lib.asset_registry import PreparedAsset
+from ....shared_lib.clients import get_openai_client
+from ....shared_lib.slide_store import (
+    DEFAULT_CAROUSEL_ID,
+    carousel_id_for,
+    delete_slide,
+    get_slide,
+    list_carousel,
+    plan_hash,
+    record_slide,
+    update_slide,
+)
+from ....shared_lib.tracing import submit_in_context
+from ...infographic_prompt_generator_agent.tools.generate_prompt import generate_slide_prompt
+from .create_slide import (
+    FINAL_TIER,
+    check_tier,
+    load_assets,
+    record_tier_render,
+    render_slide_file,
+    save_slide_artifact,
+    slide_file_path,
+    slide_output_dir,
+    tier_filename,
+)
+
+
+def _render_one(
+    client: "OpenAI",
+    index: int,
+    prompt: str,
+    assets: List[PreparedAsset],
+    reference_path: Optional[str],
+    namespace: Optional[str] = None,
+    tier: str = FINAL_TIER,
+) -> Dict:
+    """Render and write a single slide. Never raises; failures are reported in the result."""
+    filename = tier_filename(f"slide_{index:02d}.png", tier)
+    # The manifest's prompt hash must match the render cache key, which is built from the stripped prompt
+    clean_prompt = prompt.strip()
+    try:
+        filepath = slide_file_path(filename, namespace)
+        from_cache = render_slide_file(
+            client, clean_prompt, assets, filepath, reference_path, tier
+        )
+        record_slide(namespace or DEFAULT_CAROUSEL_ID, filename, filepath, clean_prompt, slide_number=index, tier=tier)
+    except Exception as e:
+        return {
+            "slide_number": index,
+            "filename": filename,
+            "tier": tier,
+            "status": "error",
+            "message": f"Error generating slide {index}: {str(e)}",
+        }
+    return {
+        "slide_number": index,
+        "filename": filename,
+        "filepath": filepath,
+        "tier": tier,
+        "status": "success",
+        "from_cache": from_cache,
+    }
+
+
+def render_carousel_slides(
+    client: "OpenAI",
+    prompts: List[str],
+    assets: List[PreparedAsset],
+    namespace: Optional[str] = None,
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    only: Optional[Set[int]] = None,
+    use_anchor: bool = True,
+    tier: str = FINAL_TIER,
+) -> List[Dict]:
+    """
+    Render slides 1..N, slide 1 first as the style anchor and the rest concurrently.
+    With use_anchor=False (prompts that already share a style preamble) every slide is
+    rendered concurrently without a reference image.
+    When only is given, just those slide numbers are rendered; the others must already
+    exist on disk and are reported as skipped (slide 1 is still used as the reference).
+    tier selects draft previews or final renders. Results are in slide order.
+    """
+    def wanted(index: int) -> bool:
+        return only is None or index in only
+
+    results = []
+    reference_path = None
+    first = 1
+    if use_anchor:
+        if wanted(1):
+            anchor = _render_one(client, 1, prompts[0], assets, None, namespace, tier)
+        else:
+            anchor = _skipped(1, namespace, tier)
+        reference_path = anchor.get("filepath")
+        results.append(anchor)
+        first = 2
+    if len(prompts) >= first:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = [
+                submit_in_context(
+                    executor, _render_one, client, index, prompt, assets, reference_path, namespace, tier
+                )
+                if wanted(index)
+                else None
+                for index, prompt in enumerate(prompts[first - 1:], start=first)
+            ]
+            results.extend(
+                future.result() if future else _skipped(index, namespace, tier)
+                for index, future in enumerate(futures, start=first)
+            )
+    return results
+
+
+def _skipped(index: int, namespace: Optional[str], tier: str = FINAL_TIER) -> Dict:
+    filename = tier_filename(f"slide_{index:02d}.png", tier)
+    filepath = os.path.join(slide_output_dir(namespace), filename)
+    return {
+        "slide_number": index,
+        "filename": filename,
+        "filepath": filepath if os.path.exists(filepath) else None,
+        "tier": tier,
+        "status": "skipped",
+    }
+
+
+# slide number -> (prompt, assets, reference path) a slide was rendered from
+RenderInputs = Dict[int, Tuple[str, List[PreparedAsset], Optional[str]]]
+
+
+def carousel_render_inputs(
+    prompts: List[str], assets: List[PreparedAsset], results: List[Dict], use_anchor: bool
+) -> RenderInputs:
+    """The inputs render_carousel_slides used per slide: slide 1 is every other slide's reference when anchored."""
+    anchor_path = results[0].get("filepath") if use_anchor and results else None
+    return {
+        index: (prompt.strip(), assets, anchor_path if index > 1 else None)
+        for index, prompt in enumerate(prompts, start=1)
+    }
+
+
+def _finish_slides(
+    results: List[Dict],
+    carousel_id: str,
+    tool_context: Optional[ToolContext],
+    inputs: Optional[RenderInputs] = None,
+) -> List[Dict]:
+    """
+    Save artifacts for rendered slides, stamp their plan hashes (when the prompts came from
+    state['slide_plans']) into the slide store, track each render under its tier
+    (state['slide_drafts'] / state['slide_finals']) and update the carousel state keys.
+    """
+    slide_plans = tool_context.state.get("slide_plans") if tool_context else None
+    # Artifacts and state are written from this thread only, in slide order
+    slides = []
+    for result in results:
+        if result["status"] == "success":
+            fields = {}
+            if slide_plans and result["slide_number"] <= len(slide_plans):
+                fields["plan_hash"] = plan_hash(slide_plans[result["slide_number"] - 1])
+            if tool_context:
+                artifact_version, warning = save_slide_artifact(
+                    result["filepath"], result["filename"], tool_context
+                )
+                if warning:
+                    result["status"] = "warning"
+                    result["message"] = warning
+                else:
+                    result["artifact_version"] = fields["artifact_version"] = artifact_version
+            if fields:
+                update_slide(carousel_id, result["filename"], **fields)
+            if inputs and result["slide_number"] in inputs:
+                prompt, assets, reference_path = inputs[result["slide_number"]]
+                record_tier_render(
+                    tool_context,
+                    f"slide_{result['slide_number']:02d}.png",
+                    result["tier"],
+                    result["slide_number"],
+                    result["filepath"],
+                    prompt,
+                    assets,
+                    reference_path,
+                    result.get("artifact_version"),
+                )
+        slides.append(result)
+    if tool_context:
+        tool_context.state["generated_slides"] = slides
+        rendered = [slide for slide in slides if slide.get("filepath")]
+        if rendered:
+            tool_context.state["slide_generated"] = True
+            tool_context.state["current_slide_filename"] = rendered[-1]["filename"]
+            tool_context.state["current_slide_path"] = rendered[-1]["filepath"]
+    return slides
+
+
+def _carousel_status(slides: List[Dict]) -> Tuple[str, List[int]]:
+    failed = [slide["slide_number"] for slide in slides if slide["status"] == "error"]
+    if len(failed) == len(slides):
+        return "error", failed
+    return ("partial" if failed else "success"), failed
+
+
+def render_carousel(
+    prompts: Optional[List[str]] = None,
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tier: str = FINAL_TIER,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Render every slide of a carousel in one call.
+    When prompts is omitted, tool_context.state['slide_generation_prompts'] is used.
+    Slide 1 is rendered first and used as the style reference for the remaining slides,
+    which are then rendered concurrently (at most max_concurrency at a time). Prompts that
+    share a style preamble (state['slide_style_preamble']) are all rendered concurrently.
+    Results are returned in slide order; a failed slide does not cancel the others.
+    Slides are written under the carousel's own directory (per session) and indexed in the slide store.
+    With tier="draft" every slide is rendered as a fast low-quality preview; approved drafts
+    are then rendered at full quality by finalize_slides.
+    """
+    try:
+        check_tier(tier)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    use_anchor = True
+    if not prompts and tool_context:
+        prompts = tool_context.state.get("slide_generation_prompts")
+        use_anchor = not tool_context.state.get("slide_style_preamble")
+    if not prompts:
+        return {"status": "error", "message": "No slide prompts provided"}
+    try:
+        client = get_openai_client()
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    assets = load_assets()
+    carousel_id = carousel_id_for(tool_context)
+    results = render_carousel_slides(
+        client,
+        prompts,
+        assets,
+        namespace=carousel_id,
+        max_concurrency=max_concurrency,
+        use_anchor=use_anchor,
+        tier=tier,
+    )
+
+    inputs = carousel_render_inputs(prompts, assets, results, use_anchor)
+    slides = _finish_slides(results, carousel_id, tool_context, inputs)
+    status, failed = _carousel_status(slides)
+    return {
+        "status": status,
+        "message": f"Rendered {len(slides) - len(failed)} of {len(slides)} {tier} slides"
+        + (f"; failed slides: {failed}" if failed else ""),
+        "tier": tier,
+        "slides": slides,
+        "assets_used": [asset.name for asset in assets],
+    }
+
+
+async def render_carousel_async(
+    prompts: Optional[List[str]] = None,
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tier: str = FINAL_TIER,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Render every slide of a carousel in one call.
+    When prompts is omitted, tool_context.state['slide_generation_prompts'] is used.
+    Slide 1 is rendered first as the style reference unless the prompts share a style preamble;
+    the other slides are rendered concurrently (at most max_concurrency at a time).
+    With tier="draft" every slide is rendered as a fast low-quality preview.
+    Same contract as render_carousel, but the renders run in a worker thread, so the event loop
+    keeps serving other sessions.
+    """
+    return await asyncio.to_thread(render_carousel, prompts, max_concurrency, tier, tool_context)
+
+
+def finalize_slides(
+    slide_numbers: Optional[List[int]] = None,
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Render the approved drafts (slide_numbers, default all drafts) at full quality.
+    Each final reuses its draft's exact prompt and assets from state['slide_drafts'].
+    Drafts that were anchored on slide 1 use the final slide 1 as their reference instead of its
+    low-quality draft: slide 1 is finalized first when approved, otherwise its existing final
+    render is used (and no reference when there is none). The finals are tracked in state['slide_finals'].
+    """
+    drafts = (tool_context.state.get("slide_drafts") if tool_context else None) or {}
+    if not drafts:
+        return {"status": "error", "message": "No drafts found in state['slide_drafts']; render drafts first with tier='draft'"}
+    by_number = {draft["slide_number"]: (filename, draft) for filename, draft in drafts.items()}
+    wanted = sorted(set(slide_numbers)) if slide_numbers else sorted(by_number)
+    missing = [number for number in wanted if number not in by_number]
+    if missing:
+        return {"status": "error", "message": f"No drafts for slides {missing}"}
+    try:
+        client = get_openai_client()
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    carousel_id = carousel_id_for(tool_context)
+    assets_by_hash = {asset.content_hash: asset for asset in load_assets()}
+    inputs: RenderInputs = {}
+
+    def render_final(number: int, anchor_path: Optional[str]) -> Dict:
+        filename, draft = by_number[number]
+        assets = [assets_by_hash[h] for h in draft["asset_hashes"] if h in assets_by_hash]
+        if len(assets) < len(draft["asset_hashes"]):
+            return {
+                "slide_number": number,
+                "filename": filename,
+                "tier": FINAL_TIER,
+                "status": "error",
+                "message": f"Assets used by the draft of slide {number} are no longer available; re-render the draft",
+            }
+        reference_path = anchor_path if draft.get("reference_path") else None
+        inputs[number] = (draft["prompt"], assets, reference_path)
+        return _render_one(client, number, draft["prompt"], assets, reference_path, carousel_id, FINAL_TIER)
+
+    results = [render_final(1, None)] if 1 in wanted else []
+    anchor_path = _final_anchor_path(results, tool_context)
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = [submit_in_context(executor, render_final, number, anchor_path) for number in wanted if number != 1]
+        results.extend(future.result() for future in futures)
+    slides = _finish_slides(results, carousel_id, tool_context, inputs)
+    status, failed = _carousel_status(slides)
+    return {
+        "status": status,
+        "message": f"Finalized {len(slides) - len(failed)} of {len(slides)} approved slides"
+        + (f"; failed slides: {failed}" if failed else ""),
+        "tier": FINAL_TIER,
+        "slides": slides,
+    }
+
+
+def _final_anchor_path(results: List[Dict], tool_context: Optional[ToolContext]) -> Optional[str]:
+    """The full-quality slide 1 to use as the style reference: the one just rendered, else the existing final."""
+    if results and results[0].get("status") == "success":
+        return results[0]["filepath"]
+    finals = (tool_context.state.get("slide_finals") if tool_context else None) or {}
+    filepath = (finals.get("slide_01.png") or {}).get("filepath")
+    return filepath if filepath and os.path.exists(filepath) else None
+
+
+async def finalize_slides_async(
+    slide_numbers: Optional[List[int]] = None,
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Render the approved drafts (slide_numbers, default all drafts) at full quality from their
+    exact prompts and assets in state['slide_drafts']; the finals are tracked in state['slide_finals'].
+    Same contract as finalize_slides, but the renders run in a worker thread.
+    """
+    return await asyncio.to_thread(finalize_slides, slide_numbers, max_concurrency, tool_context)
+
+
+def diff_slide_plans(carousel_id: str, slide_plans: List[Dict]) -> Dict[str, List]:
+    """
+    Compare slide_plans with the carousel's last rendered manifest.
+    Returns the slide numbers whose plan changed (or that were never rendered), the slide
+    numbers that can be reused as they are, and the filenames of slides beyond the new plan.
+    """
+    changed, unchanged = [], []
+    for index, slide_plan in enumerate(slide_plans, start=1):
+        entry = get_slide(carousel_id, f"slide_{index:02d}.png")
+        if entry and entry.get("plan_hash") == plan_hash(slide_plan) and os.path.exists(entry["filepath"]):
+            unchanged.append(index)
+        else:
+            changed.append(index)
+    removed = [
+        entry["filename"]
+        for entry in list_carousel(carousel_id)
+        if entry["slide_number"] > len(slide_plans)
+    ]
+    return {"changed": changed, "unchanged": unchanged, "removed": removed}
+
+
+def update_carousel(
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Bring the rendered carousel in line with tool_context.state['slide_plans'] after an edit.
+    Only slides whose plan changed since they were last rendered get a new prompt and a new
+    image; the other slides' PNGs are reused and slides dropped from the plan are deleted.
+    """
+    if tool_context is None or not tool_context.state.get("slide_plans"):
+        return {"status": "error", "message": "No slide plans found in state['slide_plans']"}
+    slide_plans = tool_context.state["slide_plans"]
+    carousel_id = carousel_id_for(tool_context)
+    diff = diff_slide_plans(carousel_id, slide_plans)
+    for filename in diff["removed"]:
+        delete_slide(carousel_id, filename)
+    prompts = list(tool_context.state.get("slide_generation_prompts") or [])
+    prompts = (prompts + [""] * len(slide_plans))[: len(slide_plans)]
+    if not diff["changed"]:
+        tool_context.state["slide_generation_prompts"] = prompts
+        tool_context.state["generated_slides"] = [
+            slide
+            for slide in tool_context.state.get("generated_slides") or []
+            if slide.get("slide_number", 0) <= len(slide_plans)
+        ]
+        return {
+            "status": "success",
+            "message": f"All {len(slide_plans)} slides are up to date; nothing was re-rendered",
+            "rendered": [],
+            "reused": diff["unchanged"],
+            "removed": diff["removed"],
+        }
+    try:
+        client = get_openai_client()
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+    preamble = tool_context.state.get("slide_style_preamble")
+    for index in diff["changed"]:
+        try:
+            prompt = generate_slide_prompt(slide_plans[index - 1])
+        except Exception as e:
+            return {"status": "error", "message": f"Prompt generation failed for slide {index}: {str(e)}"}
+        prompts[index - 1] = f"{preamble}\n\n{prompt}" if preamble else prompt
+    tool_context.state["slide_generation_prompts"] = prompts
+
+    assets = load_assets()
+    results = render_carousel_slides(
+        client,
+        prompts,
+        assets,
+        namespace=carousel_id,
+        max_concurrency=max_concurrency,
+        only=set(diff["changed"]),
+        use_anchor=not preamble,
+    )
+    for result in results:
+        if result["status"] == "skipped":
+            result["status"] = "reused"
+    inputs = carousel_render_inputs(prompts, assets, results, not preamble)
+    slides = _finish_slides(results, carousel_id, tool_context, inputs)
+    failed = [slide["slide_number"] for slide in slides if slide["status"] == "error"]
+    rendered = [index for index in diff["changed"] if index not in failed]
+    return {
+        "status": "error" if not rendered else ("partial" if failed else "success"),
+        "message": f"Re-rendered {len(rendered)} of {len(slide_plans)} slides, reused {len(diff['unchanged'])}"
+        + (f"; failed slides: {failed}" if failed else ""),
+        "rendered": rendered,
+        "reused": diff["unchanged"],
+        "removed": diff["removed"],
+        "slides": slides,
+    }
+
+
+async def update_carousel_async(
+    max_concurrency: int = SLIDE_RENDER_CONCURRENCY,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
+    """
+    Bring the rendered carousel in line with tool_context.state['slide_plans'] after an edit.
+    Only slides whose plan changed get a new prompt and image; the others are reused.
+    Same contract as update_carousel, but prompt generation and renders run in a worker thread.
+    """
+    return await asyncio.to_thread(update_carousel, max_concurrency, tool_context)
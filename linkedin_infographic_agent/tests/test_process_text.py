@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from linkedin_infographic_agent.benchmarks.fake_backends import FakeGeminiModel
+from linkedin_infographic_agent.benchmarks.pipeline_benchmark import BenchmarkToolContext, make_article
+from linkedin_infographic_agent.constants import GEMINI_MODEL
+from linkedin_infographic_agent.shared_lib.clients import install_clients
+from linkedin_infographic_agent.sub_agents.article_processor_agent.tools.process_text import (
+    extraction_cache_key,
+    process_text,
+    process_text_async,
+)
+
+# Long enough that compression to ARTICLE_COMPRESSION_TOKEN_BUDGET changes the model input
+ARTICLE = make_article(0, 8000)
+
+
+def run_entry_point(entry_point, workdir, monkeypatch, **kwargs):
+    """Run one entry point in its own empty article cache; return (result, session state, model calls)."""
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    model = FakeGeminiModel(latency=0.0)
+    install_clients(gemini_models={GEMINI_MODEL: model})
+    tool_context = BenchmarkToolContext()
+    result = entry_point(ARTICLE, tool_context=tool_context, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result, tool_context.state, model.behaviour.calls
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_sync_and_async_entry_points_agree(tmp_path, monkeypatch, compress):
+    sync_result, sync_state, sync_calls = run_entry_point(process_text, tmp_path / "sync", monkeypatch, compress=compress)
+    async_result, async_state, async_calls = run_entry_point(
+        process_text_async, tmp_path / "async", monkeypatch, compress=compress
+    )
+    assert async_result == sync_result
+    assert async_calls == sync_calls
+    assert async_state["article_cache_key"] == sync_state["article_cache_key"] == extraction_cache_key(ARTICLE, compress)
+    assert ("article_compression" in async_state) is compress
+    assert ("article_compression" in sync_state) is compress
+
+
+def test_compress_argument_overrides_session_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    install_clients(gemini_models={GEMINI_MODEL: FakeGeminiModel(latency=0.0)})
+    tool_context = BenchmarkToolContext()
+    tool_context.state["compress_article"] = True
+    asyncio.run(process_text_async(ARTICLE, tool_context=tool_context, compress=False))
+    assert tool_context.state["article_cache_key"] == extraction_cache_key(ARTICLE, False)
+    assert "article_compression" not in tool_context.state
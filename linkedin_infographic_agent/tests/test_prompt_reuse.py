@@ -0,0 +1,66 @@
+import pytest
+
+from linkedin_infographic_agent.benchmarks.fake_backends import FakeGeminiModel
+from linkedin_infographic_agent.constants import GEMINI_MODEL
+from linkedin_infographic_agent.shared_lib.clients import install_clients
+from linkedin_infographic_agent.sub_agents.infographic_prompt_generator_agent.tools import generate_prompt
+from linkedin_infographic_agent.sub_agents.infographic_prompt_generator_agent.tools.generate_prompt import (
+    reuse_carousel_prompts,
+)
+
+PREAMBLE = "Stored style"
+
+
+def plan(number: int, text: str = "point") -> dict:
+    return {"purpose": f"slide {number}", "text": f"{text} {number}", "visual_ideas": "icon"}
+
+
+@pytest.fixture
+def model() -> FakeGeminiModel:
+    model = FakeGeminiModel(latency=0.0)
+    install_clients(gemini_models={GEMINI_MODEL: model})
+    return model
+
+
+def record(count: int) -> dict:
+    return {
+        "style_preamble": PREAMBLE,
+        "slide_plans": [plan(n) for n in range(1, count + 1)],
+        "prompts": [f"{PREAMBLE}\n\nold prompt {n}" for n in range(1, count + 1)],
+    }
+
+
+def test_changed_plans_share_one_batched_call_with_the_stored_preamble(model):
+    plans = [plan(1), plan(2, "edited"), plan(3), plan(4, "edited"), plan(5, "edited")]
+    result = reuse_carousel_prompts(record(5), plans)
+    assert model.behaviour.calls == 1
+    assert (result["reused"], result["regenerated"]) == ([1, 3], [2, 4, 5])
+    assert result["style_preamble"] == PREAMBLE
+    assert result["prompts"][0] == f"{PREAMBLE}\n\nold prompt 1"
+    assert all(prompt.startswith(f"{PREAMBLE}\n\n") for prompt in result["prompts"])
+    assert "edited 4" in result["prompts"][3]
+
+
+def test_unchanged_plans_make_no_call(model):
+    result = reuse_carousel_prompts(record(3), [plan(1), plan(2), plan(3)])
+    assert model.behaviour.calls == 0
+    assert result["regenerated"] == []
+
+
+def test_no_unchanged_plan_regenerates_the_carousel_with_a_fresh_preamble(model):
+    result = reuse_carousel_prompts(record(3), [plan(n, "edited") for n in range(1, 4)])
+    assert model.behaviour.calls == 1
+    assert result["reused"] == []
+    assert result["style_preamble"] != PREAMBLE
+    assert all(prompt.startswith(result["style_preamble"]) for prompt in result["prompts"])
+
+
+def test_failed_batched_call_falls_back_to_one_call_per_changed_slide(model, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("bad response")
+
+    monkeypatch.setattr(generate_prompt, "generate_carousel_prompts", fail)
+    monkeypatch.setattr(generate_prompt, "generate_slide_prompt", lambda slide_plan: f"new {slide_plan['text']}")
+    result = reuse_carousel_prompts(record(3), [plan(1), plan(2, "edited"), plan(3, "edited")])
+    assert result["prompts"][1:] == [f"{PREAMBLE}\n\nnew edited 2", f"{PREAMBLE}\n\nnew edited 3"]
+    assert result["regenerated"] == [2, 3]
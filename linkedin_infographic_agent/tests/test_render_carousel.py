@@ -0,0 +1,24 @@
+from linkedin_infographic_agent.benchmarks.fake_backends import FakeOpenAI
+from linkedin_infographic_agent.sub_agents.slide_generator_agent.tools import render_carousel
+from linkedin_infographic_agent.sub_agents.slide_generator_agent.tools.render_carousel import _render_one
+
+
+def test_render_and_manifest_get_the_same_stripped_prompt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen = {}
+    render_slide_file = render_carousel.render_slide_file
+    record_slide = render_carousel.record_slide
+
+    def render(client, prompt, *args):
+        seen["render"] = prompt
+        return render_slide_file(client, prompt, *args)
+
+    def record(carousel_id, filename, filepath, prompt, **kwargs):
+        seen["record"] = prompt
+        return record_slide(carousel_id, filename, filepath, prompt, **kwargs)
+
+    monkeypatch.setattr(render_carousel, "render_slide_file", render)
+    monkeypatch.setattr(render_carousel, "record_slide", record)
+    result = _render_one(FakeOpenAI(latency=0.0, payload_bytes=1000), 1, "  Slide prompt\n\n", [], None, "strip-test")
+    assert result["status"] == "success"
+    assert seen == {"render": "Slide prompt", "record": "Slide prompt"}
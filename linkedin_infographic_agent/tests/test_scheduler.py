@@ -0,0 +1,237 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from linkedin_infographic_agent.shared_lib.scheduler import BackendScheduler, TokenBucket, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def make_scheduler(**kwargs) -> BackendScheduler:
+    # Unlimited buckets and no backoff, so only the logic under test decides the outcome
+    options = {"max_retries": 3, "backoff_base": 0.0, "backoff_max": 0.0}
+    options.update(kwargs)
+    return BackendScheduler("test", 0, 0, options.pop("max_concurrency", 8), **options)
+
+
+def failing(errors, result="ok"):
+    """A call that raises each of errors in turn, then returns result. calls counts the attempts."""
+    pending = list(errors)
+
+    def fn():
+        fn.calls += 1
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    fn.calls = 0
+    return fn
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)  # one unit per second, ten seconds of capacity
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    clock.advance(0.5)
+    assert bucket.reserve(1) == pytest.approx(0.5)
+    clock.advance(0.5)
+    assert bucket.reserve(1) == 0.0
+
+
+def test_token_bucket_admits_oversized_request_when_full_and_goes_into_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    assert bucket.reserve(25) == 0.0
+    assert bucket.reserve(1) == pytest.approx(16.0)
+    clock.advance(100)
+    assert bucket.level == pytest.approx(-15)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.level == pytest.approx(9.0)
+
+
+def test_token_bucket_zero_rate_is_unlimited():
+    bucket = TokenBucket(0, clock=FakeClock())
+    assert all(bucket.reserve(10_000) == 0.0 for _ in range(100))
+
+
+def test_throttling_halves_concurrency_limit():
+    scheduler = make_scheduler(max_concurrency=8, max_retries=0)
+    for expected in (4, 2, 1, 1):
+        with pytest.raises(FakeHTTPError):
+            scheduler.call(failing([FakeHTTPError(429)]))
+        assert scheduler.stats()["concurrency_limit"] == expected
+    stats = scheduler.stats()
+    assert stats["throttled"] == 4
+    assert stats["failures"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_success_increases_concurrency_limit_additively_up_to_max():
+    scheduler = make_scheduler(max_concurrency=4, max_retries=0)
+    with pytest.raises(FakeHTTPError):
+        scheduler.call(failing([FakeHTTPError(429)]))
+    assert scheduler.stats()["concurrency_limit"] == 2
+    # 2 -> 2.5 -> 2.9 -> 3.24: one more slot after about a window of successful calls
+    for _ in range(3):
+        scheduler.call(failing([]))
+    assert scheduler.stats()["concurrency_limit"] == 3
+    for _ in range(50):
+        scheduler.call(failing([]))
+    assert scheduler.stats()["concurrency_limit"] == 4
+
+
+def test_server_errors_do_not_shrink_concurrency_limit():
+    scheduler = make_scheduler(max_concurrency=8)
+    scheduler.call(failing([FakeHTTPError(503)]))
+    assert scheduler.stats()["concurrency_limit"] == 8
+    assert scheduler.stats()["throttled"] == 0
+
+
+def test_retry_after_milliseconds_header():
+    assert retry_after_seconds(FakeHTTPError(429, {"retry-after-ms": "1500"})) == pytest.approx(1.5)
+
+
+def test_retry_after_seconds_header():
+    assert retry_after_seconds(FakeHTTPError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(FakeHTTPError(429, {"retry-after": "-3"})) == 0.0
+
+
+def test_retry_after_http_date_header():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after_seconds(FakeHTTPError(429, {"retry-after": format_datetime(when, usegmt=True)}))
+    assert 28 <= delay <= 30
+
+
+def test_retry_after_missing_or_invalid():
+    assert retry_after_seconds(FakeHTTPError(429)) is None
+    assert retry_after_seconds(FakeHTTPError(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+def test_retry_after_is_capped_by_backoff_max():
+    scheduler = make_scheduler(backoff_max=5.0)
+    scheduler._acquire(0)
+    assert scheduler._retry_delay(FakeHTTPError(429, {"retry-after": "100"}), 0) == 5.0
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_retries_until_success_are_counted():
+    scheduler = make_scheduler()
+    fn = failing([FakeHTTPError(503), FakeHTTPError(429), ConnectionError("reset")])
+    assert scheduler.call(fn) == "ok"
+    stats = scheduler.stats()
+    assert fn.calls == 4
+    assert (stats["calls"], stats["retries"], stats["failures"], stats["in_flight"]) == (1, 3, 0, 0)
+
+
+def test_gives_up_after_max_retries():
+    scheduler = make_scheduler(max_retries=2)
+    fn = failing([FakeHTTPError(500)] * 5)
+    with pytest.raises(FakeHTTPError):
+        scheduler.call(fn)
+    stats = scheduler.stats()
+    assert fn.calls == 3
+    assert (stats["retries"], stats["failures"], stats["in_flight"]) == (2, 1, 0)
+
+
+def test_non_retryable_error_is_not_retried():
+    scheduler = make_scheduler()
+    fn = failing([FakeHTTPError(400)])
+    with pytest.raises(FakeHTTPError):
+        scheduler.call(fn)
+    assert fn.calls == 1
+    assert scheduler.stats()["retries"] == 0
+
+
+def test_backoff_is_jittered_and_bounded():
+    scheduler = make_scheduler(backoff_base=1.0, backoff_max=4.0)
+    for attempt, bound in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 4.0)):
+        assert all(0 <= scheduler.backoff(attempt) <= bound for _ in range(50))
+
+
+def test_request_bucket_delays_calls():
+    scheduler = BackendScheduler("test", 600, 0, 4)  # ten requests per second, capacity 100
+    scheduler.requests = TokenBucket(600, clock=FakeClock())
+    state = {}
+    for _ in range(100):
+        assert scheduler._budget_delay(0, {}) == 0.0
+    assert scheduler._budget_delay(0, state) == pytest.approx(0.1)
+    assert "request" not in state
+
+
+def test_call_async_retries_and_releases_slots():
+    scheduler = make_scheduler()
+    fn = failing([FakeHTTPError(502), FakeHTTPError(429)])
+
+    async def attempt():
+        return fn()
+
+    assert asyncio.run(scheduler.call_async(attempt)) == "ok"
+    stats = scheduler.stats()
+    assert fn.calls == 3
+    assert (stats["retries"], stats["throttled"], stats["in_flight"]) == (2, 1, 0)
+
+
+def test_stream_async_retries_only_before_the_first_item():
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def stream():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FakeHTTPError(503)
+        yield "first"
+        raise FakeHTTPError(503)
+
+    async def consume():
+        items = []
+        with pytest.raises(FakeHTTPError):
+            async for item in scheduler.stream_async(stream):
+                items.append(item)
+        return items
+
+    assert asyncio.run(consume()) == ["first"]
+    stats = scheduler.stats()
+    assert len(attempts) == 2
+    assert (stats["retries"], stats["failures"], stats["in_flight"]) == (1, 1, 0)
+
+
+def test_call_waits_for_a_free_slot():
+    scheduler = make_scheduler(max_concurrency=1)
+    scheduler._acquire(0)
+    start = time.monotonic()
+
+    async def waiter():
+        async def release_soon():
+            await asyncio.sleep(0.05)
+            scheduler._release()
+
+        task = asyncio.ensure_future(release_soon())
+        waited = await scheduler._acquire_async(0)
+        await task
+        return waited
+
+    assert asyncio.run(waiter()) >= 0.04
+    assert time.monotonic() - start >= 0.04
+    assert scheduler.stats()["in_flight"] == 1
@@ -0,0 +1,18 @@
+from linkedin_infographic_agent.shared_lib import tracing
+
+
+def test_span_durations_are_one_summary_family(monkeypatch):
+    monkeypatch.setattr(tracing, "_counters", {})
+    tracing._record({"kind": "backend", "name": "gemini.generate_content", "duration_ms": 1500.0})
+    tracing._record({"kind": "backend", "name": "gemini.generate_content", "duration_ms": 500.0})
+    lines = tracing.prometheus_metrics().splitlines()
+    type_lines = [line for line in lines if line.startswith("# TYPE")]
+    assert "# TYPE carousel_span_duration_seconds summary" in type_lines
+    assert "# TYPE carousel_spans_total counter" in type_lines
+    assert not any("_sum" in line or "_count" in line for line in type_lines)
+    labels = '{kind="backend",name="gemini.generate_content"}'
+    family = lines.index("# TYPE carousel_span_duration_seconds summary")
+    assert lines[family + 1 : family + 3] == [
+        f"carousel_span_duration_seconds_count{labels} 2",
+        f"carousel_span_duration_seconds_sum{labels} 2",
+    ]